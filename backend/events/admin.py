@@ -1,4 +1,6 @@
 from django.contrib import admin
+from ngo.admin import LargeTableAdmin
+from pages.moderation import moderate_content
 from .models import Event, EventAttendance
 
 
@@ -20,19 +22,20 @@ class EventAdmin(admin.ModelAdmin):
     actions = ['approve_events', 'reject_events']
     
     def approve_events(self, request, queryset):
-        queryset.update(is_approved=True)
-        self.message_user(request, f"{queryset.count()} events approved")
+        count = moderate_content(queryset, True, request.user)
+        self.message_user(request, f"{count} events approved")
     approve_events.short_description = "Approve selected events"
     
     def reject_events(self, request, queryset):
-        queryset.update(is_approved=False)
-        self.message_user(request, f"{queryset.count()} events rejected")
+        count = moderate_content(queryset, False, request.user)
+        self.message_user(request, f"{count} events rejected")
     reject_events.short_description = "Reject selected events"
 
 
 @admin.register(EventAttendance)
-class EventAttendanceAdmin(admin.ModelAdmin):
+class EventAttendanceAdmin(LargeTableAdmin):
     list_display = ['attendee_name', 'event', 'organization', 'registered_at', 'attended']
     list_filter = ['attended', 'registered_at']
-    search_fields = ['attendee_name', 'attendee_email', 'event__title']
+    search_fields = ['^attendee_name', '=attendee_email', '^event__title']
     readonly_fields = ['registered_at']
+    autocomplete_fields = ['event', 'organization']
@@ -0,0 +1,32 @@
+# Generated by Django 5.0.1 on 2026-10-19 15:00
+
+from django.db import migrations, models
+
+from ngo.admin import prefix_search_index
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='event',
+            name='title',
+            field=models.CharField(db_index=True, max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='eventattendance',
+            name='attendee_email',
+            field=models.EmailField(db_index=True, max_length=254),
+        ),
+        migrations.AlterField(
+            model_name='eventattendance',
+            name='attendee_name',
+            field=models.CharField(db_index=True, max_length=200),
+        ),
+        prefix_search_index('events', 'Event', 'title'),
+        prefix_search_index('events', 'EventAttendance', 'attendee_name'),
+    ]
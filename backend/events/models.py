@@ -1,9 +1,8 @@
 from django.db import models
-from django.utils.text import slugify
-from members.models import TimeStampedModel, validate_file_size
+from members.models import TimeStampedModel, UniqueSlugMixin, validate_file_size
 
 
-class Event(TimeStampedModel):
+class Event(UniqueSlugMixin, TimeStampedModel):
     """Events and activities"""
     EVENT_TYPE_CHOICES = [
         ('CONFERENCE', 'Conference'),
@@ -22,7 +21,7 @@ class Event(TimeStampedModel):
         ('CANCELLED', 'Cancelled'),
     ]
     
-    title = models.CharField(max_length=255)
+    title = models.CharField(max_length=255, db_index=True)
     slug = models.SlugField(max_length=255, unique=True, blank=True)
     theme = models.CharField(max_length=500, blank=True)
     description = models.TextField()
@@ -69,11 +68,6 @@ class Event(TimeStampedModel):
     def __str__(self):
         return self.title
     
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.title)
-        super().save(*args, **kwargs)
-    
     @property
     def is_full(self):
         """Check if event is at capacity"""
@@ -90,8 +84,8 @@ class EventAttendance(TimeStampedModel):
         on_delete=models.CASCADE,
         related_name='event_attendances'
     )
-    attendee_name = models.CharField(max_length=200)
-    attendee_email = models.EmailField()
+    attendee_name = models.CharField(max_length=200, db_index=True)
+    attendee_email = models.EmailField(db_index=True)
     attendee_phone = models.CharField(max_length=50, blank=True)
     registered_at = models.DateTimeField(auto_now_add=True)
     attended = models.BooleanField(default=False)
@@ -1,15 +1,17 @@
 from rest_framework import serializers
+from pages.serializers import ImageVariantsField
 from .models import Event, EventAttendance
 
 
 class EventListSerializer(serializers.ModelSerializer):
     created_by_name = serializers.CharField(source='created_by.name', read_only=True)
+    featured_image_variants = ImageVariantsField(source='featured_image')
     
     class Meta:
         model = Event
         fields = [
             'id', 'title', 'slug', 'theme', 'event_date', 'event_time',
-            'location', 'event_type', 'status', 'featured_image',
+            'location', 'event_type', 'status', 'featured_image', 'featured_image_variants',
             'registration_required', 'created_by_name', 'is_approved'
         ]
 
@@ -17,6 +19,7 @@ class EventListSerializer(serializers.ModelSerializer):
 class EventDetailSerializer(serializers.ModelSerializer):
     created_by_name = serializers.CharField(source='created_by.name', read_only=True)
     is_full = serializers.ReadOnlyField()
+    featured_image_variants = ImageVariantsField(source='featured_image')
     
     class Meta:
         model = Event
@@ -24,7 +27,7 @@ class EventDetailSerializer(serializers.ModelSerializer):
             'id', 'title', 'slug', 'theme', 'description', 'event_date',
             'event_time', 'end_date', 'location', 'venue', 'event_type',
             'status', 'registration_required', 'registration_link',
-            'max_attendees', 'featured_image', 'attachments',
+            'max_attendees', 'featured_image', 'featured_image_variants', 'attachments',
             'created_by', 'created_by_name', 'is_approved', 'is_full',
             'created_at', 'updated_at'
         ]
@@ -1,13 +1,19 @@
 from rest_framework import viewsets, permissions, filters, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from ngo.async_views import AsyncListMixin
+from ngo.fast_serializers import FastReadMixin
+from ngo.media import FileContentNegotiation, serve_file
+from ngo.viewsets import SparseFieldsetMixin
+from members.authentication import member_organization_id, require_member_organization_id, can_auto_approve
 from .models import Event, EventAttendance
 from .serializers import EventListSerializer, EventDetailSerializer, EventWriteSerializer, EventAttendanceSerializer
 from pages.models import ModerationQueue
 
 
-class PublicEventViewSet(viewsets.ReadOnlyModelViewSet):
+class PublicEventViewSet(AsyncListMixin, FastReadMixin, SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """Public read-only access to approved events"""
     queryset = Event.objects.filter(is_approved=True)
     permission_classes = [permissions.AllowAny]
@@ -21,15 +27,24 @@ class PublicEventViewSet(viewsets.ReadOnlyModelViewSet):
         if self.action == 'retrieve':
             return EventDetailSerializer
         return EventListSerializer
+    
+    @action(detail=True, methods=['get'], content_negotiation_class=FileContentNegotiation)
+    def download(self, request, pk=None):
+        """Send the event's attachment"""
+        event = self.get_object()
+        if not event.attachments:
+            raise NotFound('This event has no attachment.')
+        return serve_file(request, event.attachments)
 
 
-class EventViewSet(viewsets.ModelViewSet):
+class EventViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """Authenticated access for members to create events"""
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        if hasattr(self.request.user, 'member_organization'):
-            return Event.objects.filter(created_by=self.request.user.member_organization)
+        organization_id = member_organization_id(self.request.user)
+        if organization_id is not None:
+            return Event.objects.filter(created_by_id=organization_id)
         return Event.objects.none()
     
     def get_serializer_class(self):
@@ -40,17 +55,17 @@ class EventViewSet(viewsets.ModelViewSet):
         return EventListSerializer
     
     def perform_create(self, serializer):
-        organization = self.request.user.member_organization
+        organization_id = require_member_organization_id(self.request.user)
         
         # Check if member is verified for auto-approval
-        if organization.auto_approve_content:
-            event = serializer.save(created_by=organization, is_approved=True, status='UPCOMING')
+        if can_auto_approve(self.request.user):
+            event = serializer.save(created_by_id=organization_id, is_approved=True, status='UPCOMING')
         else:
-            event = serializer.save(created_by=organization, is_approved=False, status='UPCOMING')
+            event = serializer.save(created_by_id=organization_id, is_approved=False, status='UPCOMING')
             # Create moderation queue entry
             ModerationQueue.objects.create(
                 content_object=event,
-                submitted_by=organization
+                submitted_by_id=organization_id
             )
     
     @action(detail=True, methods=['post'])
@@ -65,18 +80,19 @@ class EventViewSet(viewsets.ModelViewSet):
         if serializer.is_valid():
             serializer.save(
                 event=event,
-                organization=request.user.member_organization
+                organization_id=require_member_organization_id(request.user)
             )
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class EventAttendanceViewSet(viewsets.ReadOnlyModelViewSet):
+class EventAttendanceViewSet(SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """View event attendances"""
     serializer_class = EventAttendanceSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        if hasattr(self.request.user, 'member_organization'):
-            return EventAttendance.objects.filter(organization=self.request.user.member_organization)
+        organization_id = member_organization_id(self.request.user)
+        if organization_id is not None:
+            return EventAttendance.objects.filter(organization_id=organization_id)
         return EventAttendance.objects.none()
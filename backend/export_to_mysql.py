@@ -1,9 +1,9 @@
 """
-Script to export SQLite data and create MySQL-compatible dump
+Script to export SQLite data for loading into MySQL.
+Wraps the export_data management command (one compressed shard per model).
 """
 import os
 import django
-import subprocess
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ngo.settings')
 django.setup()
@@ -11,22 +11,14 @@ django.setup()
 from django.core.management import call_command
 
 print("Exporting data from SQLite...")
-call_command(
-    'dumpdata',
-    '--natural-foreign',
-    '--natural-primary',
-    '--exclude=contenttypes',
-    '--exclude=auth.permission',
-    '--indent=2',
-    '--output=data_backup.json'
-)
+call_command('export_data', '--output=data/exports')
 
-print("\n✅ Data exported to data_backup.json")
+print("\n✅ Data exported to data/exports/<timestamp>/")
 print("\n📋 To import this data to MySQL on your online server:")
-print("1. Upload your Django project to the server")
+print("1. Upload your Django project and the export folder to the server")
 print("2. Update settings.py with MySQL database credentials")
 print("3. Run: python manage.py migrate")
-print("4. Run: python manage.py loaddata data_backup.json")
+print("4. Run: python manage.py load_export data/exports/<timestamp>")
 print("\n💾 MySQL Configuration Example:")
 print("""
 DATABASES = {
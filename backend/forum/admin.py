@@ -1,31 +1,34 @@
 from django.contrib import admin
+from ngo.admin import LargeTableAdmin
+from pages.moderation import moderate_content
 from .models import ForumCategory, ForumPost, ForumComment
 
 
 @admin.register(ForumCategory)
 class ForumCategoryAdmin(admin.ModelAdmin):
     list_display = ['name', 'slug', 'order']
+    search_fields = ['name']
     prepopulated_fields = {'slug': ('name',)}
 
 
 @admin.register(ForumPost)
-class ForumPostAdmin(admin.ModelAdmin):
+class ForumPostAdmin(LargeTableAdmin):
     list_display = ['title', 'author', 'category', 'status', 'is_pinned', 'is_locked', 'view_count', 'created_at']
-    list_filter = ['status', 'is_pinned', 'is_locked', 'category']
-    search_fields = ['title', 'content', 'author__name']
+    list_filter = ['status', 'is_pinned', 'is_locked', 'category', 'created_at']
+    search_fields = ['^title', '^author__name']
     readonly_fields = ['slug', 'view_count', 'created_at', 'updated_at']
-    date_hierarchy = 'created_at'
+    autocomplete_fields = ['author', 'category']
     
     actions = ['approve_posts', 'reject_posts', 'pin_posts', 'lock_posts']
     
     def approve_posts(self, request, queryset):
-        queryset.update(status='APPROVED')
-        self.message_user(request, f"{queryset.count()} posts approved")
+        count = moderate_content(queryset, True, request.user)
+        self.message_user(request, f"{count} posts approved")
     approve_posts.short_description = "Approve selected posts"
     
     def reject_posts(self, request, queryset):
-        queryset.update(status='REJECTED')
-        self.message_user(request, f"{queryset.count()} posts rejected")
+        count = moderate_content(queryset, False, request.user)
+        self.message_user(request, f"{count} posts rejected")
     reject_posts.short_description = "Reject selected posts"
     
     def pin_posts(self, request, queryset):
@@ -40,20 +43,21 @@ class ForumPostAdmin(admin.ModelAdmin):
 
 
 @admin.register(ForumComment)
-class ForumCommentAdmin(admin.ModelAdmin):
+class ForumCommentAdmin(LargeTableAdmin):
     list_display = ['post', 'author', 'status', 'created_at']
     list_filter = ['status', 'created_at']
-    search_fields = ['content', 'author__name', 'post__title']
+    search_fields = ['^post__title', '^author__name']
     readonly_fields = ['created_at', 'updated_at']
+    autocomplete_fields = ['post', 'author', 'parent']
     
     actions = ['approve_comments', 'reject_comments']
     
     def approve_comments(self, request, queryset):
-        queryset.update(status='APPROVED')
-        self.message_user(request, f"{queryset.count()} comments approved")
+        count = moderate_content(queryset, True, request.user)
+        self.message_user(request, f"{count} comments approved")
     approve_comments.short_description = "Approve selected comments"
     
     def reject_comments(self, request, queryset):
-        queryset.update(status='REJECTED')
-        self.message_user(request, f"{queryset.count()} comments rejected")
+        count = moderate_content(queryset, False, request.user)
+        self.message_user(request, f"{count} comments rejected")
     reject_comments.short_description = "Reject selected comments"
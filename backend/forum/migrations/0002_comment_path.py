@@ -0,0 +1,41 @@
+# Generated by Django 5.0.1 on 2026-10-19 14:32
+
+from django.db import migrations, models
+
+
+def backfill_comment_paths(apps, schema_editor):
+    """Compute paths in memory from (id, parent_id) pairs and write them in batches"""
+    ForumComment = apps.get_model('forum', 'ForumComment')
+    parents = dict(ForumComment.objects.values_list('id', 'parent_id'))
+    paths = {}
+    for comment_id in parents:
+        chain = []
+        current = comment_id
+        while current is not None and current not in paths:
+            chain.append(current)
+            current = parents.get(current)
+        prefix = paths.get(current, '')
+        for ancestor_id in reversed(chain):
+            prefix += f"{ancestor_id:010d}/"
+            paths[ancestor_id] = prefix
+    ForumComment.objects.bulk_update(
+        [ForumComment(id=comment_id, path=path) for comment_id, path in paths.items()],
+        ['path'],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='forumcomment',
+            name='path',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='Materialized path of zero-padded ids from the root comment, e.g. 0000000012/0000000040/', max_length=500),
+        ),
+        migrations.RunPython(backfill_comment_paths, migrations.RunPython.noop),
+    ]
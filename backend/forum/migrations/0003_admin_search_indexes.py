@@ -0,0 +1,21 @@
+# Generated by Django 5.0.1 on 2026-10-19 15:00
+
+from django.db import migrations, models
+
+from ngo.admin import prefix_search_index
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0002_comment_path'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='forumpost',
+            name='title',
+            field=models.CharField(db_index=True, max_length=255),
+        ),
+        prefix_search_index('forum', 'ForumPost', 'title'),
+    ]
@@ -1,10 +1,13 @@
 from django.db import models
-from django.utils.text import slugify
-from members.models import TimeStampedModel
+from django.db.models import Value
+from django.db.models.functions import Concat, Substr
+from members.models import TimeStampedModel, UniqueSlugMixin
 
 
-class ForumCategory(models.Model):
+class ForumCategory(UniqueSlugMixin, models.Model):
     """Forum discussion categories"""
+    slug_source = 'name'
+    
     name = models.CharField(max_length=200, unique=True)
     slug = models.SlugField(max_length=200, unique=True, blank=True)
     description = models.TextField(blank=True)
@@ -17,14 +20,9 @@ class ForumCategory(models.Model):
     
     def __str__(self):
         return self.name
-    
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.name)
-        super().save(*args, **kwargs)
 
 
-class ForumPost(TimeStampedModel):
+class ForumPost(UniqueSlugMixin, TimeStampedModel):
     """Forum discussion posts"""
     STATUS_CHOICES = [
         ('PENDING', 'Pending Moderation'),
@@ -33,7 +31,7 @@ class ForumPost(TimeStampedModel):
     ]
     
     author = models.ForeignKey('members.MemberOrganization', on_delete=models.CASCADE, related_name='forum_posts')
-    title = models.CharField(max_length=255)
+    title = models.CharField(max_length=255, db_index=True)
     slug = models.SlugField(max_length=255, unique=True, blank=True)
     content = models.TextField()
     category = models.ForeignKey(ForumCategory, on_delete=models.SET_NULL, null=True, related_name='posts')
@@ -56,17 +54,6 @@ class ForumPost(TimeStampedModel):
     def __str__(self):
         return self.title
     
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            base_slug = slugify(self.title)
-            slug = base_slug
-            counter = 1
-            while ForumPost.objects.filter(slug=slug).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
-        super().save(*args, **kwargs)
-    
     def increment_view_count(self):
         self.view_count += 1
         self.save(update_fields=['view_count'])
@@ -93,6 +80,12 @@ class ForumComment(TimeStampedModel):
     
     # Threading support
     parent = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='replies')
+    path = models.CharField(
+        max_length=500, blank=True, db_index=True, editable=False,
+        help_text="Materialized path of zero-padded ids from the root comment, e.g. 0000000012/0000000040/"
+    )
+    
+    PATH_STEP_WIDTH = 10
     
     class Meta:
         ordering = ['created_at']
@@ -101,3 +94,29 @@ class ForumComment(TimeStampedModel):
     
     def __str__(self):
         return f"Comment by {self.author.name} on {self.post.title}"
+    
+    @classmethod
+    def path_step(cls, pk):
+        return f"{pk:0{cls.PATH_STEP_WIDTH}d}/"
+    
+    @property
+    def depth(self):
+        """0 for top-level comments"""
+        return self.path.count('/') - 1 if self.path else 0
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # The path needs our own id, so it is written after the insert
+        parent_path = ''
+        if self.parent_id:
+            parent_path = ForumComment.objects.filter(pk=self.parent_id).values_list('path', flat=True).first() or ''
+        new_path = parent_path + self.path_step(self.pk)
+        if new_path != self.path:
+            old_path = self.path
+            ForumComment.objects.filter(pk=self.pk).update(path=new_path)
+            if old_path:
+                # Moved under a different parent: rewrite the prefix of the whole subtree
+                ForumComment.objects.filter(path__startswith=old_path).exclude(pk=self.pk).update(
+                    path=Concat(Value(new_path), Substr('path', len(old_path) + 1))
+                )
+            self.path = new_path
@@ -36,7 +36,7 @@ class ForumPostListSerializer(serializers.ModelSerializer):
 class ForumPostDetailSerializer(serializers.ModelSerializer):
     author_name = serializers.CharField(source='author.name', read_only=True)
     category_name = serializers.CharField(source='category.name', read_only=True)
-    comments = ForumCommentSerializer(many=True, read_only=True)
+    comments = serializers.SerializerMethodField()
     comment_count = serializers.ReadOnlyField()
     
     class Meta:
@@ -46,6 +46,11 @@ class ForumPostDetailSerializer(serializers.ModelSerializer):
             'category', 'category_name', 'status', 'is_pinned', 'is_locked',
             'view_count', 'comment_count', 'comments', 'created_at', 'updated_at'
         ]
+    
+    def get_comments(self, obj):
+        # Flat list of approved comments; use the post's comments endpoint for threads
+        comments = obj.comments.filter(status='APPROVED').select_related('author')
+        return ForumCommentSerializer(comments, many=True).data
 
 
 class ForumPostWriteSerializer(serializers.ModelSerializer):
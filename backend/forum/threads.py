@@ -0,0 +1,70 @@
+from django.db.models import Q
+from django.db.models.functions import Length
+
+from .models import ForumComment
+
+
+def approved_comments(post):
+    """
+    All approved comments of a post in one query, in depth-first thread order.
+    Ordering by materialized path puts every reply right after its parent.
+    """
+    return ForumComment.objects.filter(
+        post=post, status='APPROVED'
+    ).select_related('author').order_by('path')
+
+
+def thread_comments(comments, root_paths, max_depth=None):
+    """
+    The comments of the threads starting at root_paths, one query for the whole page.
+    With max_depth only one level below it is fetched, enough for the reply_count
+    of the deepest comments kept.
+    """
+    if not root_paths:
+        return comments.none()
+    in_threads = Q()
+    for path in root_paths:
+        in_threads |= Q(path__startswith=path)
+    comments = comments.filter(in_threads)
+    if max_depth is not None:
+        step = len(ForumComment.path_step(0))
+        comments = comments.annotate(path_length=Length('path')).filter(path_length__lte=(max_depth + 2) * step)
+    return comments
+
+
+def build_comment_tree(comments, max_depth=None, root_id=None):
+    """
+    Nest serialized comments (dicts with 'id' and 'parent') under their parents in O(n).
+
+    Replies to comments that are not in the list (e.g. still pending moderation)
+    are dropped along with their parent. Below max_depth (0 = top level only) the
+    replies are cut off and each node keeps a reply_count so clients can load more.
+    Pass root_id when building a subtree so that comment becomes the single root.
+    """
+    nodes = {}
+    for comment in comments:
+        node = dict(comment)
+        node['replies'] = []
+        node['reply_count'] = 0
+        nodes[node['id']] = node
+
+    roots = []
+    for node in nodes.values():
+        parent_id = node['parent']
+        if parent_id is None or node['id'] == root_id:
+            roots.append(node)
+        elif parent_id in nodes:
+            nodes[parent_id]['replies'].append(node)
+            nodes[parent_id]['reply_count'] += 1
+
+    # Iterative walk so very deep threads cannot hit the recursion limit
+    stack = [(root, 0) for root in roots]
+    while stack:
+        node, depth = stack.pop()
+        node['depth'] = depth
+        if max_depth is not None and depth >= max_depth:
+            node['replies'] = []
+            continue
+        stack.extend((reply, depth + 1) for reply in node['replies'])
+
+    return roots
@@ -2,22 +2,25 @@ from rest_framework import viewsets, permissions, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from ngo.viewsets import SparseFieldsetMixin
+from members.authentication import member_organization_id, require_member_organization_id, can_auto_approve
 from .models import ForumCategory, ForumPost, ForumComment
 from .serializers import (
     ForumCategorySerializer, ForumPostListSerializer,
     ForumPostDetailSerializer, ForumPostWriteSerializer, ForumCommentSerializer
 )
+from .threads import approved_comments, build_comment_tree, thread_comments
 from pages.models import ModerationQueue
 
 
-class ForumCategoryViewSet(viewsets.ReadOnlyModelViewSet):
+class ForumCategoryViewSet(SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """Public access to forum categories"""
     queryset = ForumCategory.objects.all()
     serializer_class = ForumCategorySerializer
     permission_classes = [permissions.AllowAny]
 
 
-class PublicForumPostViewSet(viewsets.ReadOnlyModelViewSet):
+class PublicForumPostViewSet(SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """Public read-only access to approved forum posts"""
     queryset = ForumPost.objects.filter(status='APPROVED')
     permission_classes = [permissions.AllowAny]
@@ -37,15 +40,56 @@ class PublicForumPostViewSet(viewsets.ReadOnlyModelViewSet):
         instance.increment_view_count()
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
+    
+    @action(detail=True, methods=['get'])
+    def comments(self, request, pk=None):
+        """
+        Approved comments as a reply tree, built from a single query.
+        ?max_depth=N cuts replies below depth N (0 = top level only).
+        ?root=<comment id> returns just that comment's subtree.
+        Top-level threads are paginated like other list endpoints; only the page's threads are queried.
+        """
+        post = self.get_object()
+        comments = approved_comments(post)
+        
+        max_depth = request.query_params.get('max_depth')
+        if max_depth is not None:
+            try:
+                max_depth = int(max_depth)
+            except ValueError:
+                return Response({'error': 'max_depth must be a number'}, status=status.HTTP_400_BAD_REQUEST)
+            if max_depth < 0:
+                return Response({'error': 'max_depth must be zero or more'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        root_id = request.query_params.get('root')
+        if root_id:
+            root_path = comments.filter(pk=root_id).values_list('path', flat=True).first() if root_id.isdigit() else None
+            if not root_path:
+                return Response({'error': 'Comment not found'}, status=status.HTTP_404_NOT_FOUND)
+            tree = build_comment_tree(
+                ForumCommentSerializer(comments.filter(path__startswith=root_path), many=True).data,
+                max_depth=max_depth,
+                root_id=int(root_id)
+            )
+            return Response(tree[0])
+        
+        # Paginate the top-level comments first so only this page's threads are loaded and serialized
+        page = self.paginate_queryset(comments.filter(parent__isnull=True).values_list('path', flat=True))
+        if page is None:
+            return Response(build_comment_tree(ForumCommentSerializer(comments, many=True).data, max_depth=max_depth))
+        threads = thread_comments(comments, page, max_depth=max_depth)
+        tree = build_comment_tree(ForumCommentSerializer(threads, many=True).data, max_depth=max_depth)
+        return self.get_paginated_response(tree)
 
 
-class ForumPostViewSet(viewsets.ModelViewSet):
+class ForumPostViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """Authenticated access for members to create forum posts"""
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        if hasattr(self.request.user, 'member_organization'):
-            return ForumPost.objects.filter(author=self.request.user.member_organization)
+        organization_id = member_organization_id(self.request.user)
+        if organization_id is not None:
+            return ForumPost.objects.filter(author_id=organization_id)
         return ForumPost.objects.none()
     
     def get_serializer_class(self):
@@ -56,17 +100,17 @@ class ForumPostViewSet(viewsets.ModelViewSet):
         return ForumPostListSerializer
     
     def perform_create(self, serializer):
-        organization = self.request.user.member_organization
+        organization_id = require_member_organization_id(self.request.user)
         
         # Verified members get auto-approved posts
-        if organization.auto_approve_content:
-            post = serializer.save(author=organization, status='APPROVED')
+        if can_auto_approve(self.request.user):
+            post = serializer.save(author_id=organization_id, status='APPROVED')
         else:
-            post = serializer.save(author=organization, status='PENDING')
+            post = serializer.save(author_id=organization_id, status='PENDING')
             # Create moderation queue entry
             ModerationQueue.objects.create(
                 content_object=post,
-                submitted_by=organization
+                submitted_by_id=organization_id
             )
     
     @action(detail=True, methods=['post'])
@@ -79,28 +123,29 @@ class ForumPostViewSet(viewsets.ModelViewSet):
         
         serializer = ForumCommentSerializer(data=request.data)
         if serializer.is_valid():
-            organization = request.user.member_organization
+            organization_id = require_member_organization_id(request.user)
             
             # Auto-approve comments from verified members
-            if organization.auto_approve_content:
-                comment = serializer.save(post=post, author=organization, status='APPROVED')
+            if can_auto_approve(request.user):
+                comment = serializer.save(post=post, author_id=organization_id, status='APPROVED')
             else:
-                comment = serializer.save(post=post, author=organization, status='PENDING')
+                comment = serializer.save(post=post, author_id=organization_id, status='PENDING')
                 ModerationQueue.objects.create(
                     content_object=comment,
-                    submitted_by=organization
+                    submitted_by_id=organization_id
                 )
             
             return Response(ForumCommentSerializer(comment).data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class ForumCommentViewSet(viewsets.ModelViewSet):
+class ForumCommentViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """Manage forum comments"""
     serializer_class = ForumCommentSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        if hasattr(self.request.user, 'member_organization'):
-            return ForumComment.objects.filter(author=self.request.user.member_organization)
+        organization_id = member_organization_id(self.request.user)
+        if organization_id is not None:
+            return ForumComment.objects.filter(author_id=organization_id)
         return ForumComment.objects.none()
@@ -0,0 +1,27 @@
+# Generated by Django 5.0.1 on 2026-10-19 15:00
+
+from django.db import migrations, models
+
+from ngo.admin import prefix_search_index
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='jobadvertisement',
+            name='job_title',
+            field=models.CharField(db_index=True, max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='tenderadvertisement',
+            name='title',
+            field=models.CharField(db_index=True, max_length=255),
+        ),
+        prefix_search_index('jobs', 'JobAdvertisement', 'job_title'),
+        prefix_search_index('jobs', 'TenderAdvertisement', 'title'),
+    ]
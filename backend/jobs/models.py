@@ -19,7 +19,7 @@ class JobAdvertisement(TimeStampedModel):
         on_delete=models.CASCADE,
         related_name='job_advertisements'
     )
-    job_title = models.CharField(max_length=255)
+    job_title = models.CharField(max_length=255, db_index=True)
     location = models.CharField(max_length=255)
     job_type = models.CharField(max_length=20, choices=JOB_TYPE_CHOICES, default='FULL_TIME')
     
@@ -125,7 +125,7 @@ class TenderAdvertisement(TimeStampedModel):
         on_delete=models.CASCADE,
         related_name='tender_advertisements'
     )
-    title = models.CharField(max_length=255)
+    title = models.CharField(max_length=255, db_index=True)
     reference_number = models.CharField(max_length=100, unique=True)
     description = models.TextField()
     category = models.CharField(max_length=200, help_text="e.g., Goods, Services, Works, Consultancy")
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from ngo.serializers import SummaryField
 from .models import JobAdvertisement, Training, TenderAdvertisement
 
 
@@ -16,6 +17,23 @@ class JobAdvertisementSerializer(serializers.ModelSerializer):
             'posted_date', 'is_active', 'is_approved', 'view_count', 'is_expired'
         ]
         read_only_fields = ['posted_date', 'is_approved', 'view_count']
+        field_dependencies = {'is_expired': ['application_deadline']}
+
+
+class JobAdvertisementListSerializer(serializers.ModelSerializer):
+    """Job board listing without the long text fields"""
+    organization_name = serializers.CharField(source='organization.name', read_only=True)
+    summary = SummaryField(source='description')
+    is_expired = serializers.ReadOnlyField()
+    
+    class Meta:
+        model = JobAdvertisement
+        fields = [
+            'id', 'organization', 'organization_name', 'job_title', 'location',
+            'job_type', 'summary', 'application_deadline', 'application_email',
+            'application_url', 'salary_range', 'posted_date', 'is_expired'
+        ]
+        field_dependencies = {'is_expired': ['application_deadline']}
 
 
 class JobAdvertisementWriteSerializer(serializers.ModelSerializer):
@@ -43,6 +61,22 @@ class TrainingSerializer(serializers.ModelSerializer):
             'is_approved', 'submitted_by', 'submitted_by_name', 'is_past'
         ]
         read_only_fields = ['posted_date', 'is_approved']
+        field_dependencies = {'is_past': ['start_date', 'end_date']}
+
+
+class TrainingListSerializer(serializers.ModelSerializer):
+    """Training listing without the full description"""
+    summary = SummaryField(source='description')
+    is_past = serializers.ReadOnlyField()
+    
+    class Meta:
+        model = Training
+        fields = [
+            'id', 'title', 'provider', 'summary', 'start_date', 'end_date',
+            'location', 'is_online', 'cost', 'currency', 'is_free',
+            'registration_deadline', 'posted_date', 'is_past'
+        ]
+        field_dependencies = {'is_past': ['start_date', 'end_date']}
 
 
 class TrainingWriteSerializer(serializers.ModelSerializer):
@@ -69,6 +103,22 @@ class TenderAdvertisementSerializer(serializers.ModelSerializer):
             'external_link', 'posted_date', 'is_active', 'is_approved', 'is_expired'
         ]
         read_only_fields = ['posted_date', 'is_approved']
+        field_dependencies = {'is_expired': ['submission_deadline']}
+
+
+class TenderAdvertisementListSerializer(serializers.ModelSerializer):
+    """Tender listing without the full description"""
+    organization_name = serializers.CharField(source='organization.name', read_only=True)
+    summary = SummaryField(source='description')
+    is_expired = serializers.ReadOnlyField()
+    
+    class Meta:
+        model = TenderAdvertisement
+        fields = [
+            'id', 'organization', 'organization_name', 'title', 'reference_number',
+            'summary', 'category', 'submission_deadline', 'posted_date', 'is_expired'
+        ]
+        field_dependencies = {'is_expired': ['submission_deadline']}
 
 
 class TenderAdvertisementWriteSerializer(serializers.ModelSerializer):
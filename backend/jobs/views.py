@@ -1,33 +1,45 @@
 from rest_framework import viewsets, permissions, filters
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from django_filters.rest_framework import DjangoFilterBackend
+from ngo.async_views import AsyncListMixin
+from ngo.fast_serializers import FastReadMixin
+from ngo.media import FileContentNegotiation, serve_file
+from ngo.viewsets import SparseFieldsetMixin
+from members.authentication import member_organization_id, require_member_organization_id, can_auto_approve
 from .models import JobAdvertisement, Training, TenderAdvertisement
 from .serializers import (
-    JobAdvertisementSerializer, JobAdvertisementWriteSerializer,
-    TrainingSerializer, TrainingWriteSerializer,
-    TenderAdvertisementSerializer, TenderAdvertisementWriteSerializer
+    JobAdvertisementSerializer, JobAdvertisementListSerializer, JobAdvertisementWriteSerializer,
+    TrainingSerializer, TrainingListSerializer, TrainingWriteSerializer,
+    TenderAdvertisementSerializer, TenderAdvertisementListSerializer, TenderAdvertisementWriteSerializer
 )
 from pages.models import ModerationQueue
 
 
-class PublicJobAdvertisementViewSet(viewsets.ReadOnlyModelViewSet):
+class PublicJobAdvertisementViewSet(AsyncListMixin, FastReadMixin, SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """Public read-only access to approved job ads"""
-    queryset = JobAdvertisement.objects.filter(is_approved=True, is_active=True)
-    serializer_class = JobAdvertisementSerializer
+    queryset = JobAdvertisement.objects.filter(is_approved=True, is_active=True).select_related('organization')
     permission_classes = [permissions.AllowAny]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['job_type', 'location']
     search_fields = ['job_title', 'description', 'location']
     ordering_fields = ['posted_date', 'application_deadline']
     ordering = ['-posted_date']
+    
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return JobAdvertisementListSerializer
+        return JobAdvertisementSerializer
 
 
-class JobAdvertisementViewSet(viewsets.ModelViewSet):
+class JobAdvertisementViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """Authenticated access for members to post jobs"""
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        if hasattr(self.request.user, 'member_organization'):
-            return JobAdvertisement.objects.filter(organization=self.request.user.member_organization)
+        organization_id = member_organization_id(self.request.user)
+        if organization_id is not None:
+            return JobAdvertisement.objects.filter(organization_id=organization_id)
         return JobAdvertisement.objects.none()
     
     def get_serializer_class(self):
@@ -36,37 +48,42 @@ class JobAdvertisementViewSet(viewsets.ModelViewSet):
         return JobAdvertisementSerializer
     
     def perform_create(self, serializer):
-        organization = self.request.user.member_organization
+        organization_id = require_member_organization_id(self.request.user)
         
-        if organization.auto_approve_content:
-            job = serializer.save(organization=organization, is_approved=True)
+        if can_auto_approve(self.request.user):
+            job = serializer.save(organization_id=organization_id, is_approved=True)
         else:
-            job = serializer.save(organization=organization, is_approved=False)
+            job = serializer.save(organization_id=organization_id, is_approved=False)
             ModerationQueue.objects.create(
                 content_object=job,
-                submitted_by=organization
+                submitted_by_id=organization_id
             )
 
 
-class PublicTrainingViewSet(viewsets.ReadOnlyModelViewSet):
+class PublicTrainingViewSet(AsyncListMixin, FastReadMixin, SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """Public read-only access to approved trainings"""
     queryset = Training.objects.filter(is_approved=True, is_active=True)
-    serializer_class = TrainingSerializer
     permission_classes = [permissions.AllowAny]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['is_online', 'is_free']
     search_fields = ['title', 'provider', 'description']
     ordering_fields = ['start_date', 'posted_date']
     ordering = ['start_date']
+    
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return TrainingListSerializer
+        return TrainingSerializer
 
 
-class TrainingViewSet(viewsets.ModelViewSet):
+class TrainingViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """Authenticated access for members to post trainings"""
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        if hasattr(self.request.user, 'member_organization'):
-            return Training.objects.filter(submitted_by=self.request.user.member_organization)
+        organization_id = member_organization_id(self.request.user)
+        if organization_id is not None:
+            return Training.objects.filter(submitted_by_id=organization_id)
         return Training.objects.none()
     
     def get_serializer_class(self):
@@ -75,37 +92,50 @@ class TrainingViewSet(viewsets.ModelViewSet):
         return TrainingSerializer
     
     def perform_create(self, serializer):
-        organization = self.request.user.member_organization
+        organization_id = require_member_organization_id(self.request.user)
         
-        if organization.auto_approve_content:
-            training = serializer.save(submitted_by=organization, is_approved=True)
+        if can_auto_approve(self.request.user):
+            training = serializer.save(submitted_by_id=organization_id, is_approved=True)
         else:
-            training = serializer.save(submitted_by=organization, is_approved=False)
+            training = serializer.save(submitted_by_id=organization_id, is_approved=False)
             ModerationQueue.objects.create(
                 content_object=training,
-                submitted_by=organization
+                submitted_by_id=organization_id
             )
 
 
-class PublicTenderAdvertisementViewSet(viewsets.ReadOnlyModelViewSet):
+class PublicTenderAdvertisementViewSet(AsyncListMixin, FastReadMixin, SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """Public read-only access to approved tenders"""
-    queryset = TenderAdvertisement.objects.filter(is_approved=True, is_active=True)
-    serializer_class = TenderAdvertisementSerializer
+    queryset = TenderAdvertisement.objects.filter(is_approved=True, is_active=True).select_related('organization')
     permission_classes = [permissions.AllowAny]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['category']
     search_fields = ['title', 'description', 'reference_number']
     ordering_fields = ['submission_deadline', 'posted_date']
     ordering = ['submission_deadline']
+    
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return TenderAdvertisementListSerializer
+        return TenderAdvertisementSerializer
+    
+    @action(detail=True, methods=['get'], content_negotiation_class=FileContentNegotiation)
+    def download(self, request, pk=None):
+        """Send the tender document"""
+        tender = self.get_object()
+        if not tender.document:
+            raise NotFound('This tender has no document.')
+        return serve_file(request, tender.document)
 
 
-class TenderAdvertisementViewSet(viewsets.ModelViewSet):
+class TenderAdvertisementViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """Authenticated access for members to post tenders"""
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        if hasattr(self.request.user, 'member_organization'):
-            return TenderAdvertisement.objects.filter(organization=self.request.user.member_organization)
+        organization_id = member_organization_id(self.request.user)
+        if organization_id is not None:
+            return TenderAdvertisement.objects.filter(organization_id=organization_id)
         return TenderAdvertisement.objects.none()
     
     def get_serializer_class(self):
@@ -114,13 +144,13 @@ class TenderAdvertisementViewSet(viewsets.ModelViewSet):
         return TenderAdvertisementSerializer
     
     def perform_create(self, serializer):
-        organization = self.request.user.member_organization
+        organization_id = require_member_organization_id(self.request.user)
         
-        if organization.auto_approve_content:
-            tender = serializer.save(organization=organization, is_approved=True)
+        if can_auto_approve(self.request.user):
+            tender = serializer.save(organization_id=organization_id, is_approved=True)
         else:
-            tender = serializer.save(organization=organization, is_approved=False)
+            tender = serializer.save(organization_id=organization_id, is_approved=False)
             ModerationQueue.objects.create(
                 content_object=tender,
-                submitted_by=organization
+                submitted_by_id=organization_id
             )
@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import MemberOrganization, OrganizationContact, StaffMember, MembershipApplication, MembershipPayment
+from ngo.admin import LargeTableAdmin
+from .authentication import mark_organizations_changed
+from .models import MemberOrganization, OrganizationContact, StaffMember, MembershipApplication, MembershipPayment, MembershipReminder
 
 
 class OrganizationContactInline(admin.TabularInline):
@@ -8,12 +10,11 @@ class OrganizationContactInline(admin.TabularInline):
 
 
 @admin.register(MemberOrganization)
-class MemberOrganizationAdmin(admin.ModelAdmin):
+class MemberOrganizationAdmin(LargeTableAdmin):
     list_display = ['name', 'member_type', 'is_verified', 'membership_fee_paid', 'membership_expiry_date', 'status', 'date_joined']
-    list_filter = ['member_type', 'is_verified', 'status', 'state', 'membership_fee_paid']
-    search_fields = ['name', 'email', 'rrc_number', 'description']
+    list_filter = ['member_type', 'is_verified', 'status', 'state', 'membership_fee_paid', 'date_joined']
+    search_fields = ['^name', '=email', '=rrc_number']
     readonly_fields = ['slug', 'date_joined', 'created_at', 'updated_at']
-    date_hierarchy = 'date_joined'
     inlines = [OrganizationContactInline]
     
     fieldsets = (
@@ -42,11 +43,13 @@ class MemberOrganizationAdmin(admin.ModelAdmin):
     
     def mark_verified(self, request, queryset):
         queryset.update(is_verified=True, auto_approve_content=True)
+        mark_organizations_changed(queryset.values('pk'))
         self.message_user(request, f"{queryset.count()} members marked as verified")
     mark_verified.short_description = "Mark selected as verified"
     
     def mark_unverified(self, request, queryset):
         queryset.update(is_verified=False, auto_approve_content=False)
+        mark_organizations_changed(queryset.values('pk'))
         self.message_user(request, f"{queryset.count()} members marked as unverified")
     mark_unverified.short_description = "Mark selected as unverified"
 
@@ -95,8 +98,25 @@ class MembershipApplicationAdmin(admin.ModelAdmin):
 
 @admin.register(MembershipPayment)
 class MembershipPaymentAdmin(admin.ModelAdmin):
-    list_display = ['organization', 'amount', 'payment_date', 'status', 'transaction_reference']
+    list_display = ['organization', 'amount', 'payment_date', 'status', 'transaction_reference', 'activated_at']
     list_filter = ['status', 'payment_date']
     search_fields = ['organization__name', 'transaction_reference']
-    readonly_fields = ['payment_date', 'created_at', 'updated_at']
+    readonly_fields = ['payment_date', 'activated_at', 'created_at', 'updated_at']
     date_hierarchy = 'payment_date'
+    
+    actions = ['mark_completed']
+    
+    def mark_completed(self, request, queryset):
+        from .payments import complete_payments
+        completed = complete_payments(queryset)
+        self.message_user(request, f"{len(completed)} payments completed and applied to memberships")
+    mark_completed.short_description = "Mark selected pending payments as completed"
+
+
+@admin.register(MembershipReminder)
+class MembershipReminderAdmin(admin.ModelAdmin):
+    list_display = ['organization', 'expiry_date', 'window_days', 'status', 'sent_at']
+    list_filter = ['status', 'window_days']
+    search_fields = ['organization__name']
+    list_select_related = ['organization']
+    readonly_fields = ['created_at', 'sent_at']
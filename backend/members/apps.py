@@ -7,3 +7,4 @@ class MembersConfig(AppConfig):
     
     def ready(self):
         import members.signals
+        import members.authentication
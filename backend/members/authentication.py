@@ -0,0 +1,290 @@
+"""
+JWT authentication without a database round trip per request.
+
+Access tokens issued by MemberTokenObtainPairSerializer carry the user's
+member organization id and the flags views need (auto_approve_content,
+is_staff). CachedJWTAuthentication keeps decoded tokens in memory until they
+expire and returns a ClaimsUser built from the claims, so authenticating costs
+no queries. Tokens issued before these claims existed, and tokens of users
+whose account or organization changed since the token was issued, fall back
+to loading the User from the database, which also rejects inactive and deleted
+users.
+
+Changes are recorded in the ClaimsChange table, which each worker polls every
+JWT_CLAIMS_POLL_SECONDS, so a change made in one process reaches all of them.
+Refreshing a token reads the claims from the database again.
+"""
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.functional import cached_property
+from rest_framework.exceptions import AuthenticationFailed, PermissionDenied
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from .models import ClaimsChange, MemberOrganization
+
+
+ORGANIZATION_CLAIM = 'member_organization_id'
+User = get_user_model()
+
+# A change can commit a little after its changed_at, so each poll looks back this far
+CLAIMS_POLL_OVERLAP = timedelta(seconds=60)
+
+
+class MemberTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Token pair whose claims describe the user and their member organization"""
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        organization = MemberOrganization.objects.filter(user=user).values('id', 'auto_approve_content').first()
+        token[ORGANIZATION_CLAIM] = organization['id'] if organization else None
+        token['auto_approve_content'] = bool(organization and organization['auto_approve_content'])
+        token['username'] = user.get_username()
+        token['email'] = user.email
+        token['is_staff'] = user.is_staff
+        token['is_superuser'] = user.is_superuser
+        # Unlike "iat" not rounded to the second, so a change just before it is not mistaken for a later one
+        token['claims_at'] = time.time()
+        return token
+
+
+class MemberTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refresh that issues tokens with the user's current claims instead of copying the old ones"""
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        user = User.objects.filter(pk=refresh[jwt_settings.USER_ID_CLAIM]).first()
+        if not jwt_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed('User is inactive or no longer exists.', code='user_inactive')
+
+        fresh = MemberTokenObtainPairSerializer.get_token(user)
+        data = {'access': str(fresh.access_token)}
+        if jwt_settings.ROTATE_REFRESH_TOKENS:
+            if jwt_settings.BLACKLIST_AFTER_ROTATION:
+                try:
+                    refresh.blacklist()
+                except AttributeError:
+                    # The token_blacklist app is not installed
+                    pass
+            data['refresh'] = str(fresh)
+        return data
+
+
+class ClaimsUser:
+    """
+    Authenticated user backed by token claims instead of a database row.
+    Has the User attributes the API uses; member_organization is loaded on
+    first access and then kept for the rest of the request.
+    """
+    is_active = True
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, token):
+        self.token = token
+        self.pk = self.id = token[jwt_settings.USER_ID_CLAIM]
+        self.username = token.get('username', '')
+        self.email = token.get('email', '')
+        self.is_staff = token.get('is_staff', False)
+        self.is_superuser = token.get('is_superuser', False)
+        self.member_organization_id = token.get(ORGANIZATION_CLAIM)
+        self.auto_approve_content = token.get('auto_approve_content', False)
+
+    def __str__(self):
+        return self.username
+
+    def __eq__(self, other):
+        return isinstance(other, (ClaimsUser, User)) and self.pk == other.pk
+
+    def __hash__(self):
+        return hash(self.pk)
+
+    def get_username(self):
+        return self.username
+
+    @cached_property
+    def member_organization(self):
+        if self.member_organization_id is None:
+            # Same exception as User.member_organization, so hasattr() checks keep working
+            raise User.member_organization.RelatedObjectDoesNotExist('User has no member_organization.')
+        return MemberOrganization.objects.get(pk=self.member_organization_id)
+
+    def has_perm(self, perm, obj=None):
+        return self.is_superuser
+
+    def has_module_perms(self, app_label):
+        return self.is_superuser
+
+
+def member_organization_id(user):
+    """Id of the user's member organization or None, resolved at most once per request"""
+    if isinstance(user, ClaimsUser):
+        return user.member_organization_id
+    if not user.is_authenticated:
+        return None
+    if not hasattr(user, '_member_organization_id'):
+        organization = MemberOrganization.objects.filter(user=user).values('id', 'auto_approve_content').first()
+        user._member_organization_id = organization['id'] if organization else None
+        user._auto_approve_content = bool(organization and organization['auto_approve_content'])
+    return user._member_organization_id
+
+
+def require_member_organization_id(user):
+    """member_organization_id() for endpoints only member organizations may write to"""
+    organization_id = member_organization_id(user)
+    if organization_id is None:
+        raise PermissionDenied('Only member organizations can do this.')
+    return organization_id
+
+
+def can_auto_approve(user):
+    """Whether content from the user's organization skips moderation"""
+    if isinstance(user, ClaimsUser):
+        return user.auto_approve_content
+    member_organization_id(user)
+    return getattr(user, '_auto_approve_content', False)
+
+
+class TokenCache:
+    """Thread-safe LRU of validated tokens keyed by the raw token, dropped at expiry"""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self.tokens = OrderedDict()
+
+    def get(self, raw_token):
+        with self.lock:
+            entry = self.tokens.get(raw_token)
+            if entry is None:
+                return None
+            if entry['exp'] <= time.time():
+                del self.tokens[raw_token]
+                return None
+            self.tokens.move_to_end(raw_token)
+            return entry['token']
+
+    def set(self, raw_token, token):
+        with self.lock:
+            self.tokens[raw_token] = {'token': token, 'exp': token['exp']}
+            self.tokens.move_to_end(raw_token)
+            while len(self.tokens) > self.max_size:
+                self.tokens.popitem(last=False)
+
+
+token_cache = TokenCache(getattr(settings, 'JWT_TOKEN_CACHE_SIZE', 10000))
+
+
+def claims_change_lifetime():
+    """How long a change matters: until every token issued before it has expired"""
+    return max(jwt_settings.ACCESS_TOKEN_LIFETIME, jwt_settings.REFRESH_TOKEN_LIFETIME)
+
+
+class ClaimsChanges:
+    """Per-process copy of recent ClaimsChange rows, {user id: timestamp}, polled at most every poll_seconds"""
+
+    def __init__(self, poll_seconds):
+        self.poll_seconds = poll_seconds
+        self.lock = threading.Lock()
+        self.changed = {}
+        self.polled_at = None
+        self.next_poll = 0
+
+    def get(self, user_id):
+        if time.monotonic() >= self.next_poll:
+            self.poll()
+        return self.changed.get(user_id)
+
+    def poll(self):
+        with self.lock:
+            if time.monotonic() < self.next_poll:
+                return
+            now = timezone.now()
+            # From the primary: a lagging replica could hide a change
+            rows = ClaimsChange.objects.using(DEFAULT_DB_ALIAS)
+            if self.polled_at is not None:
+                rows = rows.filter(changed_at__gte=self.polled_at - CLAIMS_POLL_OVERLAP)
+            for user_id, changed_at in rows.values_list('user_id', 'changed_at'):
+                self.note(user_id, changed_at.timestamp())
+            expired = (now - claims_change_lifetime()).timestamp()
+            self.changed = {user_id: changed for user_id, changed in self.changed.items() if changed > expired}
+            self.polled_at = now
+            self.next_poll = time.monotonic() + self.poll_seconds
+
+    def note(self, user_id, changed):
+        if changed > self.changed.get(user_id, 0):
+            self.changed[user_id] = changed
+
+
+claims_changes = ClaimsChanges(getattr(settings, 'JWT_CLAIMS_POLL_SECONDS', 5))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that caches decoded tokens and trusts their claims"""
+
+    def get_validated_token(self, raw_token):
+        token = token_cache.get(raw_token)
+        if token is None:
+            token = super().get_validated_token(raw_token)
+            token_cache.set(raw_token, token)
+        return token
+
+    def get_user(self, validated_token):
+        if ORGANIZATION_CLAIM not in validated_token:
+            # Issued before the claims were added
+            return super().get_user(validated_token)
+        changed = claims_changes.get(validated_token[jwt_settings.USER_ID_CLAIM])
+        if changed is not None and changed >= validated_token.get('claims_at', 0):
+            # The user or their organization changed after the token was issued
+            return super().get_user(validated_token)
+        return ClaimsUser(validated_token)
+
+
+def mark_claims_changed(*user_ids):
+    """Make tokens issued so far for these users fall back to the database, in every worker"""
+    user_ids = {user_id for user_id in user_ids if user_id}
+    if not user_ids:
+        return
+    now = timezone.now()
+    ClaimsChange.objects.bulk_create(
+        [ClaimsChange(user_id=user_id, changed_at=now) for user_id in user_ids],
+        update_conflicts=True, unique_fields=['user_id'], update_fields=['changed_at'],
+    )
+    ClaimsChange.objects.filter(changed_at__lt=now - claims_change_lifetime()).delete()
+    # Other workers see the change at their next poll; this one at once
+    for user_id in user_ids:
+        claims_changes.note(user_id, now.timestamp())
+
+
+def mark_organizations_changed(organization_ids):
+    """mark_claims_changed() for organizations changed with update() or bulk_update()"""
+    mark_claims_changed(*MemberOrganization.objects.filter(pk__in=organization_ids).values_list('user_id', flat=True))
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, update_fields=None, **kwargs):
+    # Logins only touch last_login, which is not a claim
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    mark_claims_changed(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    mark_claims_changed(instance.pk)
+
+
+@receiver(post_save, sender=MemberOrganization)
+def organization_saved(sender, instance, **kwargs):
+    mark_claims_changed(instance.user_id)
@@ -0,0 +1,49 @@
+# Generated by Django 5.0.1 on 2026-10-19 14:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MembershipReminder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('expiry_date', models.DateField(help_text='Membership expiry date the reminder refers to')),
+                ('window_days', models.PositiveIntegerField(help_text='Reminder window, e.g. 30, 7 or 1 days before expiry')),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('SENT', 'Sent')], default='PENDING', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Membership Reminder',
+                'verbose_name_plural': 'Membership Reminders',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='memberorganization',
+            index=models.Index(fields=['status', 'membership_expiry_date'], name='members_mem_status_617837_idx'),
+        ),
+        migrations.AddField(
+            model_name='membershipreminder',
+            name='organization',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='membership_reminders', to='members.memberorganization'),
+        ),
+        migrations.AddIndex(
+            model_name='membershipreminder',
+            index=models.Index(fields=['status', 'created_at'], name='members_mem_status_ba6aee_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='membershipreminder',
+            unique_together={('organization', 'expiry_date', 'window_days')},
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.0.1 on 2026-10-19 14:29
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def mark_completed_payments_activated(apps, schema_editor):
+    """Payments completed before this migration were already applied to their membership"""
+    MembershipPayment = apps.get_model('members', 'MembershipPayment')
+    MembershipPayment.objects.filter(status='COMPLETED').update(activated_at=F('updated_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0002_membership_reminders'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='membershippayment',
+            name='activated_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(mark_completed_payments_activated, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.1 on 2026-10-19 15:00
+
+from django.db import migrations, models
+
+from ngo.admin import prefix_search_index
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0003_membershippayment_activated_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='memberorganization',
+            name='name',
+            field=models.CharField(db_index=True, max_length=255),
+        ),
+        prefix_search_index('members', 'MemberOrganization', 'name'),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.0.1 on 2026-10-19 15:27
+
+import django.core.validators
+import members.models
+import pages.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0004_admin_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='membershipapplication',
+            name='rrc_certificate',
+            field=models.FileField(storage=pages.storage.upload_storage, upload_to='applications/certificates/', validators=[django.core.validators.FileExtensionValidator(['pdf', 'jpg', 'jpeg', 'png']), members.models.validate_file_size]),
+        ),
+        migrations.AlterField(
+            model_name='membershipapplication',
+            name='supporting_documents',
+            field=models.FileField(blank=True, storage=pages.storage.upload_storage, upload_to='applications/docs/', validators=[django.core.validators.FileExtensionValidator(['pdf', 'zip']), members.models.validate_file_size]),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.1 on 2026-10-19 15:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0005_upload_storage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClaimsChange',
+            fields=[
+                ('user_id', models.IntegerField(primary_key=True, serialize=False)),
+                ('changed_at', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Claims Change',
+                'verbose_name_plural': 'Claims Changes',
+            },
+        ),
+    ]
@@ -1,8 +1,10 @@
-from django.db import models
+from itertools import count
+from django.db import models, transaction, IntegrityError
 from django.contrib.auth.models import User
 from django.core.validators import FileExtensionValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
 from django.utils.text import slugify
+from pages.storage import upload_storage
 import os
 
 
@@ -23,7 +25,52 @@ class TimeStampedModel(models.Model):
         abstract = True
 
 
-class MemberOrganization(TimeStampedModel):
+def unique_slug(instance, value, field_name='slug'):
+    """
+    Slugify value and append the lowest free -N suffix if the slug is taken.
+    All possibly colliding slugs are fetched with one prefix query.
+    """
+    model = type(instance)
+    max_length = model._meta.get_field(field_name).max_length
+    base = slugify(value)[:max_length].strip('-') or model._meta.model_name
+    
+    # Leave room for a suffix so truncated candidates are covered by the same query
+    prefix = base[:max_length - 11].rstrip('-') if len(base) > max_length - 11 else base
+    taken = set(
+        model._base_manager.filter(**{f'{field_name}__startswith': prefix})
+        .exclude(pk=instance.pk)
+        .values_list(field_name, flat=True)
+    )
+    if base not in taken:
+        return base
+    for number in count(1):
+        suffix = f'-{number}'
+        candidate = base[:max_length - len(suffix)].rstrip('-') + suffix
+        if candidate not in taken:
+            return candidate
+
+
+class UniqueSlugMixin:
+    """Fill an empty slug from slug_source on save, retrying if a concurrent save takes it first"""
+    slug_source = 'title'
+    slug_save_attempts = 3
+    
+    def save(self, *args, **kwargs):
+        if self.slug:
+            return super().save(*args, **kwargs)
+        for attempt in range(1, self.slug_save_attempts + 1):
+            self.slug = unique_slug(self, getattr(self, self.slug_source))
+            try:
+                # Savepoint so a lost race does not break an outer transaction
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                if attempt == self.slug_save_attempts:
+                    raise
+                self.slug = ''
+
+
+class MemberOrganization(UniqueSlugMixin, TimeStampedModel):
     """NGO Member Organizations"""
     MEMBER_TYPE_CHOICES = [
         ('NATIONAL', 'National NGO'),
@@ -37,7 +84,9 @@ class MemberOrganization(TimeStampedModel):
         ('SUSPENDED', 'Suspended'),
     ]
     
-    name = models.CharField(max_length=255)
+    slug_source = 'name'
+    
+    name = models.CharField(max_length=255, db_index=True)
     slug = models.SlugField(max_length=255, unique=True, blank=True)
     member_type = models.CharField(max_length=20, choices=MEMBER_TYPE_CHOICES)
     rrc_number = models.CharField(max_length=100, blank=True, help_text="RRC Registration Number")
@@ -74,15 +123,13 @@ class MemberOrganization(TimeStampedModel):
         ordering = ['name']
         verbose_name = 'Member Organization'
         verbose_name_plural = 'Member Organizations'
+        indexes = [
+            models.Index(fields=['status', 'membership_expiry_date']),
+        ]
     
     def __str__(self):
         return self.name
     
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.name)
-        super().save(*args, **kwargs)
-    
     @property
     def is_membership_expiring_soon(self):
         """Check if membership expires within 30 days"""
@@ -150,6 +197,7 @@ class MembershipApplication(TimeStampedModel):
     rrc_registration = models.CharField(max_length=100, help_text="RRC Registration Number")
     rrc_certificate = models.FileField(
         upload_to='applications/certificates/',
+        storage=upload_storage,
         validators=[FileExtensionValidator(['pdf', 'jpg', 'jpeg', 'png']), validate_file_size]
     )
     
@@ -172,6 +220,7 @@ class MembershipApplication(TimeStampedModel):
     # Supporting documents
     supporting_documents = models.FileField(
         upload_to='applications/docs/',
+        storage=upload_storage,
         blank=True,
         validators=[FileExtensionValidator(['pdf', 'zip']), validate_file_size]
     )
@@ -222,6 +271,17 @@ class MembershipPayment(TimeStampedModel):
     )
     notes = models.TextField(blank=True)
     
+    # Set once when the payment has been applied to the organization's membership
+    activated_at = models.DateTimeField(null=True, blank=True, editable=False)
+    
+    # Status changes a payment may go through
+    ALLOWED_TRANSITIONS = {
+        'PENDING': {'COMPLETED', 'FAILED'},
+        'FAILED': {'PENDING'},
+        'COMPLETED': {'REFUNDED'},
+        'REFUNDED': set(),
+    }
+    
     class Meta:
         ordering = ['-payment_date']
         verbose_name = 'Membership Payment'
@@ -229,3 +289,70 @@ class MembershipPayment(TimeStampedModel):
     
     def __str__(self):
         return f"{self.organization.name} - ${self.amount} ({self.status})"
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+    
+    def save(self, *args, **kwargs):
+        # activated_at is only ever written by activate_membership()'s UPDATE; a full save of an
+        # instance loaded before activation would otherwise write NULL back and apply it again
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'activated_at'
+            ]
+        super().save(*args, **kwargs)
+    
+    def clean(self):
+        """Reject status changes that skip the payment state machine"""
+        previous = getattr(self, '_loaded_status', None)
+        if previous and previous != self.status and self.status not in self.ALLOWED_TRANSITIONS[previous]:
+            raise ValidationError({'status': f"A {previous.lower()} payment cannot be marked {self.status.lower()}"})
+
+
+class MembershipReminder(models.Model):
+    """Log of membership expiry reminders, one per organization per reminder window"""
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('SENT', 'Sent'),
+    ]
+    
+    organization = models.ForeignKey(MemberOrganization, on_delete=models.CASCADE, related_name='membership_reminders')
+    expiry_date = models.DateField(help_text="Membership expiry date the reminder refers to")
+    window_days = models.PositiveIntegerField(help_text="Reminder window, e.g. 30, 7 or 1 days before expiry")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Membership Reminder'
+        verbose_name_plural = 'Membership Reminders'
+        unique_together = ['organization', 'expiry_date', 'window_days']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.organization.name} - {self.window_days} day reminder ({self.status})"
+
+
+class ClaimsChange(models.Model):
+    """
+    When a user's token claims last went stale (account, organization or its flags changed).
+    Every worker polls this table, so tokens issued before the change stop being trusted
+    in all processes (members/authentication.py). Not a foreign key, so the row outlives
+    a deleted user.
+    """
+    user_id = models.IntegerField(primary_key=True)
+    changed_at = models.DateTimeField(db_index=True)
+    
+    class Meta:
+        verbose_name = 'Claims Change'
+        verbose_name_plural = 'Claims Changes'
+    
+    def __str__(self):
+        return f"User {self.user_id} claims changed at {self.changed_at}"
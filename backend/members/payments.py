@@ -0,0 +1,119 @@
+from collections import Counter
+from datetime import timedelta
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+from .authentication import mark_organizations_changed
+from .models import MemberOrganization, MembershipPayment
+
+
+MEMBERSHIP_PERIOD = timedelta(days=365)
+
+# Membership fields touched when a payment is applied
+ACTIVATION_FIELDS = [
+    'membership_fee_paid', 'membership_expiry_date', 'is_verified',
+    'auto_approve_content', 'status', 'updated_at'
+]
+
+
+def next_expiry_date(current_expiry, periods=1, today=None):
+    """Extend from the current expiry if it is still running, otherwise from today"""
+    today = today or timezone.now().date()
+    start = current_expiry if current_expiry and current_expiry > today else today
+    return start + MEMBERSHIP_PERIOD * periods
+
+
+def activate_membership(payment):
+    """
+    Apply a completed payment to its organization exactly once.
+    Returns False if the payment was already applied (e.g. it was saved again).
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        # Claiming activated_at is the once-only guard: concurrent saves of the
+        # same payment race on this UPDATE and only one of them matches a row
+        claimed = MembershipPayment.objects.filter(
+            pk=payment.pk,
+            status='COMPLETED',
+            activated_at__isnull=True
+        ).update(activated_at=now)
+        if not claimed:
+            return False
+
+        current_expiry = (
+            MemberOrganization.objects.select_for_update()
+            .values_list('membership_expiry_date', flat=True)
+            .get(pk=payment.organization_id)
+        )
+        MemberOrganization.objects.filter(pk=payment.organization_id).update(
+            membership_fee_paid=True,
+            membership_expiry_date=next_expiry_date(current_expiry),
+            is_verified=True,
+            auto_approve_content=True,
+            status=Case(When(status='PENDING', then=Value('ACTIVE')), default=F('status')),
+            updated_at=now
+        )
+
+    # auto_approve_content is carried in access tokens
+    mark_organizations_changed([payment.organization_id])
+    payment.activated_at = now
+    return True
+
+
+def complete_payments(payments):
+    """
+    Mark a batch of pending payments as completed and apply them to their
+    organizations in a single transaction. Payments that are not pending are skipped.
+    Returns the completed payment ids.
+    """
+    now = timezone.now()
+    today = now.date()
+    with transaction.atomic():
+        # Lock payments before organizations, the same order activate_membership uses
+        pending = list(
+            payments.filter(status='PENDING', activated_at__isnull=True)
+            .select_for_update()
+            .values_list('id', 'organization_id')
+        )
+        if not pending:
+            return []
+
+        periods = Counter(organization_id for _, organization_id in pending)
+        organizations = list(
+            MemberOrganization.objects.select_for_update()
+            .filter(pk__in=periods)
+            .only('id', 'membership_expiry_date', 'status')
+        )
+        for org in organizations:
+            org.membership_fee_paid = True
+            org.membership_expiry_date = next_expiry_date(org.membership_expiry_date, periods[org.id], today)
+            org.is_verified = True
+            org.auto_approve_content = True
+            if org.status == 'PENDING':
+                org.status = 'ACTIVE'
+            org.updated_at = now
+        MemberOrganization.objects.bulk_update(organizations, ACTIVATION_FIELDS, batch_size=500)
+
+        payment_ids = [payment_id for payment_id, _ in pending]
+        # update() does not send post_save, so activate_membership is not triggered again
+        MembershipPayment.objects.filter(pk__in=payment_ids).update(
+            status='COMPLETED',
+            activated_at=now,
+            updated_at=now
+        )
+    mark_organizations_changed(list(periods))
+    return payment_ids
+
+
+def reconcile_payments(transaction_references):
+    """
+    Complete the pending payments matching an imported batch of transaction references.
+    Returns (completed payment ids, references that matched no pending payment).
+    """
+    references = {ref.strip() for ref in transaction_references if ref and ref.strip()}
+    payments = MembershipPayment.objects.filter(transaction_reference__in=references)
+    completed_ids = complete_payments(payments)
+    matched = set(
+        MembershipPayment.objects.filter(pk__in=completed_ids).values_list('transaction_reference', flat=True)
+    )
+    return completed_ids, sorted(references - matched)
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from pages.serializers import ImageVariantsField
 from .models import MemberOrganization, OrganizationContact, StaffMember, MembershipApplication, MembershipPayment
 
 
@@ -10,10 +11,12 @@ class OrganizationContactSerializer(serializers.ModelSerializer):
 
 class MemberOrganizationListSerializer(serializers.ModelSerializer):
     """Lightweight serializer for list views"""
+    logo_variants = ImageVariantsField(source='logo')
+    
     class Meta:
         model = MemberOrganization
         fields = [
-            'id', 'name', 'slug', 'member_type', 'logo', 'city', 'state',
+            'id', 'name', 'slug', 'member_type', 'logo', 'logo_variants', 'city', 'state',
             'website', 'email', 'status', 'is_verified', 'date_joined'
         ]
 
@@ -22,13 +25,14 @@ class MemberOrganizationDetailSerializer(serializers.ModelSerializer):
     """Full serializer for detail views"""
     contacts = OrganizationContactSerializer(many=True, read_only=True)
     is_membership_expiring_soon = serializers.ReadOnlyField()
+    logo_variants = ImageVariantsField(source='logo')
     
     class Meta:
         model = MemberOrganization
         fields = [
             'id', 'name', 'slug', 'member_type', 'rrc_number', 'registration_date',
             'email', 'phone', 'website', 'address', 'city', 'state', 'description',
-            'logo', 'status', 'date_joined', 'is_verified', 'auto_approve_content',
+            'logo', 'logo_variants', 'status', 'date_joined', 'is_verified', 'auto_approve_content',
             'membership_fee_paid', 'membership_expiry_date', 'is_membership_expiring_soon',
             'contacts', 'created_at', 'updated_at'
         ]
@@ -46,9 +50,11 @@ class MemberOrganizationWriteSerializer(serializers.ModelSerializer):
 
 
 class StaffMemberSerializer(serializers.ModelSerializer):
+    photo_variants = ImageVariantsField(source='photo')
+    
     class Meta:
         model = StaffMember
-        fields = ['id', 'name', 'position', 'email', 'phone', 'bio', 'photo', 'order', 'is_active']
+        fields = ['id', 'name', 'position', 'email', 'phone', 'bio', 'photo', 'photo_variants', 'order', 'is_active']
 
 
 class MembershipApplicationSerializer(serializers.ModelSerializer):
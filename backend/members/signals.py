@@ -1,36 +1,16 @@
 from django.db.models.signals import post_save
 from django.dispatch import receiver
-from django.utils import timezone
-from datetime import timedelta
-from .models import MembershipPayment, MemberOrganization
+from .models import MembershipPayment
+from .payments import activate_membership
 
 
 @receiver(post_save, sender=MembershipPayment)
 def handle_payment_completion(sender, instance, created, **kwargs):
     """
-    When a payment is marked as completed, update organization verification status
-    and extend membership expiry date by 1 year
+    When a payment is marked as completed, verify the organization and extend
+    its membership by 1 year. Each payment is applied once, however often it is saved:
+    activate_membership() claims activated_at in the database, so a stale in-memory
+    value does not matter.
     """
-    if instance.status == 'COMPLETED' and instance.organization:
-        org = instance.organization
-        
-        # Mark membership fee as paid
-        org.membership_fee_paid = True
-        
-        # Set or extend membership expiry date by 1 year
-        if org.membership_expiry_date and org.membership_expiry_date > timezone.now().date():
-            # Extend from current expiry
-            org.membership_expiry_date = org.membership_expiry_date + timedelta(days=365)
-        else:
-            # Set new expiry from today
-            org.membership_expiry_date = timezone.now().date() + timedelta(days=365)
-        
-        # Verify the member and enable auto-approval
-        org.is_verified = True
-        org.auto_approve_content = True
-        
-        # Activate if pending
-        if org.status == 'PENDING':
-            org.status = 'ACTIVE'
-        
-        org.save()
+    if instance.status == 'COMPLETED':
+        activate_membership(instance)
@@ -2,6 +2,10 @@ from rest_framework import viewsets, permissions, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from ngo.async_views import AsyncListMixin
+from ngo.fast_serializers import FastReadMixin
+from ngo.viewsets import SparseFieldsetMixin
+from .authentication import member_organization_id
 from .models import MemberOrganization, OrganizationContact, StaffMember, MembershipApplication, MembershipPayment
 from .serializers import (
     MemberOrganizationListSerializer, MemberOrganizationDetailSerializer,
@@ -15,10 +19,10 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         if request.method in permissions.SAFE_METHODS:
             return True
-        return obj.user == request.user if hasattr(obj, 'user') else False
+        return obj.user_id == request.user.pk if hasattr(obj, 'user_id') else False
 
 
-class PublicMemberViewSet(viewsets.ReadOnlyModelViewSet):
+class PublicMemberViewSet(AsyncListMixin, FastReadMixin, SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """Public read-only access to member organizations"""
     queryset = MemberOrganization.objects.filter(status='ACTIVE')
     permission_classes = [permissions.AllowAny]
@@ -35,14 +39,15 @@ class PublicMemberViewSet(viewsets.ReadOnlyModelViewSet):
         return MemberOrganizationListSerializer
 
 
-class MemberProfileViewSet(viewsets.ModelViewSet):
+class MemberProfileViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """Authenticated member profile management"""
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrReadOnly]
     
     def get_queryset(self):
         # Members can only access their own organization
-        if hasattr(self.request.user, 'member_organization'):
-            return MemberOrganization.objects.filter(id=self.request.user.member_organization.id)
+        organization_id = member_organization_id(self.request.user)
+        if organization_id is not None:
+            return MemberOrganization.objects.filter(id=organization_id)
         return MemberOrganization.objects.none()
     
     def get_serializer_class(self):
@@ -62,14 +67,14 @@ class MemberProfileViewSet(viewsets.ModelViewSet):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class StaffMemberViewSet(viewsets.ReadOnlyModelViewSet):
+class StaffMemberViewSet(SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """Public access to staff directory"""
     queryset = StaffMember.objects.filter(is_active=True)
     serializer_class = StaffMemberSerializer
     permission_classes = [permissions.AllowAny]
 
 
-class MembershipApplicationViewSet(viewsets.ModelViewSet):
+class MembershipApplicationViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """Handle membership applications"""
     serializer_class = MembershipApplicationSerializer
     permission_classes = [permissions.AllowAny]
@@ -83,7 +88,7 @@ class MembershipApplicationViewSet(viewsets.ModelViewSet):
         serializer.save(application_status='PENDING')
 
 
-class MembershipPaymentViewSet(viewsets.ModelViewSet):
+class MembershipPaymentViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """Handle membership payments"""
     serializer_class = MembershipPaymentSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -91,6 +96,7 @@ class MembershipPaymentViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         if self.request.user.is_staff:
             return MembershipPayment.objects.all()
-        if hasattr(self.request.user, 'member_organization'):
-            return MembershipPayment.objects.filter(organization=self.request.user.member_organization)
+        organization_id = member_organization_id(self.request.user)
+        if organization_id is not None:
+            return MembershipPayment.objects.filter(organization_id=organization_id)
         return MembershipPayment.objects.none()
@@ -0,0 +1,104 @@
+from django.contrib import admin
+from django.core.exceptions import FieldDoesNotExist
+from django.core.paginator import Paginator
+from django.db import connections, migrations
+from django.db.models import ForeignKey, QuerySet
+from django.utils.functional import cached_property
+
+
+# Below this many rows an exact COUNT(*) is cheap enough and more useful
+ESTIMATED_COUNT_MIN = 10000
+
+
+def estimated_count(queryset):
+    """
+    Row estimate from the database statistics for an unfiltered queryset, or None
+    when there is no usable estimate (filtered queryset, SQLite, small table).
+    """
+    if not isinstance(queryset, QuerySet) or queryset.query.where or queryset.query.distinct:
+        return None
+    connection = connections[queryset.db]
+    table = queryset.model._meta.db_table
+    if connection.vendor == 'postgresql':
+        # reltuples is -1 until the table has been analyzed
+        sql = 'SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)'
+        table = connection.ops.quote_name(table)
+    elif connection.vendor == 'mysql':
+        sql = 'SELECT table_rows FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = %s'
+    else:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [table])
+        row = cursor.fetchone()
+    if row is None or row[0] is None or row[0] < ESTIMATED_COUNT_MIN:
+        return None
+    return int(row[0])
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that uses the table statistics instead of COUNT(*) for unfiltered changelists"""
+
+    @cached_property
+    def count(self):
+        estimate = estimated_count(self.object_list)
+        return estimate if estimate is not None else super().count
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    ModelAdmin for tables too large to count or scan on every changelist view.
+    Foreign keys shown in list_display are joined (nullable ones included),
+    the unfiltered total comes from the table statistics and the filtered
+    total is not repeated as a second full count.
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def __init__(self, model, admin_site):
+        super().__init__(model, admin_site)
+        if self.list_select_related is False:
+            self.list_select_related = self.related_list_display()
+
+    def related_list_display(self):
+        """Names of the foreign keys in list_display"""
+        names = []
+        for name in self.list_display:
+            if not isinstance(name, str):
+                continue
+            try:
+                field = self.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if isinstance(field, ForeignKey):
+                names.append(name)
+        return names
+
+
+def prefix_search_index(app_label, model_name, field_name):
+    """
+    Migration operation indexing UPPER(column) for '^field' admin searches on PostgreSQL.
+    Django compiles those to UPPER(column) LIKE UPPER('term%'), which a plain
+    index cannot serve there; other databases use the field's db_index.
+    """
+    def index_name(model, column):
+        return f'{model._meta.db_table}_{column}_upper_like'[:63]
+
+    def create(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        model = apps.get_model(app_label, model_name)
+        column = model._meta.get_field(field_name).column
+        quote = schema_editor.quote_name
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {quote(index_name(model, column))} '
+            f'ON {quote(model._meta.db_table)} (UPPER({quote(column)}) varchar_pattern_ops)'
+        )
+
+    def drop(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        model = apps.get_model(app_label, model_name)
+        column = model._meta.get_field(field_name).column
+        schema_editor.execute(f'DROP INDEX IF EXISTS {schema_editor.quote_name(index_name(model, column))}')
+
+    return migrations.RunPython(create, drop)
@@ -0,0 +1,119 @@
+"""
+Async list endpoints for the public read-only viewsets.
+
+With ASYNC_READ_VIEWS on (the default under passenger_asgi.py), the list route
+of a viewset using AsyncListMixin is an async view: the count and the page
+rows of its FastReadMixin plan are fetched with acount() and async iteration,
+so an ASGI worker keeps serving other requests while it waits on the database.
+(Not aiterator(): on Django 5.0 it runs values_list() queries on the event loop.)
+
+Anything the async path cannot do without blocking runs the regular DRF view
+in a thread instead: other methods, the browsable API, serializers that do
+not compile to a plan, pagination other than PageNumberPagination, and code
+that queries synchronously on the way (a token that needs a database lookup,
+a model choice filter), which Django reports as SynchronousOnlyOperation.
+"""
+from functools import update_wrapper
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import SynchronousOnlyOperation
+from django.core.paginator import InvalidPage
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+
+class AsyncListMixin:
+    """Serve the list route as an async view when ASYNC_READ_VIEWS is on; use with FastReadMixin"""
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        sync_view = super().as_view(actions, **initkwargs)
+        if actions != {'get': 'list'} or not getattr(settings, 'ASYNC_READ_VIEWS', False):
+            return sync_view
+        run_sync_view = sync_to_async(sync_view)
+
+        async def view(request, *args, **kwargs):
+            if request.method != 'GET':
+                return await run_sync_view(request, *args, **kwargs)
+            # The same set-up ViewSetMixin.as_view() does for each request
+            self = cls(**initkwargs)
+            self.action_map = actions
+            self.get = self.list
+            self.request = request
+            self.args = args
+            self.kwargs = kwargs
+            try:
+                return await self.adispatch(request, *args, **kwargs)
+            except SynchronousOnlyOperation:
+                return await run_sync_view(request, *args, **kwargs)
+
+        update_wrapper(view, sync_view)
+        view.cls = cls
+        view.initkwargs = initkwargs
+        view.actions = actions
+        return csrf_exempt(view)
+
+    async def adispatch(self, request, *args, **kwargs):
+        """APIView.dispatch() awaiting alist()"""
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+        try:
+            self.initial(request, *args, **kwargs)
+            response = await self.alist(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def alist(self, request, *args, **kwargs):
+        plan = self.get_fast_plan()
+        if (
+            plan is None
+            or not isinstance(request.accepted_renderer, JSONRenderer)
+            or (self.paginator is not None and not isinstance(self.paginator, PageNumberPagination))
+        ):
+            return await sync_to_async(self.list)(request, *args, **kwargs)
+
+        queryset = plan.values(self.filter_queryset(self.get_queryset()))
+        page = await self.apaginate_queryset(queryset) if self.paginator is not None else None
+        rows = page if page is not None else [row async for row in queryset]
+        if plan.batches:
+            # Batched fields (image variants) look up their values with a query of their own
+            data = await sync_to_async(plan.to_representation)(rows, request)
+        else:
+            data = plan.to_representation(rows, request)
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    async def apaginate_queryset(self, queryset):
+        """PageNumberPagination.paginate_queryset() with the count and rows fetched asynchronously"""
+        pagination = self.paginator
+        request = self.request
+        page_size = pagination.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = pagination.django_paginator_class(queryset, page_size)
+        # Paginator.count is a cached_property; setting it skips the synchronous COUNT
+        paginator.count = await queryset.acount()
+        page_number = pagination.get_page_number(request, paginator)
+        try:
+            page = paginator.page(page_number)
+        except InvalidPage as exc:
+            msg = pagination.invalid_page_message.format(page_number=page_number, message=str(exc))
+            raise NotFound(msg)
+        page.object_list = [row async for row in page.object_list]
+
+        if paginator.num_pages > 1 and pagination.template is not None:
+            pagination.display_page_controls = True
+        pagination.page = page
+        pagination.request = request
+        return list(page)
@@ -0,0 +1,133 @@
+"""
+Helpers shared by the benchmark and reporting management commands.
+"""
+import asyncio
+import io
+import sys
+from urllib.parse import urlsplit
+
+from django.core.asgi import get_asgi_application
+from django.core.wsgi import get_wsgi_application
+from django.test import Client
+from django.urls import NoReverseMatch, get_resolver, resolve, reverse
+from rest_framework.permissions import AllowAny
+
+
+def public_list_urls():
+    """Public router list routes that need no arguments, e.g. /api/public/jobs/"""
+    urls = set()
+    for name in get_resolver().reverse_dict:
+        if not isinstance(name, str) or not name.endswith('-list'):
+            continue
+        try:
+            url = reverse(name)
+        except NoReverseMatch:
+            continue
+        view_class = getattr(resolve(url).func, 'cls', None)
+        if view_class is not None and AllowAny in view_class.permission_classes:
+            urls.add(url)
+    return sorted(urls)
+
+
+class ClientDriver:
+    """Requests through django.test.Client (signals, test cookies and all)"""
+    name = 'client'
+
+    def __init__(self):
+        self.client = Client(raise_request_exception=False)
+
+    def get(self, url, headers=None):
+        response = self.client.get(url, headers=headers or {})
+        return response.status_code, response.content
+
+
+class WSGIDriver:
+    """Requests straight into the WSGI application, as Passenger would call it"""
+    name = 'wsgi'
+
+    def __init__(self):
+        self.application = get_wsgi_application()
+
+    def get(self, url, headers=None):
+        parts = urlsplit(url)
+        environ = {
+            'REQUEST_METHOD': 'GET',
+            'PATH_INFO': parts.path,
+            'QUERY_STRING': parts.query,
+            'SERVER_NAME': 'localhost',
+            'SERVER_PORT': '80',
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'REMOTE_ADDR': '127.0.0.1',
+            'HTTP_HOST': 'localhost',
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': 'http',
+            'wsgi.input': io.BytesIO(),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': False,
+            'wsgi.multiprocess': True,
+            'wsgi.run_once': False,
+        }
+        for name, value in (headers or {}).items():
+            environ['HTTP_' + name.upper().replace('-', '_')] = value
+
+        status = []
+        result = self.application(environ, lambda status_line, response_headers, exc_info=None: status.append(status_line))
+        try:
+            body = b''.join(result)
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+        return int(status[0].split(' ', 1)[0]), body
+
+
+class ASGIDriver:
+    """Requests straight into the ASGI application, as an ASGI server would call it; get() is a coroutine"""
+    name = 'asgi'
+
+    def __init__(self):
+        self.application = get_asgi_application()
+
+    async def get(self, url, headers=None):
+        parts = urlsplit(url)
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': parts.path,
+            'raw_path': parts.path.encode(),
+            'query_string': parts.query.encode(),
+            'root_path': '',
+            'headers': [(b'host', b'localhost')] + [
+                (name.lower().encode(), value.encode()) for name, value in (headers or {}).items()
+            ],
+            'client': ('127.0.0.1', 0),
+            'server': ('localhost', 80),
+        }
+        requested = False
+        disconnected = asyncio.Event()  # never set; Django cancels the wait once it has responded
+
+        async def receive():
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+            await disconnected.wait()
+            return {'type': 'http.disconnect'}
+
+        status = []
+        body = []
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                status.append(message['status'])
+            elif message['type'] == 'http.response.body':
+                body.append(message.get('body', b''))
+
+        await self.application(scope, receive, send)
+        return status[0], b''.join(body)
+
+
+# Synchronous drivers, interchangeable in the benchmark commands
+DRIVERS = {driver.name: driver for driver in (ClientDriver, WSGIDriver)}
@@ -0,0 +1,243 @@
+"""
+Compile read-only ModelSerializers into a values_list() query plus a row mapper.
+
+The compiled plan produces the same representation as the serializer for the
+fields it can handle: model columns, forward foreign key paths such as
+'organization.name', file fields, and properties whose columns are listed in
+the serializer's Meta.field_dependencies. A field with a
+to_representation_many(values, request) method (ImageVariantsField) is given
+the column values of all rows at once, for one lookup per response. Serializers with nested serializers,
+SerializerMethodFields or other sources are not compiled and callers fall back
+to the regular serializer.
+"""
+from collections import OrderedDict
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.fields import empty
+from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+
+# Field types whose to_representation() returns database values unchanged
+IDENTITY_FIELDS = (
+    serializers.CharField,
+    serializers.EmailField,
+    serializers.URLField,
+    serializers.SlugField,
+    serializers.IntegerField,
+    serializers.BooleanField,
+    serializers.ReadOnlyField,
+)
+
+# Mirrors DRF's SkipField: the key is left out of the output
+SKIP = object()
+
+# Plans by serializer class and kept field names, least recently used first. ?fields= and
+# ?omit= pick the subset, so the cache is bounded rather than growing with every combination.
+PLAN_CACHE_SIZE = 256
+_plans = OrderedDict()
+
+
+class FastPlan:
+    """Columns to select and how to turn each selected row into a dict"""
+
+    def __init__(self, columns, steps, batches=()):
+        self.columns = columns
+        self.steps = steps
+        # (key, to_representation_many) filling in keys that hold raw column values
+        self.batches = batches
+
+    def values(self, queryset):
+        return queryset.values_list(*self.columns)
+
+    def to_representation(self, rows, request=None):
+        steps = self.steps
+        data = []
+        for row in rows:
+            item = {}
+            for key, getter in steps:
+                value = getter(row, request)
+                if value is not SKIP:
+                    item[key] = value
+            data.append(item)
+        for key, to_representation_many in self.batches:
+            values = {item[key] for item in data if item.get(key) is not None}
+            represented = to_representation_many(values, request) if values else {}
+            for item in data:
+                if item.get(key) is not None:
+                    item[key] = represented.get(item[key])
+        return data
+
+
+def compile_serializer(serializer):
+    """Return a cached FastPlan for a serializer instance, or None if it cannot be compiled"""
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    # SparseFieldsetMixin has already dropped unknown names, so this is the valid subset
+    key = (type(serializer), tuple(sorted(serializer.fields)))
+    if key in _plans:
+        _plans.move_to_end(key)
+        return _plans[key]
+    plan = _plans[key] = _compile(serializer)
+    if len(_plans) > PLAN_CACHE_SIZE:
+        _plans.popitem(last=False)
+    return plan
+
+
+def _compile(serializer):
+    model = getattr(getattr(serializer, 'Meta', None), 'model', None)
+    if model is None:
+        return None
+    dependencies = getattr(serializer.Meta, 'field_dependencies', {})
+
+    columns = []
+    positions = {}
+
+    def column(path):
+        if path not in positions:
+            positions[path] = len(columns)
+            columns.append(path)
+        return positions[path]
+
+    steps = []
+    batches = []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        getter = _compile_field(model, field, dependencies.get(name), column)
+        if getter is None:
+            return None
+        steps.append((name, getter))
+        if hasattr(field, 'to_representation_many'):
+            batches.append((name, field.to_representation_many))
+    return FastPlan(columns, steps, batches)
+
+
+def _compile_field(model, field, field_dependencies, column):
+    if isinstance(field, (serializers.BaseSerializer, serializers.SerializerMethodField,
+                          serializers.ManyRelatedField, serializers.HiddenField)):
+        return None
+    if field.source == '*' or field.default is not empty:
+        return None
+
+    attrs = field.source_attrs
+    current = model
+    guards = []
+    prefix = ''
+    for attr in attrs[:-1]:
+        try:
+            relation = current._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return None
+        if not (relation.many_to_one or relation.one_to_one) or not relation.concrete:
+            return None
+        if relation.null:
+            guards.append(column(prefix + relation.attname))
+        prefix += attr + '__'
+        current = relation.related_model
+
+    try:
+        model_field = current._meta.get_field(attrs[-1])
+    except FieldDoesNotExist:
+        model_field = None
+
+    if model_field is None:
+        # A property on the model itself, evaluated against its declared columns
+        prop = getattr(model, attrs[-1], None)
+        if len(attrs) != 1 or not isinstance(prop, property) or field_dependencies is None:
+            return None
+        indexes = [(dependency, column(dependency)) for dependency in field_dependencies]
+        convert = _converter(field)
+
+        def get_property(row, request):
+            value = prop.fget(SimpleNamespace(**{dependency: row[i] for dependency, i in indexes}))
+            return None if value is None else convert(value)
+        return _guarded(get_property, guards, field)
+
+    if model_field.many_to_many or model_field.one_to_many or not model_field.concrete:
+        return None
+
+    if model_field.is_relation:
+        if not isinstance(field, PrimaryKeyRelatedField) or field.pk_field is not None:
+            return None
+        index = column(prefix + model_field.attname)
+        return _guarded(lambda row, request: row[index], guards, field)
+
+    index = column(prefix + model_field.name)
+
+    if hasattr(field, 'to_representation_many'):
+        # The column value, replaced by FastPlan.to_representation() once all rows are read
+        return _guarded(lambda row, request: row[index] or None, guards, field)
+
+    if isinstance(field, serializers.FileField):
+        use_url = getattr(field, 'use_url', api_settings.UPLOADED_FILES_USE_URL)
+        storage = model_field.storage
+
+        def get_file(row, request):
+            name = row[index]
+            if not name:
+                return None
+            if not use_url:
+                return name
+            url = storage.url(name)
+            return request.build_absolute_uri(url) if request is not None else url
+        return _guarded(get_file, guards, field)
+
+    convert = _converter(field)
+
+    def get_value(row, request):
+        value = row[index]
+        return None if value is None else convert(value)
+    return _guarded(get_value, guards, field)
+
+
+def _converter(field):
+    if type(field) in IDENTITY_FIELDS:
+        return lambda value: value
+    return field.to_representation
+
+
+def _guarded(getter, guards, field):
+    """Apply DRF's handling of a null relation on the way to the source attribute"""
+    if not guards:
+        return getter
+    missing = None if field.allow_null else SKIP
+
+    def get_guarded(row, request):
+        for index in guards:
+            if row[index] is None:
+                return missing
+        return getter(row, request)
+    return get_guarded
+
+
+class FastReadMixin:
+    """
+    Serve list responses from a compiled values_list() plan instead of model instances.
+    Falls back to the regular serializer when it cannot be compiled or when
+    FAST_READ_SERIALIZERS is off.
+    """
+    fast_read_actions = ['list']
+
+    def get_fast_plan(self):
+        if not getattr(settings, 'FAST_READ_SERIALIZERS', True):
+            return None
+        if getattr(self, 'action', None) not in self.fast_read_actions:
+            return None
+        return compile_serializer(self.get_serializer())
+
+    def list(self, request, *args, **kwargs):
+        plan = self.get_fast_plan()
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = plan.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(plan.to_representation(page, request))
+        return Response(plan.to_representation(queryset, request))
+
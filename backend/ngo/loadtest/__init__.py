@@ -0,0 +1,5 @@
+"""
+Load-test scenarios replaying the portal's API traffic against a running server.
+
+Run with: python manage.py load_test --base-url http://localhost:8000
+"""
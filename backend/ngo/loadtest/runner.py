@@ -0,0 +1,160 @@
+import asyncio
+import random
+import time
+
+from ngo.metrics import percentile
+
+from .scenarios import SCENARIOS
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - httpx is only needed for load tests
+    httpx = None
+
+
+class Recorder:
+    """Latency samples and errors per (scenario, endpoint label)"""
+
+    def __init__(self):
+        self.samples = {}
+        self.errors = {}
+
+    def add(self, scenario, label, seconds, ok):
+        key = (scenario, label)
+        self.samples.setdefault(key, []).append(seconds * 1000)
+        if not ok:
+            self.errors[key] = self.errors.get(key, 0) + 1
+
+    def summary(self, duration):
+        scenarios = {}
+        for (scenario, label), samples in self.samples.items():
+            entry = scenarios.setdefault(scenario, {'all': [], 'errors': 0, 'endpoints': {}})
+            errors = self.errors.get((scenario, label), 0)
+            entry['all'].extend(samples)
+            entry['errors'] += errors
+            entry['endpoints'][label] = latency_stats(samples, errors)
+
+        results = {}
+        for scenario, entry in sorted(scenarios.items()):
+            stats = latency_stats(entry['all'], entry['errors'])
+            stats['throughput_rps'] = round(len(entry['all']) / duration, 2)
+            stats['endpoints'] = dict(sorted(entry['endpoints'].items()))
+            results[scenario] = stats
+        return results
+
+
+def latency_stats(samples, errors):
+    samples = sorted(samples)
+    return {
+        'requests': len(samples),
+        'errors': errors,
+        'p50_ms': round(percentile(samples, 0.5), 2),
+        'p95_ms': round(percentile(samples, 0.95), 2),
+        'p99_ms': round(percentile(samples, 0.99), 2),
+        'max_ms': round(samples[-1], 2) if samples else 0.0,
+    }
+
+
+class VirtualUser:
+    """One simulated visitor with its own HTTP connection pool, credentials and state"""
+
+    def __init__(self, client, scenario, recorder, rng, credentials=None):
+        self.client = client
+        self.scenario = scenario
+        self.recorder = recorder
+        self.rng = rng
+        self.credentials = credentials
+        self.headers = {'Accept-Encoding': 'gzip, br'}
+        self.state = {}
+
+    @staticmethod
+    async def gather(*requests):
+        return await asyncio.gather(*requests)
+
+    async def request(self, method, path, label=None, params=None, json=None):
+        started = time.perf_counter()
+        ok = False
+        try:
+            response = await self.client.request(method, path.lstrip('/'), params=params, json=json, headers=self.headers)
+            ok = response.status_code < 400
+            return response.json() if ok and response.content else None
+        except (httpx.HTTPError, ValueError):
+            return None
+        finally:
+            self.recorder.add(self.scenario, f'{method} {label or path}', time.perf_counter() - started, ok)
+
+    async def get(self, path, label=None, params=None):
+        return await self.request('GET', path, label, params=params)
+
+    async def post(self, path, data, label=None):
+        return await self.request('POST', path, label, json=data)
+
+    async def login(self):
+        if not self.credentials:
+            raise RuntimeError(f'The {self.scenario} scenario needs credentials')
+        username, password = self.credentials
+        tokens = await self.post('/token/', {'username': username, 'password': password})
+        if not tokens or 'access' not in tokens:
+            raise RuntimeError(f'Login failed for {username}')
+        self.headers['Authorization'] = f"Bearer {tokens['access']}"
+
+
+async def run_user(user, scenario, deadline, think_time, start_delay):
+    await asyncio.sleep(start_delay)
+    if scenario['setup']:
+        try:
+            await scenario['setup'](user)
+        except RuntimeError:
+            return
+    weights = [weight for weight, _page in scenario['pages']]
+    pages = [page for _weight, page in scenario['pages']]
+    while time.monotonic() < deadline:
+        page = user.rng.choices(pages, weights)[0]
+        await page(user)
+        if think_time:
+            await asyncio.sleep(user.rng.uniform(0, 2 * think_time))
+
+
+async def run_load_test(base_url, users, duration, credentials, think_time=1.0, ramp_up=5.0, seed=42):
+    """
+    Run every scenario with users[name] virtual users for duration seconds.
+    credentials maps a scenario name to a list of (username, password) pairs.
+    """
+    if httpx is None:
+        raise RuntimeError('httpx is required for load tests: pip install httpx')
+
+    recorder = Recorder()
+    rng = random.Random(seed)
+    limits = httpx.Limits(max_connections=sum(users.values()) * 4)
+    async with httpx.AsyncClient(base_url=base_url.rstrip('/') + '/api/', timeout=30, limits=limits) as client:
+        started = time.monotonic()
+        deadline = started + ramp_up + duration
+        tasks = []
+        for name, count in users.items():
+            pool = credentials.get(name) or [None]
+            for i in range(count):
+                user = VirtualUser(client, name, recorder, random.Random(rng.random()), pool[i % len(pool)])
+                start_delay = ramp_up * i / count if count else 0
+                tasks.append(run_user(user, SCENARIOS[name], deadline, think_time, start_delay))
+        await asyncio.gather(*tasks)
+        elapsed = time.monotonic() - started
+
+    return recorder.summary(elapsed)
+
+
+def compare(baseline, results, threshold):
+    """Scenario-level regressions: tail latency up, throughput down or errors up by more than threshold percent"""
+    regressions = []
+    for scenario, now in results.items():
+        before = baseline.get(scenario)
+        if not before:
+            continue
+        if before['p95_ms'] and now['p95_ms'] > before['p95_ms'] * (1 + threshold / 100):
+            regressions.append(f"{scenario}: p95 {before['p95_ms']} -> {now['p95_ms']} ms")
+        if before['throughput_rps'] and now['throughput_rps'] < before['throughput_rps'] * (1 - threshold / 100):
+            regressions.append(f"{scenario}: throughput {before['throughput_rps']} -> {now['throughput_rps']} req/s")
+        before_rate = before['errors'] / before['requests'] if before['requests'] else 0
+        now_rate = now['errors'] / now['requests'] if now['requests'] else 0
+        if now_rate > before_rate + 0.01:
+            regressions.append(f'{scenario}: error rate {before_rate:.1%} -> {now_rate:.1%}')
+    return regressions
@@ -0,0 +1,181 @@
+"""
+Traffic mixes taken from the frontend pages (frontend/app/**/page.tsx).
+
+Each page function issues the requests its page makes, concurrently where the
+browser does (Promise.all / parallel fetches). Weights are the relative share
+of page views within the scenario.
+"""
+
+SEARCH_TERMS = ['health', 'water', 'juba', 'training', 'security', 'nutrition', 'education']
+
+
+# Anonymous visitors (public site)
+
+async def home(user):
+    # app/page.tsx
+    await user.gather(
+        user.get('/public/members/'),
+        user.get('/public/operational-presence/'),
+        user.get('/public/events/'),
+        user.get('/public/resources/'),
+    )
+
+
+async def jobs_board(user):
+    # app/jobs/page.tsx
+    await user.gather(
+        user.get('/public/jobs/'),
+        user.get('/public/trainings/'),
+        user.get('/public/tenders/'),
+    )
+
+
+async def forum(user):
+    # app/forum/page.tsx: categories, then posts with the search box
+    await user.get('/categories/')
+    params = {'search': user.rng.choice(SEARCH_TERMS)} if user.rng.random() < 0.3 else {}
+    posts = await user.get('/public/posts/', params=params)
+    if posts and posts.get('results') and user.rng.random() < 0.5:
+        post_id = user.rng.choice(posts['results'])['id']
+        await user.gather(
+            user.get(f'/public/posts/{post_id}/', label='/public/posts/{id}/'),
+            user.get(f'/public/posts/{post_id}/comments/', label='/public/posts/{id}/comments/'),
+        )
+
+
+async def members(user):
+    # app/members/page.tsx and app/members/[slug]/page.tsx
+    if user.rng.random() < 0.3:
+        params = {'search': user.rng.choice(SEARCH_TERMS)}
+    else:
+        params = {'page': user.rng.randint(1, 5)}
+    listing = await user.get('/public/members/', params=params)
+    if listing and listing.get('results'):
+        slug = user.rng.choice(listing['results'])['slug']
+        await user.get(f'/public/members/{slug}/', label='/public/members/{slug}/')
+
+
+async def resources(user):
+    # app/resources/page.tsx
+    params = {'search': user.rng.choice(SEARCH_TERMS)} if user.rng.random() < 0.4 else {}
+    await user.get('/public/resources/', params=params)
+
+
+async def events(user):
+    # app/events/page.tsx
+    await user.get('/public/events/')
+
+
+async def three_w_map(user):
+    # app/tools/3w-mapping/page.tsx; the page calls the member-only
+    # /operational-presence/ endpoint, anonymous traffic lands on the public one
+    states, _counties, _sectors = await user.gather(
+        user.get('/states/'),
+        user.get('/counties/'),
+        user.get('/sectors/'),
+    )
+    params = {'year': user.rng.choice([2023, 2024, 2025])}
+    if states and states.get('results'):
+        params['county__state'] = user.rng.choice(states['results'])['id']
+    await user.get('/public/operational-presence/', params=params)
+
+
+async def faqs(user):
+    # app/faqs/page.tsx
+    await user.get('/faqs/')
+
+
+# Signed-in members (portal/*)
+
+async def member_login(user):
+    # app/portal/login/page.tsx, then the dashboard
+    await user.login()
+    profile = await user.get('/profile/')
+    if profile and profile.get('results'):
+        user.state['organization_id'] = profile['results'][0]['id']
+
+
+async def member_dashboard(user):
+    # app/portal/dashboard/page.tsx
+    await user.get('/profile/')
+
+
+async def member_jobs(user):
+    # app/portal/jobs/page.tsx
+    await user.gather(user.get('/jobs/'), user.get('/trainings/'), user.get('/tenders/'))
+
+
+async def member_operational_data(user):
+    # app/portal/operational-data/page.tsx
+    await user.gather(user.get('/states/'), user.get('/counties/'), user.get('/sectors/'))
+    await user.get('/operational-presence/')
+
+
+async def member_forum_post(user):
+    # app/portal/forum/new/page.tsx, then a comment on the new post
+    categories = await user.get('/categories/')
+    category = categories['results'][0]['id'] if categories and categories.get('results') else None
+    await user.post('/posts/', {
+        'title': f'Load test post {user.rng.randint(1, 10**9)}',
+        'content': 'Posted by the load test scenario.',
+        'category': category,
+    })
+    # The create response has no id; the member's newest post is first in their list
+    own_posts = await user.get('/posts/')
+    if own_posts and own_posts.get('results') and user.state.get('organization_id'):
+        post_id = own_posts['results'][0]['id']
+        await user.post(f'/posts/{post_id}/comment/', {
+            'post': post_id,
+            'author': user.state['organization_id'],
+            'content': 'Follow-up comment from the load test scenario.',
+        }, label='/posts/{id}/comment/')
+
+
+async def member_events(user):
+    # app/portal/events/page.tsx
+    await user.get('/events/')
+
+
+# Moderators working through the queue
+
+async def moderator_login(user):
+    await user.login()
+
+
+async def moderator_queue(user):
+    """Review a page of pending items, approving most and rejecting some in two bulk calls"""
+    queue = await user.get('/moderation/', params={'moderation_status': 'PENDING'})
+    if not queue or not queue.get('results'):
+        return
+    approved, rejected = [], []
+    for item in queue['results'][:10]:
+        (approved if user.rng.random() < 0.8 else rejected).append(item['id'])
+    if approved:
+        await user.post('/moderation/bulk/', {'ids': approved, 'decision': 'approve'})
+    if rejected:
+        await user.post('/moderation/bulk/', {'ids': rejected, 'decision': 'reject', 'notes': 'Load test'})
+
+
+SCENARIOS = {
+    'anonymous': {
+        'description': 'Public site browsing',
+        'setup': None,
+        'pages': [
+            (30, home), (15, jobs_board), (15, forum), (15, members),
+            (10, resources), (5, events), (5, three_w_map), (5, faqs),
+        ],
+    },
+    'member': {
+        'description': 'JWT-authenticated members using the portal and posting',
+        'setup': member_login,
+        'pages': [
+            (30, member_dashboard), (25, member_jobs), (15, member_operational_data),
+            (15, member_forum_post), (15, member_events),
+        ],
+    },
+    'moderator': {
+        'description': 'Staff approving and rejecting queued content',
+        'setup': moderator_login,
+        'pages': [(1, moderator_queue)],
+    },
+}
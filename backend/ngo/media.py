@@ -0,0 +1,145 @@
+"""
+Serving uploaded files from API views, after the view has checked access.
+
+With MEDIA_SENDFILE set, serve_file() only checks the conditional headers and
+hands the transfer to the web server: 'x-sendfile' (Apache mod_xsendfile,
+LiteSpeed) with the file's path, or 'x-accel-redirect' (nginx) with its name
+under MEDIA_SENDFILE_PREFIX, an internal location aliased to MEDIA_ROOT. The
+server then does Range requests and the transfer, and the worker is free at once.
+
+Without it the file is streamed by Django, with an ETag and Last-Modified,
+If-None-Match/If-Modified-Since and single byte ranges (Range, If-Range), so
+an interrupted download of a large PDF can be resumed.
+"""
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseRedirect, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+from rest_framework.exceptions import NotAcceptable
+from rest_framework.negotiation import DefaultContentNegotiation
+
+
+RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+CHUNK_SIZE = 64 * 1024
+
+
+class FileContentNegotiation(DefaultContentNegotiation):
+    """For download actions: any Accept header gets the file, and errors render with the first renderer"""
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        try:
+            return super().select_renderer(request, renderers, format_suffix)
+        except NotAcceptable:
+            return renderers[0], renderers[0].media_type
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_range(header, size):
+    """
+    (first, last) byte positions of a single-range Range header, or None to send
+    the whole file (no header, a multi-range or a malformed one, as RFC 9110 allows).
+    """
+    match = RANGE.match(header.strip()) if header else None
+    if match is None or not any(match.groups()):
+        return None
+    first, last = match.groups()
+    if first:
+        first = int(first)
+        if last and int(last) < first:
+            return None
+        last = min(int(last), size - 1) if last else size - 1
+    else:
+        # bytes=-N: the last N bytes
+        if int(last) == 0:
+            raise RangeNotSatisfiable
+        first, last = max(size - int(last), 0), size - 1
+    if first >= size:
+        raise RangeNotSatisfiable
+    return first, last
+
+
+def read_range(path, first, last):
+    with open(path, 'rb') as f:
+        f.seek(first)
+        remaining = last - first + 1
+        while remaining > 0:
+            chunk = f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def serve_file(request, field_file, as_attachment=True, filename=None, on_download=None):
+    """
+    Response for a FieldFile, saved as filename (by default its stored name's).
+    on_download() is called when the response starts a download, i.e. not for a
+    304 or for a range resuming one part-way.
+    """
+    filename = filename or os.path.basename(field_file.name)
+    try:
+        path = field_file.path
+    except NotImplementedError:
+        # Storage without local files: let it serve the file from its own URL
+        if on_download:
+            on_download()
+        return HttpResponseRedirect(field_file.url)
+
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        # The row outlived its file, e.g. after a restore without the media directory
+        raise Http404('The file is missing.')
+    etag = f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+    last_modified = int(stat.st_mtime)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        return response
+
+    content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    sendfile = settings.MEDIA_SENDFILE
+    byte_range = None
+    if sendfile in ('x-sendfile', 'x-accel-redirect'):
+        response = HttpResponse(content_type=content_type)
+        if sendfile == 'x-sendfile':
+            response['X-Sendfile'] = path
+        else:
+            response['X-Accel-Redirect'] = settings.MEDIA_SENDFILE_PREFIX + quote(field_file.name)
+        # The web server answers the Range header; it is only read here so a resumed download is not counted
+        try:
+            byte_range = parse_range(request.headers.get('Range'), stat.st_size)
+        except RangeNotSatisfiable:
+            byte_range = (stat.st_size, stat.st_size - 1)
+    else:
+        if_range = request.headers.get('If-Range')
+        if if_range is None or if_range == etag or parse_http_date_safe(if_range) == last_modified:
+            try:
+                byte_range = parse_range(request.headers.get('Range'), stat.st_size)
+            except RangeNotSatisfiable:
+                response = HttpResponse(status=416)
+                response['Content-Range'] = f'bytes */{stat.st_size}'
+                return response
+
+        if byte_range is None:
+            response = FileResponse(open(path, 'rb'), content_type=content_type)
+        else:
+            first, last = byte_range
+            response = StreamingHttpResponse(read_range(path, first, last), status=206, content_type=content_type)
+            response['Content-Range'] = f'bytes {first}-{last}/{stat.st_size}'
+            response['Content-Length'] = str(last - first + 1)
+        response['Accept-Ranges'] = 'bytes'
+
+    response['Content-Disposition'] = content_disposition_header(as_attachment, filename)
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    if on_download and (byte_range is None or byte_range[0] == 0):
+        on_download()
+    return response
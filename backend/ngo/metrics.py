@@ -0,0 +1,182 @@
+"""
+In-process request metrics.
+
+Each worker process keeps its own rolling window of the last
+REQUEST_METRICS_WINDOW requests per route, so with several Passenger workers
+every scrape shows the worker that answered it.
+"""
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack, asynccontextmanager, contextmanager
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+from rest_framework import permissions
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.renderers import BaseRenderer
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
+
+
+QUANTILES = [0.5, 0.95, 0.99]
+
+# Recorded value -> (metric name, help text)
+SERIES = {
+    'duration': ('ngo_request_duration_seconds', 'Wall time of the request'),
+    'db_time': ('ngo_request_db_seconds', 'Time spent executing SQL'),
+    'db_queries': ('ngo_request_db_queries', 'SQL queries executed'),
+    'serializer_time': ('ngo_request_serializer_seconds', 'View time outside the database (mostly serialization)'),
+    'response_bytes': ('ngo_response_bytes', 'Response body size on the wire'),
+}
+
+
+class QueryTimer:
+    """connection.execute_wrapper() callable counting queries and their total time"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - started
+
+
+@contextmanager
+def wrap_connections(wrapper):
+    """Install an execute wrapper on every database connection of this thread inside the block"""
+    with ExitStack() as stack:
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(wrapper))
+        yield
+
+
+@asynccontextmanager
+async def awrap_connections(wrapper):
+    """
+    wrap_connections() for async code. Connections belong to a thread and the
+    async ORM queries from the request's sync thread, so the wrapper is
+    installed on that thread's connections rather than the event loop's.
+    """
+    stack = ExitStack()
+    await sync_to_async(stack.enter_context)(wrap_connections(wrapper))
+    try:
+        yield
+    finally:
+        await sync_to_async(stack.close)()
+
+
+class RouteStats:
+    """Rolling samples for one route plus totals since the process started"""
+
+    def __init__(self, window):
+        self.samples = {name: deque(maxlen=window) for name in SERIES}
+        self.sums = dict.fromkeys(SERIES, 0.0)
+        self.count = 0
+        self.statuses = {}
+
+    def add(self, status, values):
+        self.count += 1
+        status_class = f'{status // 100}xx'
+        self.statuses[status_class] = self.statuses.get(status_class, 0) + 1
+        for name, value in values.items():
+            self.samples[name].append(value)
+            self.sums[name] += value
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.routes = {}
+
+    def record(self, route, status, **values):
+        with self.lock:
+            stats = self.routes.get(route)
+            if stats is None:
+                stats = self.routes[route] = RouteStats(getattr(settings, 'REQUEST_METRICS_WINDOW', 1000))
+            stats.add(status, values)
+
+    def snapshot(self):
+        """Copy of every route's samples, taken under the lock"""
+        with self.lock:
+            return {
+                route: (
+                    {name: list(samples) for name, samples in stats.samples.items()},
+                    dict(stats.sums),
+                    stats.count,
+                    dict(stats.statuses),
+                )
+                for route, stats in self.routes.items()
+            }
+
+    def reset(self):
+        with self.lock:
+            self.routes.clear()
+
+
+registry = MetricsRegistry()
+
+
+def percentile(sorted_values, quantile):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(quantile * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def prometheus_text(snapshot):
+    lines = []
+    for name, (metric, help_text) in SERIES.items():
+        lines.append(f'# HELP {metric} {help_text}')
+        lines.append(f'# TYPE {metric} summary')
+        for route, (samples, sums, count, _statuses) in sorted(snapshot.items()):
+            route_label = _label(route)
+            values = sorted(samples[name])
+            for quantile in QUANTILES:
+                lines.append(f'{metric}{{route="{route_label}",quantile="{quantile}"}} {percentile(values, quantile):g}')
+            lines.append(f'{metric}_sum{{route="{route_label}"}} {sums[name]:g}')
+            lines.append(f'{metric}_count{{route="{route_label}"}} {count}')
+
+    lines.append('# HELP ngo_requests_total Requests handled by this worker')
+    lines.append('# TYPE ngo_requests_total counter')
+    for route, (_samples, _sums, _count, statuses) in sorted(snapshot.items()):
+        for status_class, total in sorted(statuses.items()):
+            lines.append(f'ngo_requests_total{{route="{_label(route)}",status="{status_class}"}} {total}')
+    return '\n'.join(lines) + '\n'
+
+
+class PrometheusTextRenderer(BaseRenderer):
+    media_type = 'text/plain'
+    format = 'prometheus'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, str):
+            return data.encode(self.charset)
+        # Error responses (e.g. 403) arrive as dicts
+        return '\n'.join(f'# {key}: {value}' for key, value in data.items()).encode(self.charset)
+
+
+class MetricsView(APIView):
+    """Rolling p50/p95/p99 per route in Prometheus text format (staff only)"""
+    permission_classes = [permissions.IsAdminUser]
+    authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES + [SessionAuthentication]
+    renderer_classes = [PrometheusTextRenderer]
+
+    def get(self, request):
+        return Response(
+            prometheus_text(registry.snapshot()),
+            content_type='text/plain; version=0.0.4; charset=utf-8'
+        )
@@ -0,0 +1,219 @@
+import json
+import logging
+import re
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_string
+
+from .metrics import QueryTimer, awrap_connections, registry, wrap_connections
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+
+COMPRESSIBLE_TYPES = re.compile(
+    r'^(text/|application/(json|javascript|xml|xhtml\+xml|vnd\.oai\.openapi)|image/svg\+xml)'
+)
+
+request_logger = logging.getLogger('ngo.requests')
+
+
+def accepted_encodings(header):
+    """Encodings from an Accept-Encoding header mapped to their q-values"""
+    encodings = {}
+    for part in header.split(','):
+        name, _, params = part.strip().partition(';')
+        if not name:
+            continue
+        quality = 1.0
+        match = re.search(r'q\s*=\s*([0-9.]+)', params)
+        if match:
+            try:
+                quality = float(match.group(1))
+            except ValueError:
+                quality = 0.0
+        encodings[name.strip().lower()] = quality
+    return encodings
+
+
+class CompressionMiddleware:
+    """
+    Compress text and JSON responses with brotli (when installed) or gzip.
+    Responses smaller than COMPRESSION_MIN_SIZE bytes are sent as-is, since
+    compressing them costs more CPU than it saves on the wire.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_size = getattr(settings, 'COMPRESSION_MIN_SIZE', 1024)
+        self.brotli_quality = getattr(settings, 'COMPRESSION_BROTLI_QUALITY', 5)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        return self.process_response(request, response)
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        return self.process_response(request, response)
+
+    def process_response(self, request, response):
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        if not COMPRESSIBLE_TYPES.match(response.get('Content-Type', '')):
+            return response
+
+        # The body may differ per Accept-Encoding even when it is below the threshold
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if len(response.content) < self.min_size:
+            return response
+
+        encoding = self.choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        if encoding == 'br':
+            compressed = brotli.compress(response.content, quality=self.brotli_quality)
+        else:
+            # compress_string adds random padding to mitigate BREACH, like GZipMiddleware
+            compressed = compress_string(response.content, max_random_bytes=100)
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+
+        # A strong ETag must change with the encoding
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
+
+    def choose_encoding(self, header):
+        encodings = accepted_encodings(header)
+        wildcard = encodings.get('*', 0.0)
+        candidates = ['br', 'gzip'] if brotli is not None else ['gzip']
+        best, best_quality = None, 0.0
+        for name in candidates:
+            quality = encodings.get(name, wildcard)
+            if quality > best_quality:
+                best, best_quality = name, quality
+        return best
+
+
+class RequestMetricsMiddleware:
+    """
+    Time every request and record it in the metrics registry and the ngo.requests log.
+
+    Records wall time, SQL query count and time, view time outside the database
+    (for read endpoints this is almost all serialization), render time and the
+    response size. Place it first in MIDDLEWARE so the size is what goes on the wire.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'REQUEST_METRICS_ENABLED', True)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+
+        timer = self.start(request)
+        started = time.perf_counter()
+        with wrap_connections(timer):
+            response = self.get_response(request)
+        finished = time.perf_counter()
+
+        self.record(request, response, started, finished, timer)
+        return response
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        timer = self.start(request)
+        started = time.perf_counter()
+        async with awrap_connections(timer):
+            response = await self.get_response(request)
+        finished = time.perf_counter()
+
+        self.record(request, response, started, finished, timer)
+        return response
+
+    def start(self, request):
+        timer = QueryTimer()
+        request._metrics = {'view_started': None, 'view_finished': None, 'view_db_time': 0.0, 'timer': timer}
+        return timer
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        metrics = getattr(request, '_metrics', None)
+        if metrics is not None:
+            metrics['view_started'] = time.perf_counter()
+            metrics['view_db_time'] = metrics['timer'].seconds
+
+    def process_template_response(self, request, response):
+        # Called after the view returns and before the response is rendered
+        metrics = getattr(request, '_metrics', None)
+        if metrics is not None:
+            metrics['view_finished'] = time.perf_counter()
+            metrics['view_db_time'] = metrics['timer'].seconds - metrics['view_db_time']
+        return response
+
+    def record(self, request, response, started, finished, timer):
+        metrics = request._metrics
+        duration = finished - started
+
+        serializer_time = 0.0
+        render_time = 0.0
+        if metrics['view_started'] is not None and metrics['view_finished'] is not None:
+            view_time = metrics['view_finished'] - metrics['view_started']
+            serializer_time = max(0.0, view_time - metrics['view_db_time'])
+            render_time = max(0.0, finished - metrics['view_finished'])
+
+        if response.streaming:
+            response_bytes = int(response.get('Content-Length') or 0)
+        else:
+            response_bytes = len(response.content)
+
+        match = getattr(request, 'resolver_match', None)
+        route = match.view_name if match and match.view_name else 'unmatched'
+
+        registry.record(
+            route,
+            response.status_code,
+            duration=duration,
+            db_time=timer.seconds,
+            db_queries=timer.count,
+            serializer_time=serializer_time,
+            response_bytes=response_bytes,
+        )
+        if request_logger.isEnabledFor(logging.INFO):
+            request_logger.info(json.dumps({
+                'method': request.method,
+                'path': request.path,
+                'route': route,
+                'status': response.status_code,
+                'duration_ms': round(duration * 1000, 2),
+                'db_queries': timer.count,
+                'db_ms': round(timer.seconds * 1000, 2),
+                'serializer_ms': round(serializer_time * 1000, 2),
+                'render_ms': round(render_time * 1000, 2),
+                'bytes': response_bytes,
+            }))
@@ -0,0 +1,36 @@
+"""
+pytest plugin for the query inspector (requires pytest-django).
+
+    pytest -p ngo.pytest_plugin [--query-inspector-strict] [--query-report report.json]
+"""
+from ngo import query_inspector
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('query-inspector')
+    group.addoption(
+        '--query-inspector-strict',
+        action='store_true',
+        help='Fail tests whose requests run duplicate or slow queries',
+    )
+    group.addoption(
+        '--query-report',
+        help='Write the query report per view action to this JSON file',
+    )
+
+
+def pytest_configure(config):
+    from django.conf import settings
+
+    settings.QUERY_INSPECTOR_ENABLED = True
+    settings.QUERY_INSPECTOR_RAISE = config.getoption('query_inspector_strict')
+    query_inspector.report.reset()
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    if not query_inspector.report.actions:
+        return
+    terminalreporter.section('query report per view action')
+    terminalreporter.write_line(query_inspector.report.format())
+    if config.getoption('query_report'):
+        query_inspector.write_report(config.getoption('query_report'))
@@ -0,0 +1,283 @@
+"""
+Duplicate and slow query detection for development, staging and tests.
+
+QueryInspectorMiddleware groups the SQL run by each request by a normalized
+fingerprint. A fingerprint seen more than QUERY_INSPECTOR_DUPLICATE_THRESHOLD
+times (usually an N+1 in a serializer) and any query slower than
+QUERY_INSPECTOR_SLOW_MS are logged on the ngo.queries logger. They are also
+added to a report per viewset action. With QUERY_INSPECTOR_RAISE the request
+fails with QueryInspectionError, so a test using the test client fails too.
+
+Test runs:
+    python manage.py test --query-inspector-strict
+    pytest -p ngo.pytest_plugin --query-inspector-strict
+"""
+import json
+import logging
+import re
+import threading
+import time
+import traceback
+from contextlib import asynccontextmanager, contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+
+from .metrics import awrap_connections, wrap_connections
+
+
+logger = logging.getLogger('ngo.queries')
+
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+PLACEHOLDER = re.compile(r'%s|%\(\w+\)s|\?')
+IN_LIST = re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.IGNORECASE)
+VALUES_LIST = re.compile(r'(\(\?(?:, \?)*\))(?:, \1)+')
+WHITESPACE = re.compile(r'\s+')
+
+# Frames that wrap every query and say nothing about where it came from
+IGNORED_ORIGINS = (
+    'ngo/query_inspector.py', 'ngo/middleware.py', 'ngo/metrics.py', 'ngo/routers.py',
+    'manage.py', 'passenger_wsgi.py',
+)
+
+
+class QueryInspectionError(AssertionError):
+    """Raised for a request with duplicate or slow queries when QUERY_INSPECTOR_RAISE is set"""
+
+
+def fingerprint(sql):
+    """SQL with literals, parameter lists and whitespace normalized"""
+    sql = STRING_LITERAL.sub('?', sql)
+    sql = NUMBER_LITERAL.sub('?', sql)
+    sql = PLACEHOLDER.sub('?', sql)
+    sql = WHITESPACE.sub(' ', sql).strip()
+    sql = IN_LIST.sub('IN (...)', sql)
+    return VALUES_LIST.sub(r'\1, ...', sql)
+
+
+def query_origin():
+    """file:line of the innermost project frame that ran the query"""
+    base_dir = str(settings.BASE_DIR)
+    for frame in reversed(traceback.extract_stack()):
+        filename = frame.filename
+        if not filename.startswith(base_dir) or 'site-packages' in filename or filename.endswith(IGNORED_ORIGINS):
+            continue
+        return f'{filename[len(base_dir) + 1:]}:{frame.lineno}'
+    return None
+
+
+class QueryRecorder:
+    """connection.execute_wrapper() callable grouping queries by fingerprint"""
+
+    def __init__(self):
+        self.queries = {}
+        self.slow = []
+        self.count = 0
+        self.slow_seconds = getattr(settings, 'QUERY_INSPECTOR_SLOW_MS', 100) / 1000
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            key = fingerprint(sql)
+            entry = self.queries.get(key)
+            if entry is None:
+                entry = self.queries[key] = {'count': 0, 'seconds': 0.0, 'origins': set()}
+            entry['count'] += 1
+            entry['seconds'] += elapsed
+            origin = query_origin()
+            if origin:
+                entry['origins'].add(origin)
+            if elapsed > self.slow_seconds:
+                self.slow.append((key, elapsed, origin))
+
+    def duplicates(self, threshold):
+        return {key: entry for key, entry in self.queries.items() if entry['count'] > threshold}
+
+
+@contextmanager
+def record_queries():
+    """Record the queries run on every database connection inside the block"""
+    recorder = QueryRecorder()
+    with wrap_connections(recorder):
+        yield recorder
+
+
+@asynccontextmanager
+async def arecord_queries():
+    """record_queries() for async code"""
+    recorder = QueryRecorder()
+    async with awrap_connections(recorder):
+        yield recorder
+
+
+def view_label(view_func):
+    """ViewSet.action for DRF viewsets, the view class or function name otherwise"""
+    view_class = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+    if view_class is None:
+        return f'{view_func.__module__}.{view_func.__name__}'
+    actions = getattr(view_func, 'actions', None)
+    if actions:
+        return f"{view_class.__name__}.{'/'.join(sorted(set(actions.values())))}"
+    return view_class.__name__
+
+
+class ActionReport:
+    """Query statistics per view action, accumulated across requests"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.actions = {}
+
+    def add(self, label, method, recorder, duplicates):
+        key = f'{method} {label}'
+        with self.lock:
+            stats = self.actions.get(key)
+            if stats is None:
+                stats = self.actions[key] = {
+                    'requests': 0, 'queries': 0, 'max_queries': 0, 'slow': 0, 'duplicates': {},
+                }
+            stats['requests'] += 1
+            stats['queries'] += recorder.count
+            stats['max_queries'] = max(stats['max_queries'], recorder.count)
+            stats['slow'] += len(recorder.slow)
+            for sql, entry in duplicates.items():
+                seen = stats['duplicates'].setdefault(sql, {'max_count': 0, 'origins': set()})
+                seen['max_count'] = max(seen['max_count'], entry['count'])
+                seen['origins'].update(entry['origins'])
+
+    def as_dict(self):
+        with self.lock:
+            return {
+                key: {
+                    **stats,
+                    'duplicates': [
+                        {'sql': sql, 'max_count': seen['max_count'], 'origins': sorted(seen['origins'])}
+                        for sql, seen in stats['duplicates'].items()
+                    ],
+                }
+                for key, stats in sorted(self.actions.items())
+            }
+
+    def format(self):
+        lines = [f"{'View action':<60} {'Requests':>8} {'Avg q':>6} {'Max q':>6} {'Slow':>5} {'Dup':>4}"]
+        for key, stats in self.as_dict().items():
+            average = stats['queries'] / stats['requests']
+            lines.append(
+                f"{key:<60} {stats['requests']:>8} {average:>6.1f} {stats['max_queries']:>6} "
+                f"{stats['slow']:>5} {len(stats['duplicates']):>4}"
+            )
+            for duplicate in stats['duplicates']:
+                lines.append(f"    {duplicate['max_count']}x {duplicate['sql'][:150]}")
+                for origin in duplicate['origins']:
+                    lines.append(f'        at {origin}')
+        return '\n'.join(lines)
+
+    def reset(self):
+        with self.lock:
+            self.actions.clear()
+
+
+report = ActionReport()
+
+
+class QueryInspectorMiddleware:
+    """Flag duplicate and slow queries per request; enabled by QUERY_INSPECTOR_ENABLED"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        # Read on every request so tests can switch it on with override_settings
+        if not getattr(settings, 'QUERY_INSPECTOR_ENABLED', False):
+            return self.get_response(request)
+
+        with record_queries() as recorder:
+            response = self.get_response(request)
+        self.inspect(request, recorder)
+        return response
+
+    async def __acall__(self, request):
+        if not getattr(settings, 'QUERY_INSPECTOR_ENABLED', False):
+            return await self.get_response(request)
+
+        async with arecord_queries() as recorder:
+            response = await self.get_response(request)
+        self.inspect(request, recorder)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._query_inspector_label = view_label(view_func)
+
+    def inspect(self, request, recorder):
+        label = getattr(request, '_query_inspector_label', None)
+        if label is None:
+            return
+        threshold = getattr(settings, 'QUERY_INSPECTOR_DUPLICATE_THRESHOLD', 3)
+        duplicates = recorder.duplicates(threshold)
+        report.add(label, request.method, recorder, duplicates)
+        if not duplicates and not recorder.slow:
+            return
+
+        problems = []
+        for sql, entry in duplicates.items():
+            origins = ', '.join(sorted(entry['origins'])) or 'unknown'
+            problems.append(f"{entry['count']}x duplicate query at {origins}: {sql}")
+        for sql, elapsed, origin in recorder.slow:
+            problems.append(f'slow query ({elapsed * 1000:.0f} ms) at {origin or "unknown"}: {sql}')
+
+        message = f'{request.method} {request.path} ({label}), {recorder.count} queries:\n  ' + '\n  '.join(problems)
+        if getattr(settings, 'QUERY_INSPECTOR_RAISE', False):
+            raise QueryInspectionError(message)
+        logger.warning(message)
+
+
+class QueryInspectorTestRunner(DiscoverRunner):
+    """DiscoverRunner that inspects every test request and prints the report per view action"""
+
+    def __init__(self, query_inspector_strict=False, query_report=None, **kwargs):
+        super().__init__(**kwargs)
+        self.query_inspector_strict = query_inspector_strict
+        self.query_report = query_report
+
+    @classmethod
+    def add_arguments(cls, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--query-inspector-strict',
+            action='store_true',
+            help='Fail tests whose requests run duplicate or slow queries',
+        )
+        parser.add_argument(
+            '--query-report',
+            help='Write the query report per view action to this JSON file',
+        )
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        settings.QUERY_INSPECTOR_ENABLED = True
+        settings.QUERY_INSPECTOR_RAISE = self.query_inspector_strict
+        report.reset()
+
+    def teardown_test_environment(self, **kwargs):
+        if report.actions:
+            print('\nQuery report per view action\n' + report.format())
+            if self.query_report:
+                write_report(self.query_report)
+        super().teardown_test_environment(**kwargs)
+
+
+def write_report(path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report.as_dict(), f, indent=2)
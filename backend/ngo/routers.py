@@ -0,0 +1,187 @@
+"""
+Read-replica routing for public read traffic.
+
+With REPLICA_DATABASE_ENGINE (and the other REPLICA_DATABASE_* settings) set,
+GET/HEAD/OPTIONS requests to public read-only viewsets read from the
+"replica" database. Everything else uses the primary:
+
+- writes, and reads later in a request that wrote;
+- requests from a client that wrote within the last REPLICA_PIN_SECONDS
+  (a cookie pins it to the primary so it reads its own writes; the frontend
+  is on another origin, so its requests are sent withCredentials to keep it);
+- all reads while the replica lags more than REPLICA_MAX_LAG_SECONDS or
+  cannot be reached.
+"""
+import logging
+import threading
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError, connections
+from rest_framework.permissions import SAFE_METHODS, AllowAny
+from rest_framework.viewsets import ReadOnlyModelViewSet
+
+
+REPLICA = 'replica'
+PIN_COOKIE = 'replica_pin'
+
+logger = logging.getLogger('ngo.replica')
+
+# Routing state of the current request: None outside requests, else {'replica': bool}
+routing = ContextVar('replica_routing', default=None)
+
+
+def replica_configured():
+    return REPLICA in settings.DATABASES
+
+
+def reads_from_replica(view_class):
+    """Public read-only viewsets are the ones served from the replica"""
+    return (
+        view_class is not None
+        and issubclass(view_class, ReadOnlyModelViewSet)
+        and AllowAny in view_class.permission_classes
+    )
+
+
+def measure_lag(connection):
+    """
+    Seconds the replica is behind the primary; 0 where the database cannot
+    tell (SQLite) and None if it is not replicating at all.
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                'SELECT CASE WHEN pg_is_in_recovery() '
+                'THEN COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END'
+            )
+            row = cursor.fetchone()
+            return None if row[0] is None else float(row[0])
+        if connection.vendor == 'mysql':
+            cursor.execute('SHOW REPLICA STATUS')
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            columns = [column[0] for column in cursor.description]
+            lag = dict(zip(columns, row)).get('Seconds_Behind_Source')
+            return float('inf') if lag is None else float(lag)
+    return 0.0
+
+
+class LagMonitor:
+    """Replica health, re-checked at most every REPLICA_LAG_CHECK_INTERVAL seconds per process"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checked_at = 0.0
+        self.healthy = True
+
+    def replica_usable(self):
+        interval = getattr(settings, 'REPLICA_LAG_CHECK_INTERVAL', 5)
+        if time.monotonic() - self.checked_at < interval:
+            return self.healthy
+        with self.lock:
+            if time.monotonic() - self.checked_at >= interval:
+                self.healthy = self.check()
+                self.checked_at = time.monotonic()
+        return self.healthy
+
+    def check(self):
+        max_lag = getattr(settings, 'REPLICA_MAX_LAG_SECONDS', 5)
+        try:
+            lag = measure_lag(connections[REPLICA])
+        except DatabaseError as exc:
+            logger.warning('Replica unavailable, reading from the primary: %s', exc)
+            return False
+        if lag is not None and lag > max_lag:
+            logger.warning('Replica is %.1fs behind, reading from the primary', lag)
+            return False
+        return True
+
+
+monitor = LagMonitor()
+
+
+class ReplicaRouter:
+    """Reads go to the replica only when ReplicaRoutingMiddleware chose it for the request"""
+
+    def db_for_read(self, model, **hints):
+        state = routing.get()
+        if state is None:
+            return None
+        if state['replica'] and monitor.replica_usable():
+            return REPLICA
+        # Explicitly, so related lookups on replica objects follow the request's choice
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        state = routing.get()
+        if state is not None:
+            # Later reads in this request must see the write
+            state['replica'] = False
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db == REPLICA:
+            # Django would otherwise save an object back to the database it was read from
+            return 'default'
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        if {obj1._state.db, obj2._state.db} <= {'default', REPLICA}:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica receives its schema from the primary
+        if db == REPLICA:
+            return False
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """Chooses the replica for public reads and pins clients to the primary after they write"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not replica_configured():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.pin_seconds = getattr(settings, 'REPLICA_PIN_SECONDS', 10)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = routing.set({'replica': False})
+        try:
+            response = self.get_response(request)
+        finally:
+            routing.reset(token)
+        return self.pin(request, response)
+
+    async def __acall__(self, request):
+        # The async ORM's sync thread runs in a copy of this context and sees the same state
+        token = routing.set({'replica': False})
+        try:
+            response = await self.get_response(request)
+        finally:
+            routing.reset(token)
+        return self.pin(request, response)
+
+    def pin(self, request, response):
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            response.set_cookie(PIN_COOKIE, '1', max_age=self.pin_seconds, httponly=True, samesite='Lax')
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            request.method in SAFE_METHODS
+            and PIN_COOKIE not in request.COOKIES
+            and reads_from_replica(getattr(view_func, 'cls', None))
+        ):
+            routing.get()['replica'] = True
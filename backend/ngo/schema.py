@@ -0,0 +1,237 @@
+"""
+Prebuilt OpenAPI schema, written by `manage.py build_schema`.
+
+Generating the schema introspects every viewset and serializer, which blocks a
+worker for hundreds of milliseconds. The build step writes it once per code
+change to SCHEMA_ARTIFACT_ROOT as openapi.<hash>.json and .yaml, named by the
+hash of their content, plus manifest.json recording that hash and the
+fingerprint of the source it was generated from.
+
+/api/schema/ serves the current artifact with an ETag, and the hashed URLs
+under /api/schema/ are immutable and cached for a year; /api/docs/ points
+Swagger UI at them. When there is no artifact, or the project source no longer
+matches its fingerprint (code deployed without rebuilding), both fall back to
+drf_spectacular's live views.
+"""
+import hashlib
+import json
+import logging
+from importlib import import_module
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.views import View
+from drf_spectacular.contrib.rest_framework_simplejwt import (
+    SimpleJWTScheme, TokenObtainPairSerializerExtension, TokenRefreshSerializerExtension,
+)
+from drf_spectacular.extensions import OpenApiSerializerFieldExtension
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+
+
+logger = logging.getLogger('ngo.schema')
+
+MANIFEST = 'manifest.json'
+FORMATS = {
+    'json': ('application/vnd.oai.openapi+json', OpenApiJsonRenderer),
+    'yaml': ('application/vnd.oai.openapi', OpenApiYamlRenderer),
+}
+# Libraries whose version changes the generated schema
+PACKAGES = ('Django', 'djangorestframework', 'drf-spectacular', 'djangorestframework-simplejwt', 'django-filter')
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'public, max-age=0, must-revalidate'
+
+
+class ImageVariantsFieldExtension(OpenApiSerializerFieldExtension):
+    """Schema of pages.serializers.ImageVariantsField, named by path so it loads with this module"""
+    target_class = 'pages.serializers.ImageVariantsField'
+
+    def map_serializer_field(self, auto_schema, direction):
+        srcset = {'type': 'string', 'description': 'srcset of the variants: "<url> <width>w, ..."'}
+        return {'type': 'object', 'nullable': True, 'properties': {'webp': srcset, 'jpeg': srcset}}
+
+
+# drf_spectacular's simplejwt extensions match the exact library classes, not our subclasses
+class CachedJWTAuthenticationScheme(SimpleJWTScheme):
+    target_class = 'members.authentication.CachedJWTAuthentication'
+    name = 'jwtAuth'
+
+
+class MemberTokenObtainPairSerializerExtension(TokenObtainPairSerializerExtension):
+    target_class = 'members.authentication.MemberTokenObtainPairSerializer'
+
+
+class MemberTokenRefreshSerializerExtension(TokenRefreshSerializerExtension):
+    target_class = 'members.authentication.MemberTokenRefreshSerializer'
+
+
+def artifact_root():
+    return Path(settings.SCHEMA_ARTIFACT_ROOT)
+
+
+def source_files():
+    """Python source of the project packages behind the URLconf: the apps and the project package"""
+    base = Path(settings.BASE_DIR).resolve()
+    packages = {Path(import_module(settings.ROOT_URLCONF).__file__).resolve().parent}
+    packages.update(Path(app.path).resolve() for app in apps.get_app_configs())
+    for package in sorted(package for package in packages if package.is_relative_to(base)):
+        for path in sorted(package.rglob('*.py')):
+            if not {'migrations', 'management'} & set(path.relative_to(package).parts):
+                yield path
+
+
+def source_fingerprint():
+    """
+    Hash of what the schema is generated from: the source of the URL patterns,
+    views, serializers and models, the settings drf_spectacular reads and the
+    versions of the libraries doing the introspection. Read from disk rather than
+    from the loaded modules, so a worker and the build command agree on it.
+    """
+    base = Path(settings.BASE_DIR).resolve()
+    digest = hashlib.sha256()
+    for path in source_files():
+        digest.update(str(path.relative_to(base)).encode())
+        digest.update(path.read_bytes())
+    digest.update(repr(sorted(settings.SPECTACULAR_SETTINGS.items())).encode())
+    digest.update(repr(sorted(settings.REST_FRAMEWORK.items())).encode())
+    for package in PACKAGES:
+        try:
+            digest.update(f'{package}=={version(package)}'.encode())
+        except PackageNotFoundError:
+            pass
+    return digest.hexdigest()
+
+
+def generate_schema():
+    """The schema as drf_spectacular's `spectacular` command generates it"""
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS(urlconf=spectacular_settings.SERVE_URLCONF)
+    return generator.get_schema(request=None, public=True)
+
+
+def render_schema(schema):
+    """{format: bytes} of the schema in each served format"""
+    return {fmt: renderer().render(schema, renderer_context={}) for fmt, (_type, renderer) in FORMATS.items()}
+
+
+def read_manifest():
+    try:
+        with open(artifact_root() / MANIFEST) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_artifact(rendered, fingerprint):
+    """Write the rendered schema under its content hash and point the manifest at it"""
+    root = artifact_root()
+    root.mkdir(parents=True, exist_ok=True)
+    content_hash = hashlib.sha256(rendered['json']).hexdigest()[:16]
+    files = {}
+    for fmt, content in rendered.items():
+        name = files[fmt] = f'openapi.{content_hash}.{fmt}'
+        (root / name).write_bytes(content)
+
+    previous = read_manifest()
+    manifest = {'hash': content_hash, 'fingerprint': fingerprint, 'files': files}
+    # Written last and replaced atomically, so readers never see files that are not there yet
+    tmp = root / f'{MANIFEST}.tmp'
+    tmp.write_text(json.dumps(manifest, indent=2))
+    tmp.replace(root / MANIFEST)
+
+    # Keep the previous version for pages that loaded Swagger UI before the deploy
+    keep = set(files.values()) | set((previous or {}).get('files', {}).values())
+    for path in root.glob('openapi.*'):
+        if path.name not in keep:
+            path.unlink()
+    return manifest
+
+
+_current = {'key': None, 'manifest': None}
+
+
+def current_artifact():
+    """
+    The manifest of the artifact to serve, or None to generate the schema live.
+    Re-read when manifest.json changes; the source fingerprint is checked once per
+    manifest per process.
+    """
+    path = artifact_root() / MANIFEST
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    key = (stat.st_mtime_ns, stat.st_size)
+    if _current['key'] != key:
+        manifest = read_manifest()
+        if manifest and manifest.get('fingerprint') != source_fingerprint():
+            logger.warning('The prebuilt schema is out of date, generating it per request; run manage.py build_schema')
+            manifest = None
+        _current.update(key=key, manifest=manifest)
+    return _current['manifest']
+
+
+def wants_json(request):
+    """The format SpectacularAPIView would negotiate: YAML unless JSON is asked for"""
+    if request.GET.get('format') in ('json', 'openapi-json'):
+        return True
+    return 'json' in request.headers.get('Accept', '') and 'yaml' not in request.headers.get('Accept', '')
+
+
+def serve_file(request, name, cache_control):
+    path = artifact_root() / name
+    if not path.is_file():
+        raise Http404
+    # openapi.<hash>.<format>: the hash is shared by both formats, which /api/schema/ serves at one URL
+    _prefix, content_hash, fmt = name.split('.')
+    etag = f'"{content_hash}-{fmt}"'
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        # Not a FileResponse: CompressionMiddleware skips streaming responses
+        response = HttpResponse(path.read_bytes(), content_type=FORMATS[path.suffix[1:]][0])
+        response['Content-Disposition'] = f'inline; filename="{name}"'
+    response['ETag'] = etag
+    response['Cache-Control'] = cache_control
+    return response
+
+
+class SchemaView(View):
+    """/api/schema/: the prebuilt schema, revalidated by ETag; live generation without one"""
+
+    live_view = None
+
+    def get(self, request, *args, **kwargs):
+        manifest = current_artifact()
+        if manifest is None:
+            if SchemaView.live_view is None:
+                SchemaView.live_view = SpectacularAPIView.as_view()
+            return SchemaView.live_view(request, *args, **kwargs)
+        response = serve_file(request, manifest['files']['json' if wants_json(request) else 'yaml'], REVALIDATE)
+        patch_vary_headers(response, ('Accept',))
+        return response
+
+
+class SchemaArtifactView(View):
+    """/api/schema/openapi.<hash>.<format>: a prebuilt schema version, which never changes"""
+
+    def get(self, request, name):
+        manifest = current_artifact()
+        if manifest is None:
+            raise Http404
+        return serve_file(request, name, IMMUTABLE)
+
+
+class SchemaSwaggerView(SpectacularSwaggerView):
+    """Swagger UI loading the hashed schema URL, so browsers cache it until the next build"""
+
+    def _get_schema_url(self, request):
+        manifest = current_artifact()
+        if manifest is None:
+            return super()._get_schema_url(request)
+        return reverse('schema-artifact', args=[manifest['files']['json']])
@@ -0,0 +1,14 @@
+from django.utils.text import Truncator
+from rest_framework import serializers
+
+
+class SummaryField(serializers.ReadOnlyField):
+    """Plain-text excerpt of a long text field for list views"""
+
+    def __init__(self, length=200, **kwargs):
+        self.length = length
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        # Collapse whitespace so line breaks in the source text do not eat the budget
+        return Truncator(' '.join(str(value or '').split())).chars(self.length)
@@ -13,20 +13,16 @@ https://docs.djangoproject.com/en/6.0/ref/settings/
 from pathlib import Path
 from datetime import timedelta
 import os
+import warnings
+import django
 from dotenv import load_dotenv
 
-load_dotenv()
-
-# Configure PyMySQL as MySQL backend
-try:
-    import pymysql
-    pymysql.install_as_MySQLdb()
-except ImportError:
-    pass
-
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# An explicit path skips the search up from the caller's directory
+load_dotenv(BASE_DIR / '.env')
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/6.0/howto/deployment/checklist/
@@ -69,7 +65,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'ngo.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'ngo.middleware.CompressionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -77,6 +75,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'ngo.routers.ReplicaRoutingMiddleware',
+    'ngo.query_inspector.QueryInspectorMiddleware',
 ]
 
 ROOT_URLCONF = 'ngo.urls'
@@ -102,42 +102,109 @@ WSGI_APPLICATION = 'ngo.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
-# Support PostgreSQL, MySQL, and SQLite
-DB_ENGINE = os.getenv('DATABASE_ENGINE', 'postgresql')  # postgresql, mysql, or sqlite
+def connection_config(prefix):
+    """
+    Connection reuse from <prefix>_CONN_MAX_AGE (seconds a connection is kept
+    between requests; 0 closes it after each request, None keeps it open) and
+    <prefix>_CONN_HEALTH_CHECKS (ping a reused connection before the request uses it).
+    Under ASGI it must be 0, which passenger_asgi.py defaults to: every request
+    runs its queries in a new thread, so kept connections are never reused.
+    """
+    max_age = os.getenv(f'{prefix}_CONN_MAX_AGE', '60')
+    return {
+        'CONN_MAX_AGE': None if max_age == 'None' else int(max_age),
+        'CONN_HEALTH_CHECKS': os.getenv(f'{prefix}_CONN_HEALTH_CHECKS', 'True') == 'True',
+    }
+
+
+def postgresql_pool_options(prefix):
+    """
+    psycopg connection pool from <prefix>_POOL=True and <prefix>_POOL_MIN_SIZE/_MAX_SIZE/_TIMEOUT.
+    Needs Django 5.1+ with psycopg 3 and psycopg-pool; older stacks keep persistent connections.
+    """
+    if os.getenv(f'{prefix}_POOL', 'False') != 'True':
+        return None
+    if django.VERSION < (5, 1):
+        warnings.warn(f'{prefix}_POOL needs Django 5.1 or later; using persistent connections instead')
+        return None
+    return {
+        'min_size': int(os.getenv(f'{prefix}_POOL_MIN_SIZE', '2')),
+        'max_size': int(os.getenv(f'{prefix}_POOL_MAX_SIZE', '10')),
+        'timeout': int(os.getenv(f'{prefix}_POOL_TIMEOUT', '10')),
+    }
+
+
+def install_pymysql():
+    """Use PyMySQL as MySQLdb; imported only when a MySQL database is configured"""
+    import pymysql
+    pymysql.install_as_MySQLdb()
+    # Bypass Django's version check for PyMySQL
+    pymysql.version_info = (2, 2, 1, "final", 0)
+
+
+def database_config(prefix):
+    """Build a DATABASES entry from <prefix>_ENGINE, <prefix>_NAME, ... environment variables"""
+    engine = os.getenv(f'{prefix}_ENGINE', 'postgresql')
 
-if DB_ENGINE == 'sqlite':
-    DATABASES = {
-        'default': {
+    if engine == 'sqlite':
+        return {
             'ENGINE': 'django.db.backends.sqlite3',
-            'NAME': BASE_DIR / os.getenv('DATABASE_NAME', 'db.sqlite3'),
+            'NAME': BASE_DIR / os.getenv(f'{prefix}_NAME', 'db.sqlite3'),
         }
-    }
-elif DB_ENGINE == 'mysql':
-    DATABASES = {
-        'default': {
+    if engine == 'mysql':
+        install_pymysql()
+        # PyMySQL connections are reused per CONN_MAX_AGE; the health check pings them
+        return {
+            **connection_config(prefix),
             'ENGINE': 'django.db.backends.mysql',
-            'NAME': os.getenv('DATABASE_NAME', 'ngoforum_db'),
-            'USER': os.getenv('DATABASE_USER', 'root'),
-            'PASSWORD': os.getenv('DATABASE_PASSWORD', ''),
-            'HOST': os.getenv('DATABASE_HOST', 'localhost'),
-            'PORT': os.getenv('DATABASE_PORT', '3306'),
+            'NAME': os.getenv(f'{prefix}_NAME', 'ngoforum_db'),
+            'USER': os.getenv(f'{prefix}_USER', 'root'),
+            'PASSWORD': os.getenv(f'{prefix}_PASSWORD', ''),
+            'HOST': os.getenv(f'{prefix}_HOST', 'localhost'),
+            'PORT': os.getenv(f'{prefix}_PORT', '3306'),
             'OPTIONS': {
                 'charset': 'utf8mb4',
                 'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
             }
         }
+    # postgresql (default)
+    config = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.getenv(f'{prefix}_NAME', 'ngoforum_db'),
+        'USER': os.getenv(f'{prefix}_USER', 'postgres'),
+        'PASSWORD': os.getenv(f'{prefix}_PASSWORD', 'postgres'),
+        'HOST': os.getenv(f'{prefix}_HOST', 'localhost'),
+        'PORT': os.getenv(f'{prefix}_PORT', '5432'),
+        **connection_config(prefix),
     }
-else:  # postgresql (default)
-    DATABASES = {
-        'default': {
-            'ENGINE': 'django.db.backends.postgresql',
-            'NAME': os.getenv('DATABASE_NAME', 'ngoforum_db'),
-            'USER': os.getenv('DATABASE_USER', 'postgres'),
-            'PASSWORD': os.getenv('DATABASE_PASSWORD', 'postgres'),
-            'HOST': os.getenv('DATABASE_HOST', 'localhost'),
-            'PORT': os.getenv('DATABASE_PORT', '5432'),
-        }
-    }
+    pool = postgresql_pool_options(prefix)
+    if pool is not None:
+        # The pool manages connection lifetime; Django rejects CONN_MAX_AGE alongside it
+        config['OPTIONS'] = {'pool': pool}
+        config['CONN_MAX_AGE'] = 0
+    return config
+
+
+DATABASES = {
+    'default': database_config('DATABASE'),
+}
+
+# Optional second database used as the destination of `manage.py migrate_database`
+# e.g. TARGET_DATABASE_ENGINE=postgresql, TARGET_DATABASE_NAME=..., TARGET_DATABASE_USER=...
+if os.getenv('TARGET_DATABASE_ENGINE'):
+    DATABASES['target'] = database_config('TARGET_DATABASE')
+
+# Optional read replica serving public read-only endpoints (ngo/routers.py)
+# e.g. REPLICA_DATABASE_ENGINE=postgresql, REPLICA_DATABASE_HOST=..., same keys as DATABASE_
+if os.getenv('REPLICA_DATABASE_ENGINE'):
+    DATABASES['replica'] = database_config('REPLICA_DATABASE')
+    # Tests get no replica database of their own; it reads the test primary
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+    DATABASE_ROUTERS = ['ngo.routers.ReplicaRouter']
+
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', '10'))  # primary-only reads after a client writes
+REPLICA_MAX_LAG_SECONDS = float(os.getenv('REPLICA_MAX_LAG_SECONDS', '5'))
+REPLICA_LAG_CHECK_INTERVAL = float(os.getenv('REPLICA_LAG_CHECK_INTERVAL', '5'))  # seconds between lag checks
 
 
 # Password validation
@@ -185,6 +252,34 @@ MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'public' / 'media'
 
 # File upload settings
+# Store resource files, membership application documents and FAQ attachments once
+# per distinct content (pages/storage.py); manage.py gc_media_blobs removes unused blobs
+MEDIA_DEDUP = os.getenv('MEDIA_DEDUP', 'False') == 'True'
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+    'uploads': {
+        'BACKEND': (
+            'pages.storage.ContentAddressedStorage' if MEDIA_DEDUP
+            else 'django.core.files.storage.FileSystemStorage'
+        ),
+    },
+}
+
+# Download endpoints hand files to the web server (ngo/media.py): '' streams them from
+# Django, 'x-sendfile' for Apache/LiteSpeed, 'x-accel-redirect' for nginx with an
+# internal location at MEDIA_SENDFILE_PREFIX aliased to MEDIA_ROOT
+MEDIA_SENDFILE = os.getenv('MEDIA_SENDFILE', '')
+MEDIA_SENDFILE_PREFIX = os.getenv('MEDIA_SENDFILE_PREFIX', '/protected-media/')
+
+# Widths of the WebP/JPEG variants made of uploaded logos, photos and images (pages/images.py)
+IMAGE_VARIANT_WIDTHS = [int(width) for width in os.getenv('IMAGE_VARIANT_WIDTHS', '96,320,640,1280').split(',')]
+
 FILE_UPLOAD_MAX_MEMORY_SIZE = 15 * 1024 * 1024  # 15MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 15 * 1024 * 1024  # 15MB
 
@@ -196,11 +291,15 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'members.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'ngo.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 50,
     'DEFAULT_FILTER_BACKENDS': [
@@ -211,6 +310,35 @@ REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
 }
 
+# Response compression (brotli when installed, otherwise gzip)
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', '1024'))  # bytes
+COMPRESSION_BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', '5'))
+
+# Request metrics, served to staff at /api/_metrics/
+REQUEST_METRICS_ENABLED = os.getenv('REQUEST_METRICS_ENABLED', 'True') == 'True'
+REQUEST_METRICS_WINDOW = int(os.getenv('REQUEST_METRICS_WINDOW', '1000'))  # requests kept per route
+
+# Duplicate and slow query detection (ngo/query_inspector.py), on by default with DEBUG
+QUERY_INSPECTOR_ENABLED = os.getenv('QUERY_INSPECTOR_ENABLED', str(DEBUG)) == 'True'
+QUERY_INSPECTOR_DUPLICATE_THRESHOLD = int(os.getenv('QUERY_INSPECTOR_DUPLICATE_THRESHOLD', '3'))  # same query per request
+QUERY_INSPECTOR_SLOW_MS = float(os.getenv('QUERY_INSPECTOR_SLOW_MS', '100'))
+QUERY_INSPECTOR_RAISE = os.getenv('QUERY_INSPECTOR_RAISE', 'False') == 'True'
+
+TEST_RUNNER = 'ngo.query_inspector.QueryInspectorTestRunner'
+
+# Public list endpoints using FastReadMixin serialize from values_list() rows
+FAST_READ_SERIALIZERS = os.getenv('FAST_READ_SERIALIZERS', 'True') == 'True'
+
+# Serve those list endpoints as async views (ngo/async_views.py); passenger_asgi.py turns it on
+ASYNC_READ_VIEWS = os.getenv('ASYNC_READ_VIEWS', 'False') == 'True'
+
+# Load the URLconf, views and serializer fields when a worker starts (ngo/warmup.py)
+# instead of on its first request
+WARMUP_ON_START = os.getenv('WARMUP_ON_START', 'False') == 'True'
+
+# Threads per worker for work done after the response (ngo/tasks.py); 0 runs it inline
+BACKGROUND_TASK_WORKERS = int(os.getenv('BACKGROUND_TASK_WORKERS', '2'))
+
 # JWT settings
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=7),
@@ -221,8 +349,15 @@ SIMPLE_JWT = {
     'ALGORITHM': 'HS256',
     'SIGNING_KEY': SECRET_KEY,
     'AUTH_HEADER_TYPES': ('Bearer',),
+    'TOKEN_OBTAIN_SERIALIZER': 'members.authentication.MemberTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'members.authentication.MemberTokenRefreshSerializer',
 }
 
+# Decoded access tokens kept in memory per process (members.authentication)
+JWT_TOKEN_CACHE_SIZE = int(os.getenv('JWT_TOKEN_CACHE_SIZE', '10000'))
+# Seconds between each process's checks for users whose token claims changed
+JWT_CLAIMS_POLL_SECONDS = float(os.getenv('JWT_CLAIMS_POLL_SECONDS', '5'))
+
 # CORS settings
 CORS_ALLOW_ALL_ORIGINS = True  # Temporary - for testing
 CORS_ALLOWED_ORIGINS = os.getenv(
@@ -252,4 +387,67 @@ SPECTACULAR_SETTINGS = {
     'SERVE_INCLUDE_SCHEMA': False,
 }
 
-# Logging
\ No newline at end of file
+# Prebuilt schema served at /api/schema/ (manage.py build_schema, ngo/schema.py)
+SCHEMA_ARTIFACT_ROOT = os.getenv('SCHEMA_ARTIFACT_ROOT', str(STATIC_ROOT / 'schema'))
+
+# Logging
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        # ngo.requests messages are already JSON, one object per line
+        'plain': {
+            'format': '%(message)s',
+        },
+        'verbose': {
+            'format': '{asctime} {levelname} {name} {message}',
+            'style': '{',
+        },
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'verbose',
+        },
+        'requests': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'plain',
+        },
+    },
+    'loggers': {
+        'ngo.requests': {
+            'handlers': ['requests'],
+            'level': os.getenv('REQUEST_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+        'ngo.queries': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+        'ngo.replica': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+        'ngo.warmup': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        'ngo.schema': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+        'ngo.tasks': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+    'root': {
+        'handlers': ['console'],
+        'level': os.getenv('LOG_LEVEL', 'WARNING'),
+    },
+}
@@ -0,0 +1,54 @@
+"""
+Work a request should not wait for, run in a small thread pool per worker.
+
+run_in_background() queues a function once the current transaction commits
+(at once in autocommit mode). Tasks are not persisted: those still queued
+when a worker exits are lost, so use it only for work that can be lost or
+redone, such as download counters.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+
+logger = logging.getLogger('ngo.tasks')
+
+_executor = None
+_lock = threading.Lock()
+
+
+def get_executor():
+    """The worker's pool, created on first use so it starts after the server forks"""
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.BACKGROUND_TASK_WORKERS,
+                    thread_name_prefix='ngo-task',
+                )
+    return _executor
+
+
+def run_task(func, args, kwargs):
+    # Pool threads keep their connections between tasks like a request thread does
+    close_old_connections()
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception('Background task %s failed', getattr(func, '__qualname__', func))
+    finally:
+        close_old_connections()
+
+
+def run_in_background(func, *args, **kwargs):
+    """Call func(*args, **kwargs) in the background after commit; inline with BACKGROUND_TASK_WORKERS=0"""
+    def submit():
+        if settings.BACKGROUND_TASK_WORKERS > 0:
+            get_executor().submit(run_task, func, args, kwargs)
+        else:
+            run_task(func, args, kwargs)
+    transaction.on_commit(submit)
@@ -15,11 +15,26 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf import settings
 from django.conf.urls.static import static
+from django.utils.module_loading import import_string
+from django.views.decorators.csrf import csrf_exempt
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+from ngo.metrics import MetricsView
+
+
+def lazy_view(path, **initkwargs):
+    """as_view() of a class imported on its first request, keeping rarely used views out of worker start-up"""
+    view = None
+
+    def dispatch(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            view = import_string(path).as_view(**initkwargs)
+        return view(request, *args, **kwargs)
+    return csrf_exempt(dispatch)
+
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -29,8 +44,17 @@ urlpatterns = [
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     
     # API Documentation
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
-    path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
+    # (drf_spectacular loads on the first schema or docs request; the schema is prebuilt by build_schema)
+    path('api/schema/', lazy_view('ngo.schema.SchemaView'), name='schema'),
+    re_path(
+        r'^api/schema/(?P<name>openapi\.[0-9a-f]+\.(?:json|yaml))$',
+        lazy_view('ngo.schema.SchemaArtifactView'),
+        name='schema-artifact',
+    ),
+    path('api/docs/', lazy_view('ngo.schema.SchemaSwaggerView', url_name='schema'), name='swagger-ui'),
+    
+    # Request metrics (staff only, Prometheus text format)
+    path('api/_metrics/', MetricsView.as_view(), name='metrics'),
     
     # App APIs
     path('api/', include('members.urls')),
@@ -0,0 +1,94 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.serializers import ListSerializer
+
+
+class SparseFieldsetMixin:
+    """
+    Sparse fieldsets for read endpoints.
+    ?fields=id,title returns only those fields, ?omit=description drops fields.
+    The queryset is narrowed with only() when every kept field maps to model columns;
+    computed fields can declare their columns in the serializer's Meta.field_dependencies.
+    """
+    sparse_fieldset_actions = ['list', 'retrieve']
+
+    def get_sparse_fieldset(self):
+        """Return (fields to keep or None, fields to drop) from the query string"""
+        request = getattr(self, 'request', None)
+        if request is None or getattr(self, 'swagger_fake_view', False):
+            return None, set()
+        if getattr(self, 'action', None) not in self.sparse_fieldset_actions:
+            return None, set()
+        params = request.query_params
+        keep = {name.strip() for name in params.get('fields', '').split(',') if name.strip()}
+        omit = {name.strip() for name in params.get('omit', '').split(',') if name.strip()}
+        return keep or None, omit
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        keep, omit = self.get_sparse_fieldset()
+        if keep is None and not omit:
+            return serializer
+        target = serializer.child if isinstance(serializer, ListSerializer) else serializer
+        for name in list(target.fields):
+            if (keep is not None and name not in keep) or name in omit:
+                target.fields.pop(name)
+        return serializer
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        keep, omit = self.get_sparse_fieldset()
+        if keep is None and not omit:
+            return queryset
+        columns = self.get_sparse_columns(queryset.model, queryset.query.select_related)
+        if columns is None:
+            return queryset
+        if queryset.query.select_related:
+            # Joins for relations the kept fields do not read would conflict with only()
+            joins = {column.rsplit('__', 1)[0] for column in columns if '__' in column}
+            queryset = queryset.select_related(None)
+            if joins:
+                queryset = queryset.select_related(*joins)
+        return queryset.only(*columns)
+
+    def get_sparse_columns(self, model, select_related):
+        """
+        Model field paths needed by the pruned serializer, or None if any field
+        reads something that cannot be mapped to a column (properties, methods).
+        """
+        serializer = self.get_serializer()
+        target = serializer.child if isinstance(serializer, ListSerializer) else serializer
+        dependencies = getattr(getattr(target, 'Meta', None), 'field_dependencies', {})
+
+        columns = {model._meta.pk.name}
+        for name, field in target.fields.items():
+            if name in dependencies:
+                columns.update(dependencies[name])
+                continue
+            if field.source == '*':
+                return None
+            path = self.resolve_source(model, field.source_attrs, select_related)
+            if path is None:
+                return None
+            columns.update(path)
+        return columns
+
+    @staticmethod
+    def resolve_source(model, source_attrs, select_related):
+        """Map a dotted serializer source to only() paths, following select_related relations"""
+        try:
+            field = model._meta.get_field(source_attrs[0])
+        except FieldDoesNotExist:
+            return None
+        if not field.concrete or field.many_to_many:
+            return None
+        if len(source_attrs) == 1:
+            return [field.name]
+        if not field.is_relation or not isinstance(select_related, dict) or field.name not in select_related:
+            # Without select_related the related row is fetched separately anyway
+            return [field.name] if field.is_relation else None
+        nested = SparseFieldsetMixin.resolve_source(
+            field.related_model, source_attrs[1:], select_related[field.name]
+        )
+        if nested is None:
+            return None
+        return [field.name] + [f'{field.name}__{path}' for path in nested]
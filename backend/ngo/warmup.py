@@ -0,0 +1,91 @@
+"""
+Warm-up for new workers, run by passenger_wsgi.py and passenger_asgi.py when
+WARMUP_ON_START is on.
+
+Without it the first request a worker serves imports the URLconf and every
+view, compiles the URL patterns, fills Django's model _meta caches while
+building serializer fields and compiles the FastReadMixin plans. When the
+server preloads the application before forking workers (Passenger's smart
+spawning), this runs once and every worker inherits the result.
+
+Nothing here touches the database: a connection opened before a fork would
+be shared by the workers.
+"""
+import logging
+import time
+
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpRequest
+from django.urls import URLPattern, URLResolver, get_resolver
+from rest_framework.request import Request
+
+from .fast_serializers import FastReadMixin, compile_serializer
+
+
+logger = logging.getLogger('ngo.warmup')
+
+
+def routed_views(patterns):
+    """DRF view functions (those with .cls) in a URL pattern list, recursively"""
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from routed_views(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern) and hasattr(pattern.callback, 'cls'):
+            yield pattern.callback
+
+
+def warm_view(callback):
+    """Instantiate the view's per-request machinery and build its serializer as a GET would"""
+    view = callback.cls(**getattr(callback, 'initkwargs', {}))
+    actions = getattr(callback, 'actions', None) or {}
+    view.action = actions.get('get')
+    view.args, view.kwargs, view.format_kwarg = (), {}, None
+    request = HttpRequest()
+    request.method = 'GET'
+    request.META = {'SERVER_NAME': 'localhost', 'SERVER_PORT': '80'}
+    request.user = AnonymousUser()
+    view.request = Request(
+        request,
+        parsers=view.get_parsers(),
+        authenticators=view.get_authenticators(),
+        negotiator=view.get_content_negotiator(),
+    )
+    view.get_renderers()
+    view.get_permissions()
+    view.get_throttles()
+    if not hasattr(view, 'get_serializer'):
+        return
+    for backend in getattr(view, 'filter_backends', ()):
+        backend()
+    view.paginator
+    serializer = view.get_serializer()
+    serializer.fields
+    if isinstance(view, FastReadMixin) and view.action in view.fast_read_actions:
+        compile_serializer(serializer)
+
+
+def warm_up():
+    """Load what the first request would otherwise load; returns the seconds it took"""
+    started = time.perf_counter()
+    resolver = get_resolver()
+    # Imports the URLconf and views and compiles every pattern
+    resolver.reverse_dict
+
+    warmed = failed = 0
+    seen = set()
+    for callback in routed_views(resolver.url_patterns):
+        key = (callback.cls, tuple(sorted((getattr(callback, 'actions', None) or {}).items())))
+        if key in seen:
+            continue
+        seen.add(key)
+        try:
+            warm_view(callback)
+            warmed += 1
+        except Exception:
+            # Views whose set-up needs a real request warm up on their first one instead
+            logger.debug('Could not warm up %s', callback.cls.__name__, exc_info=True)
+            failed += 1
+
+    seconds = time.perf_counter() - started
+    logger.info('Warmed up %d views in %.0f ms (%d skipped)', warmed, seconds * 1000, failed)
+    return seconds
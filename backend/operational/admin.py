@@ -1,4 +1,5 @@
 from django.contrib import admin
+from ngo.admin import LargeTableAdmin
 from .models import State, County, Sector, OperationalPresence
 
 
@@ -23,10 +24,9 @@ class SectorAdmin(admin.ModelAdmin):
 
 
 @admin.register(OperationalPresence)
-class OperationalPresenceAdmin(admin.ModelAdmin):
+class OperationalPresenceAdmin(LargeTableAdmin):
     list_display = ['organization', 'sector', 'county', 'year', 'presence_count', 'is_active']
-    list_filter = ['year', 'is_active', 'sector', 'county__state']
-    search_fields = ['organization__name', 'sector__name', 'county__name']
+    list_filter = ['year', 'is_active', 'sector', 'county__state', 'created_at']
+    search_fields = ['^organization__name', '^sector__name', '^county__name']
     list_select_related = ['organization', 'sector', 'county', 'county__state']
     autocomplete_fields = ['organization', 'sector', 'county']
-    date_hierarchy = 'created_at'
@@ -0,0 +1,219 @@
+import csv
+import io
+import zipfile
+from itertools import islice
+from django.db import connection, transaction
+from .models import County, Sector, OperationalPresence
+
+
+# Accepted spellings for each column, compared after lower-casing and replacing spaces with underscores
+COLUMN_ALIASES = {
+    'sector': ['sector', 'cluster'],
+    'county': ['county'],
+    'state': ['state'],
+    'year': ['year'],
+    'presence_count': ['presence_count', 'count', 'projects', 'number_of_projects'],
+    'notes': ['notes', 'comments'],
+}
+
+REQUIRED_COLUMNS = ['sector', 'county', 'year']
+
+UNIQUE_FIELDS = ['organization', 'sector', 'county', 'year']
+UPDATE_FIELDS = ['presence_count', 'notes', 'is_active', 'updated_at']
+
+
+class ImportFileError(Exception):
+    """The uploaded file cannot be read at all (wrong type, missing columns)"""
+
+
+def _normalize(value):
+    return str(value).strip().casefold() if value is not None else ''
+
+
+def read_rows(upload):
+    """Yield (row_number, {column: value}) from a CSV or XLSX upload without loading it whole"""
+    name = upload.name.lower()
+    if name.endswith('.xlsx'):
+        rows = _read_xlsx(upload)
+    elif name.endswith('.csv'):
+        rows = _read_csv(upload)
+    else:
+        raise ImportFileError('Upload a .csv or .xlsx file')
+
+    header = next(rows, None)
+    if header is None:
+        raise ImportFileError('The file is empty')
+
+    columns = {}
+    for index, heading in enumerate(header):
+        key = _normalize(heading).replace(' ', '_')
+        for column, aliases in COLUMN_ALIASES.items():
+            if key in aliases and column not in columns:
+                columns[column] = index
+    missing = [column for column in REQUIRED_COLUMNS if column not in columns]
+    if missing:
+        raise ImportFileError(f"Missing required columns: {', '.join(missing)}")
+
+    # Row 1 is the header, so data starts at row 2 like in a spreadsheet
+    for row_number, values in enumerate(rows, start=2):
+        if not any(value not in (None, '') for value in values):
+            continue
+        yield row_number, {
+            column: values[index] if index < len(values) else None
+            for column, index in columns.items()
+        }
+
+
+def _read_csv(upload):
+    upload.open('rb')
+    text = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+    try:
+        yield from csv.reader(text)
+    except (UnicodeDecodeError, csv.Error):
+        # Rows are decoded as they are read, so this can happen part-way through the file
+        raise ImportFileError('The CSV file must be saved as UTF-8 (in Excel: Save As > CSV UTF-8)')
+    finally:
+        text.detach()
+
+
+def _read_xlsx(upload):
+    try:
+        from openpyxl import load_workbook
+        from openpyxl.utils.exceptions import InvalidFileException
+    except ImportError:
+        raise ImportFileError('XLSX uploads require openpyxl; upload a CSV instead')
+    try:
+        # read_only mode streams rows instead of building the whole sheet in memory
+        workbook = load_workbook(upload, read_only=True, data_only=True)
+    except (InvalidFileException, zipfile.BadZipFile, KeyError):
+        raise ImportFileError('The file is not a valid .xlsx workbook')
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    except (zipfile.BadZipFile, ValueError):
+        raise ImportFileError('The .xlsx workbook is damaged and could not be read')
+    finally:
+        workbook.close()
+
+
+class PresenceImporter:
+    """
+    Validate and upsert 3W rows for one organization.
+    Sector and county names are resolved against lookup maps loaded once per import.
+    """
+    batch_size = 500
+
+    def __init__(self, organization_id):
+        self.organization_id = organization_id
+        self.sectors = {_normalize(name): pk for pk, name in Sector.objects.values_list('id', 'name')}
+        self.counties = {}
+        self.counties_by_name = {}
+        for pk, name, state_name in County.objects.values_list('id', 'name', 'state__name'):
+            self.counties[(_normalize(name), _normalize(state_name))] = pk
+            self.counties_by_name.setdefault(_normalize(name), []).append(pk)
+        year_field = OperationalPresence._meta.get_field('year')
+        limits = {type(v).__name__: v.limit_value for v in year_field.validators}
+        self.min_year = limits.get('MinValueValidator', 2010)
+        self.max_year = limits.get('MaxValueValidator', 2030)
+
+        self.seen_keys = {}
+        self.errors = []
+        self.imported = 0
+        self.total_rows = 0
+
+    def run(self, rows, partial=False):
+        """
+        Import rows in batches inside one transaction.
+        Unless partial is True, any invalid row rolls the whole file back.
+        """
+        rows = iter(rows)
+        with transaction.atomic():
+            while True:
+                batch = list(islice(rows, self.batch_size))
+                if not batch:
+                    break
+                self.total_rows += len(batch)
+                valid = self.validate_batch(batch)
+                if valid:
+                    self.upsert(valid)
+            if self.errors and not partial:
+                transaction.set_rollback(True)
+                self.imported = 0
+
+    def validate_batch(self, batch):
+        """Check a batch of rows against the lookup maps; returns unsaved instances"""
+        valid = []
+        for row_number, row in batch:
+            row_errors = {}
+
+            sector_id = self.sectors.get(_normalize(row.get('sector')))
+            if sector_id is None:
+                row_errors['sector'] = f"Unknown sector '{row.get('sector') or ''}'"
+
+            county_id, county_error = self.resolve_county(row.get('county'), row.get('state'))
+            if county_error:
+                row_errors['county'] = county_error
+
+            year = self.parse_int(row.get('year'))
+            if year is None or not self.min_year <= year <= self.max_year:
+                row_errors['year'] = f'Year must be between {self.min_year} and {self.max_year}'
+
+            presence_count = 1
+            if row.get('presence_count') not in (None, ''):
+                presence_count = self.parse_int(row.get('presence_count'))
+                if presence_count is None or presence_count < 1:
+                    row_errors['presence_count'] = 'Presence count must be a positive whole number'
+
+            if not row_errors:
+                key = (sector_id, county_id, year)
+                if key in self.seen_keys:
+                    row_errors['row'] = f'Duplicate of row {self.seen_keys[key]}'
+                else:
+                    self.seen_keys[key] = row_number
+
+            if row_errors:
+                self.errors.append({'row': row_number, 'errors': row_errors})
+                continue
+
+            valid.append(OperationalPresence(
+                organization_id=self.organization_id,
+                sector_id=sector_id,
+                county_id=county_id,
+                year=year,
+                presence_count=presence_count,
+                notes=str(row.get('notes') or '').strip(),
+                is_active=True,
+            ))
+        return valid
+
+    def resolve_county(self, county, state):
+        county_key = _normalize(county)
+        if not county_key:
+            return None, 'County is required'
+        if state not in (None, ''):
+            county_id = self.counties.get((county_key, _normalize(state)))
+            if county_id is None:
+                return None, f"Unknown county '{county}' in state '{state}'"
+            return county_id, None
+        matches = self.counties_by_name.get(county_key, [])
+        if not matches:
+            return None, f"Unknown county '{county}'"
+        if len(matches) > 1:
+            return None, f"County '{county}' exists in several states; add a state column"
+        return matches[0], None
+
+    @staticmethod
+    def parse_int(value):
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        try:
+            return int(str(value).strip())
+        except (TypeError, ValueError):
+            return None
+
+    def upsert(self, objects):
+        options = {'update_conflicts': True, 'update_fields': UPDATE_FIELDS}
+        # MySQL infers the conflict target from the unique key and rejects an explicit one
+        if connection.features.supports_update_conflicts_with_target:
+            options['unique_fields'] = UNIQUE_FIELDS
+        OperationalPresence.objects.bulk_create(objects, **options)
+        self.imported += len(objects)
@@ -1,24 +1,28 @@
 from rest_framework import viewsets, permissions, filters, status
 from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from django.http import HttpResponse
 import csv
+from ngo.viewsets import SparseFieldsetMixin
+from members.authentication import member_organization_id, require_member_organization_id
 from .models import State, County, Sector, OperationalPresence
+from .bulk_import import ImportFileError, PresenceImporter, read_rows
 from .serializers import (
     StateSerializer, CountySerializer, SectorSerializer,
     OperationalPresenceSerializer, OperationalPresenceWriteSerializer
 )
 
 
-class StateViewSet(viewsets.ReadOnlyModelViewSet):
+class StateViewSet(SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """Public access to states"""
     queryset = State.objects.all()
     serializer_class = StateSerializer
     permission_classes = [permissions.AllowAny]
 
 
-class CountyViewSet(viewsets.ReadOnlyModelViewSet):
+class CountyViewSet(SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """Public access to counties"""
     queryset = County.objects.all()
     serializer_class = CountySerializer
@@ -27,14 +31,14 @@ class CountyViewSet(viewsets.ReadOnlyModelViewSet):
     filterset_fields = ['state']
 
 
-class SectorViewSet(viewsets.ReadOnlyModelViewSet):
+class SectorViewSet(SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """Public access to sectors"""
     queryset = Sector.objects.all()
     serializer_class = SectorSerializer
     permission_classes = [permissions.AllowAny]
 
 
-class PublicOperationalPresenceViewSet(viewsets.ReadOnlyModelViewSet):
+class PublicOperationalPresenceViewSet(SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """Public read-only access to 3W data"""
     queryset = OperationalPresence.objects.filter(is_active=True)
     serializer_class = OperationalPresenceSerializer
@@ -69,13 +73,14 @@ class PublicOperationalPresenceViewSet(viewsets.ReadOnlyModelViewSet):
         return response
 
 
-class OperationalPresenceViewSet(viewsets.ModelViewSet):
+class OperationalPresenceViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """Authenticated access for members to manage their 3W data"""
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        if hasattr(self.request.user, 'member_organization'):
-            return OperationalPresence.objects.filter(organization=self.request.user.member_organization)
+        organization_id = member_organization_id(self.request.user)
+        if organization_id is not None:
+            return OperationalPresence.objects.filter(organization_id=organization_id)
         return OperationalPresence.objects.none()
     
     def get_serializer_class(self):
@@ -84,4 +89,34 @@ class OperationalPresenceViewSet(viewsets.ModelViewSet):
         return OperationalPresenceSerializer
     
     def perform_create(self, serializer):
-        serializer.save(organization=self.request.user.member_organization)
+        serializer.save(organization_id=require_member_organization_id(self.request.user))
+    
+    @action(detail=False, methods=['post'], url_path='bulk-upload', parser_classes=[MultiPartParser, FormParser])
+    def bulk_upload(self, request):
+        """
+        Import 3W rows from a CSV or XLSX file.
+        Columns: sector, county, year, and optionally state, presence_count, notes.
+        Rows matching an existing (sector, county, year) record update it.
+        Any invalid row rejects the whole file unless partial=true is passed.
+        """
+        organization_id = require_member_organization_id(request.user)
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'error': 'No file uploaded'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        partial = str(request.data.get('partial', request.query_params.get('partial', ''))).lower() in ['1', 'true', 'yes']
+        importer = PresenceImporter(organization_id)
+        try:
+            importer.run(read_rows(upload), partial=partial)
+        except ImportFileError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        report = {
+            'rows': importer.total_rows,
+            'imported': importer.imported,
+            'failed': len(importer.errors),
+            'errors': importer.errors,
+        }
+        if importer.errors and not partial:
+            return Response(report, status=status.HTTP_400_BAD_REQUEST)
+        return Response(report)
@@ -1,5 +1,7 @@
 from django.contrib import admin
+from ngo.admin import LargeTableAdmin
 from .models import Page, ContactMessage, ModerationQueue, Announcement
+from .moderation import moderate_queue
 
 
 @admin.register(Page)
@@ -39,25 +41,23 @@ class ContactMessageAdmin(admin.ModelAdmin):
 
 
 @admin.register(ModerationQueue)
-class ModerationQueueAdmin(admin.ModelAdmin):
+class ModerationQueueAdmin(LargeTableAdmin):
     list_display = ['content_type', 'submitted_by', 'moderation_status', 'created_at', 'reviewed_by', 'reviewed_at']
     list_filter = ['content_type', 'moderation_status', 'created_at']
-    search_fields = ['submitted_by__name', 'reviewer_notes', 'submission_notes']
+    search_fields = ['^submitted_by__name']
     readonly_fields = ['content_type', 'object_id', 'created_at', 'updated_at']
-    date_hierarchy = 'created_at'
+    autocomplete_fields = ['submitted_by', 'reviewed_by']
     
     actions = ['bulk_approve', 'bulk_reject']
     
     def bulk_approve(self, request, queryset):
-        for item in queryset.filter(moderation_status='PENDING'):
-            item.approve(request.user, 'Bulk approved')
-        self.message_user(request, f"{queryset.count()} items approved")
+        count = moderate_queue(queryset, True, request.user, 'Bulk approved')
+        self.message_user(request, f"{count} items approved")
     bulk_approve.short_description = "Approve selected items"
     
     def bulk_reject(self, request, queryset):
-        for item in queryset.filter(moderation_status='PENDING'):
-            item.reject(request.user, 'Bulk rejected')
-        self.message_user(request, f"{queryset.count()} items rejected")
+        count = moderate_queue(queryset, False, request.user, 'Bulk rejected')
+        self.message_user(request, f"{count} items rejected")
     bulk_reject.short_description = "Reject selected items"
 
 
@@ -0,0 +1,115 @@
+"""
+Responsive variants of uploaded images.
+
+When one of the IMAGE_FIELDS is saved with a newly uploaded file,
+generate_variants() runs after commit on the background pool (ngo/tasks.py)
+and writes WebP and JPEG copies of it at each IMAGE_VARIANT_WIDTHS width
+narrower than the original. Variant files are named after the SHA-256 of the
+original's content, so an image uploaded twice is resized and stored once and
+a variant URL never changes content. ImageVariant rows map an original's
+storage name to its variants, and ImageVariantsField (pages/serializers.py)
+serializes them as srcset strings. The signal handlers are in pages/signals.py.
+
+Files stored in code with FieldFile.save() or assigned by name (imports,
+fixtures) and images uploaded before this existed get their variants from
+`manage.py generate_image_variants`.
+"""
+import hashlib
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+
+from .models import ImageVariant
+
+
+# (model, image field) pairs that get variants
+IMAGE_FIELDS = [
+    ('members.MemberOrganization', 'logo'),
+    ('members.StaffMember', 'photo'),
+    ('events.Event', 'featured_image'),
+    ('resources.Resource', 'thumbnail'),
+    ('resources.FAQ', 'image'),
+]
+
+# Pillow format and save options per variant format
+FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+
+def variant_widths(width):
+    """The configured widths below the original's; an image narrower than all of them gets one at its own width"""
+    return [w for w in sorted(settings.IMAGE_VARIANT_WIDTHS) if w < width] or [width]
+
+
+def encode(image, fmt):
+    from PIL import Image
+
+    pil_format, options = FORMATS[fmt]
+    if fmt == 'jpeg' and image.mode != 'RGB':
+        # JPEG has no transparency: flatten onto white rather than black
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        image = background
+    elif image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info or image.mode in ('LA', 'PA') else 'RGB')
+    buffer = BytesIO()
+    image.save(buffer, pil_format, **options)
+    return buffer.getvalue()
+
+
+def generate_variants(name, storage=None, force=False):
+    """Create the variants of the stored image `name` and return how many files were written"""
+    from PIL import Image, ImageOps
+
+    storage = storage or ImageVariant._meta.get_field('file').storage
+    with storage.open(name, 'rb') as f:
+        content = f.read()
+    digest = hashlib.sha256(content).hexdigest()
+    if not force and ImageVariant.objects.filter(source=name, source_hash=digest).exists():
+        return 0
+
+    image = Image.open(BytesIO(content))
+    # Let the JPEG decoder downscale while decoding, which is much faster for large photos
+    largest = max(settings.IMAGE_VARIANT_WIDTHS)
+    image.draft('RGB', (largest, largest))
+    image = ImageOps.exif_transpose(image)
+
+    variants = []
+    written = 0
+    for width in variant_widths(image.width):
+        height = max(round(image.height * width / image.width), 1)
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        for fmt in FORMATS:
+            variant_name = f'variants/{digest[:2]}/{digest}-{width}.{fmt}'
+            if force or not storage.exists(variant_name):
+                if storage.exists(variant_name):
+                    storage.delete(variant_name)
+                variant_name = storage.save(variant_name, ContentFile(encode(resized, fmt)))
+                written += 1
+            variants.append(ImageVariant(
+                source=name, source_hash=digest, format=fmt, width=width, height=height, file=variant_name,
+            ))
+
+    with transaction.atomic():
+        ImageVariant.objects.filter(source=name).delete()
+        ImageVariant.objects.bulk_create(variants)
+    return written
+
+
+def srcsets(names, request=None):
+    """{source name: {format: srcset}} for the given originals, in one query"""
+    storage = ImageVariant._meta.get_field('file').storage
+    result = {}
+    rows = ImageVariant.objects.filter(source__in=names).values_list('source', 'format', 'width', 'file')
+    for source, fmt, width, file in rows.order_by('source', 'format', 'width'):
+        url = storage.url(file)
+        if request is not None:
+            url = request.build_absolute_uri(url)
+        entry = result.setdefault(source, {}).setdefault(fmt, [])
+        entry.append(f'{url} {width}w')
+    return {source: {fmt: ', '.join(entries) for fmt, entries in formats.items()} for source, formats in result.items()}
@@ -0,0 +1,194 @@
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.db.backends.signals import connection_created
+from django.test.utils import override_settings
+
+from ngo.benchmarking import ASGIDriver, WSGIDriver
+from ngo.metrics import percentile
+
+
+# The list endpoints served by async views under ASGI
+DEFAULT_URLS = [
+    '/api/public/members/',
+    '/api/public/events/',
+    '/api/public/jobs/',
+    '/api/announcements/',
+    '/api/pages/',
+]
+
+
+class Command(BaseCommand):
+    help = 'Compare concurrent-request throughput of the WSGI and ASGI stacks in one worker process'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--url',
+            action='append',
+            default=[],
+            help='Endpoint to request (can be repeated); defaults to the async public list endpoints',
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=400,
+            help='Timed requests per stack, spread over the endpoints',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=20,
+            help='Clients sending requests at the same time',
+        )
+        parser.add_argument(
+            '--db-latency-ms',
+            type=float,
+            default=0.0,
+            help='Delay added to every query, standing in for the round trip to a database server',
+        )
+        # Used by the parent process to run one stack per child process
+        parser.add_argument('--stack', choices=['wsgi', 'asgi'], help=argparse.SUPPRESS)
+
+    def handle(self, *args, **options):
+        urls = options['url'] or DEFAULT_URLS
+        if options['requests'] < 1 or options['concurrency'] < 1:
+            raise CommandError('--requests and --concurrency must be at least 1')
+        if options['stack']:
+            self.stdout.write(json.dumps(self.run_stack(options['stack'], urls, options)))
+            return
+
+        if connection.vendor == 'sqlite' and not options['db_latency_ms']:
+            self.stdout.write(self.style.WARNING(
+                'SQLite answers in microseconds, so there is little database wait for ASGI to overlap; '
+                'pass --db-latency-ms to add the round trip of a database server'
+            ))
+        self.stdout.write(
+            f"{options['requests']} requests, {options['concurrency']} concurrent clients, "
+            f"{options['db_latency_ms']:g} ms added per query, one worker process per stack\n"
+        )
+        self.stdout.write(f"{'Stack':<6} {'Requests':>8} {'Errors':>6} {'Seconds':>8} {'Req/s':>8} {'p50 ms':>8} {'p95 ms':>8}")
+        results = {}
+        for stack in ('wsgi', 'asgi'):
+            result = results[stack] = self.spawn(stack, urls, options)
+            self.stdout.write(
+                f"{stack:<6} {result['requests']:>8} {result['errors']:>6} {result['seconds']:>8.2f} "
+                f"{result['requests'] / result['seconds']:>8.1f} {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f}"
+            )
+            if result['errors']:
+                self.stdout.write(self.style.ERROR(f"  {result['errors']} responses were not HTTP 200"))
+
+        speedup = results['wsgi']['seconds'] / results['asgi']['seconds']
+        style = self.style.SUCCESS if speedup >= 1 else self.style.WARNING
+        self.stdout.write(style(f'\nASGI throughput: {speedup:.2f}x WSGI'))
+
+    def spawn(self, stack, urls, options):
+        """Run one stack in a fresh process, so each is one worker with the URLs built for it"""
+        command = [
+            sys.executable, str(settings.BASE_DIR / 'manage.py'), 'benchmark_asgi', '--stack', stack,
+            '--requests', str(options['requests']),
+            '--concurrency', str(options['concurrency']),
+            '--db-latency-ms', str(options['db_latency_ms']),
+        ] + [f'--url={url}' for url in urls]
+        # Async list views are only routed when ASYNC_READ_VIEWS is on as the URLconf loads
+        env = {**os.environ, 'ASYNC_READ_VIEWS': str(stack == 'asgi')}
+        completed = subprocess.run(command, env=env, capture_output=True, text=True)
+        if completed.returncode != 0:
+            raise CommandError(f'The {stack} run failed:\n{completed.stderr}')
+        return json.loads(completed.stdout.strip().splitlines()[-1])
+
+    def run_stack(self, stack, urls, options):
+        logging.disable(logging.CRITICAL)
+        try:
+            with override_settings(DEBUG=False, QUERY_INSPECTOR_ENABLED=False):
+                if options['db_latency_ms']:
+                    self.add_latency(options['db_latency_ms'] / 1000)
+                run = self.run_wsgi if stack == 'wsgi' else self.run_asgi
+                latencies, statuses, seconds = run(urls, options)
+        finally:
+            logging.disable(logging.NOTSET)
+        latencies.sort()
+        return {
+            'requests': len(latencies),
+            'errors': sum(1 for status in statuses if status != 200),
+            'seconds': seconds,
+            'p50_ms': percentile(latencies, 0.5),
+            'p95_ms': percentile(latencies, 0.95),
+        }
+
+    def add_latency(self, seconds):
+        """Sleep before every query on every connection, including ones opened later in other threads"""
+        def delay(execute, sql, params, many, context):
+            time.sleep(seconds)
+            return execute(sql, params, many, context)
+
+        def install(sender, connection, **kwargs):
+            # First in the list: execute_wrapper() blocks pop the last entry when they exit
+            if delay not in connection.execute_wrappers:
+                connection.execute_wrappers.insert(0, delay)
+
+        connection_created.connect(install, weak=False)
+        for alias in connections:
+            connections[alias].close()
+
+    def run_wsgi(self, urls, options):
+        """Concurrent clients queueing for one synchronous worker"""
+        driver = WSGIDriver()
+        for url in urls:
+            driver.get(url)
+
+        worker = threading.Lock()
+        queue = itertools.islice(itertools.cycle(urls), options['requests'])
+        latencies, statuses = [], []
+
+        def client():
+            while True:
+                started = time.perf_counter()
+                with worker:
+                    url = next(queue, None)
+                    if url is None:
+                        return
+                    status, _body = driver.get(url)
+                latencies.append((time.perf_counter() - started) * 1000)
+                statuses.append(status)
+
+        clients = [threading.Thread(target=client) for _ in range(options['concurrency'])]
+        started = time.perf_counter()
+        for thread in clients:
+            thread.start()
+        for thread in clients:
+            thread.join()
+        return latencies, statuses, time.perf_counter() - started
+
+    def run_asgi(self, urls, options):
+        return asyncio.run(self.arun_asgi(urls, options))
+
+    async def arun_asgi(self, urls, options):
+        """Concurrent clients on one event loop"""
+        driver = ASGIDriver()
+        for url in urls:
+            await driver.get(url)
+
+        queue = itertools.islice(itertools.cycle(urls), options['requests'])
+        latencies, statuses = [], []
+
+        async def client():
+            for url in queue:
+                started = time.perf_counter()
+                status, _body = await driver.get(url)
+                latencies.append((time.perf_counter() - started) * 1000)
+                statuses.append(status)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(options['concurrency'])))
+        return latencies, statuses, time.perf_counter() - started
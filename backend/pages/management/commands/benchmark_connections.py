@@ -0,0 +1,109 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test.utils import override_settings
+
+from ngo.benchmarking import WSGIDriver
+from ngo.metrics import percentile
+
+
+class Command(BaseCommand):
+    help = 'Compare per-request connection setup cost with and without persistent database connections'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--url',
+            default='/api/states/',
+            help='Cheap endpoint to request; it must hit the database',
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=200,
+            help='Timed requests per configuration',
+        )
+        parser.add_argument(
+            '--max-age',
+            type=int,
+            default=60,
+            help='CONN_MAX_AGE for the persistent configurations',
+        )
+        parser.add_argument(
+            '--database',
+            default='default',
+            help='Database alias to measure',
+        )
+
+    def handle(self, *args, **options):
+        if options['database'] not in connections:
+            raise CommandError(f"Unknown database alias {options['database']}")
+        connection = connections[options['database']]
+        if connection.vendor == 'sqlite':
+            self.stdout.write(self.style.WARNING(
+                'SQLite opens a local file, so connection setup is nearly free; '
+                'run this against PostgreSQL or MySQL for meaningful numbers'
+            ))
+        configured = {key: connection.settings_dict[key] for key in ('CONN_MAX_AGE', 'CONN_HEALTH_CHECKS')}
+        self.stdout.write(
+            f"{connection.vendor} {connection.settings_dict.get('HOST') or connection.settings_dict['NAME']}: configured "
+            f"CONN_MAX_AGE={configured['CONN_MAX_AGE']} CONN_HEALTH_CHECKS={configured['CONN_HEALTH_CHECKS']}\n"
+        )
+
+        runs = [
+            ('New connection per request', 0, False),
+            (f"Persistent ({options['max_age']}s)", options['max_age'], False),
+            (f"Persistent ({options['max_age']}s) + health checks", options['max_age'], True),
+        ]
+        logging.disable(logging.CRITICAL)
+        try:
+            with override_settings(DEBUG=False, QUERY_INSPECTOR_ENABLED=False, REQUEST_METRICS_ENABLED=False):
+                driver = WSGIDriver()
+                self.stdout.write(
+                    f"{'Configuration':<42} {'Connects':>8} {'Connect ms':>10} {'ms/request':>10} "
+                    f"{'p50 ms':>8} {'p95 ms':>8}"
+                )
+                for label, max_age, health_checks in runs:
+                    self.measure(driver, connection, label, max_age, health_checks, options)
+        finally:
+            logging.disable(logging.NOTSET)
+            connection.close()
+            connection.settings_dict.update(configured)
+
+    def measure(self, driver, connection, label, max_age, health_checks, options):
+        connection.close()
+        connection.settings_dict['CONN_MAX_AGE'] = max_age
+        connection.settings_dict['CONN_HEALTH_CHECKS'] = health_checks
+
+        # Time connect() on this connection object only
+        connects = []
+        original_connect = connection.connect
+
+        def timed_connect():
+            started = time.perf_counter()
+            try:
+                return original_connect()
+            finally:
+                connects.append(time.perf_counter() - started)
+
+        connection.connect = timed_connect
+        latencies = []
+        try:
+            status, _body = driver.get(options['url'])
+            if status != 200:
+                raise CommandError(f"{options['url']} returned HTTP {status}")
+            connects.clear()
+            for _ in range(options['requests']):
+                started = time.perf_counter()
+                driver.get(options['url'])
+                latencies.append((time.perf_counter() - started) * 1000)
+        finally:
+            del connection.connect
+
+        latencies.sort()
+        connect_ms = sum(connects) * 1000
+        self.stdout.write(
+            f"{label:<42} {len(connects):>8} {connect_ms:>10.1f} {connect_ms / len(latencies):>10.3f} "
+            f"{percentile(latencies, 0.5):>8.2f} {percentile(latencies, 0.95):>8.2f}"
+        )
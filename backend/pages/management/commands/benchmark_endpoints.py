@@ -0,0 +1,218 @@
+import json
+import logging
+import statistics
+import subprocess
+import time
+import tracemalloc
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test.utils import override_settings
+from django.urls import resolve
+from django.utils import timezone
+
+from forum.models import ForumComment, ForumPost
+from members.models import MemberOrganization
+from ngo.benchmarking import DRIVERS, public_list_urls
+from ngo.metrics import QueryTimer, percentile
+from operational.models import OperationalPresence
+
+
+class Command(BaseCommand):
+    help = 'Measure latency, queries and memory of the public API endpoints and compare runs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--url',
+            action='append',
+            default=[],
+            help='Endpoint to measure (can be repeated); defaults to every public list endpoint and one detail each',
+        )
+        parser.add_argument(
+            '--driver',
+            choices=sorted(DRIVERS),
+            default='wsgi',
+            help='Call the WSGI application directly or go through django.test.Client',
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=20,
+            help='Timed requests per endpoint',
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=2,
+            help='Untimed requests per endpoint before measuring',
+        )
+        parser.add_argument(
+            '--no-memory',
+            action='store_true',
+            help='Skip the tracemalloc pass that records peak memory per request',
+        )
+        parser.add_argument(
+            '--output',
+            help='Write the results to this JSON file',
+        )
+        parser.add_argument(
+            '--compare',
+            help='Baseline JSON file from an earlier run to compare against',
+        )
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=20.0,
+            help='Percent p50 slowdown that counts as a regression when comparing',
+        )
+
+    def handle(self, *args, **options):
+        # Benchmark the production configuration, not the debug tooling. Request
+        # logs and error reports (e.g. mail to ADMINS) are switched off meanwhile.
+        logging.disable(logging.CRITICAL)
+        try:
+            with override_settings(DEBUG=False, QUERY_INSPECTOR_ENABLED=False):
+                endpoints = self.run(options)
+        finally:
+            logging.disable(logging.NOTSET)
+
+        results = {'meta': self.meta(options), 'endpoints': endpoints}
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(f"\nResults written to {options['output']}")
+
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as f:
+                baseline = json.load(f)
+            regressions = self.compare(baseline, results, options['threshold'])
+            if regressions:
+                raise CommandError(f'{len(regressions)} endpoint(s) regressed: {", ".join(regressions)}')
+            self.stdout.write(self.style.SUCCESS('No regressions against the baseline'))
+
+    def run(self, options):
+        driver = DRIVERS[options['driver']]()
+        urls = options['url'] or self.default_urls(driver)
+
+        self.stdout.write(
+            f"{'Endpoint':<55} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'Queries':>7} "
+            f"{'Bytes':>9} {'Peak KB':>8}"
+        )
+        endpoints = {}
+        for url in urls:
+            result = self.measure(driver, url, options)
+            if result is None:
+                continue
+            endpoints[url] = result
+            self.stdout.write(
+                f"{url[:55]:<55} {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} {result['p99_ms']:>8.1f} "
+                f"{result['queries']:>7} {result['bytes']:>9,} {result['peak_kb'] or 0:>8,.0f}"
+            )
+        return endpoints
+
+    def default_urls(self, driver):
+        """Every public list endpoint plus the detail view of its first row"""
+        urls = []
+        for url in public_list_urls():
+            urls.append(url)
+            status, body = driver.get(url)
+            if status != 200:
+                continue
+            data = json.loads(body)
+            rows = data.get('results', []) if isinstance(data, dict) else data
+            view_class = resolve(url).func.cls
+            lookup_field = getattr(view_class, 'lookup_field', 'pk')
+            lookup_field = 'id' if lookup_field == 'pk' else lookup_field
+            if rows and isinstance(rows[0], dict) and rows[0].get(lookup_field) is not None:
+                urls.append(f'{url}{rows[0][lookup_field]}/')
+        return urls
+
+    def measure(self, driver, url, options):
+        for _ in range(options['warmup']):
+            status, _body = driver.get(url)
+        if options['warmup'] and status != 200:
+            self.stdout.write(self.style.WARNING(f'{url[:55]:<55} skipped (HTTP {status})'))
+            return None
+
+        latencies = []
+        timer = None
+        body = b''
+        for _ in range(options['requests']):
+            timer = QueryTimer()
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(timer))
+                started = time.perf_counter()
+                status, body = driver.get(url)
+                latencies.append((time.perf_counter() - started) * 1000)
+            if status != 200:
+                self.stdout.write(self.style.WARNING(f'{url[:55]:<55} skipped (HTTP {status})'))
+                return None
+
+        peak_kb = None
+        if not options['no_memory']:
+            tracemalloc.start()
+            driver.get(url)
+            peak_kb = tracemalloc.get_traced_memory()[1] / 1024
+            tracemalloc.stop()
+
+        latencies.sort()
+        return {
+            'requests': len(latencies),
+            'mean_ms': round(statistics.fmean(latencies), 3),
+            'p50_ms': round(percentile(latencies, 0.5), 3),
+            'p95_ms': round(percentile(latencies, 0.95), 3),
+            'p99_ms': round(percentile(latencies, 0.99), 3),
+            'max_ms': round(latencies[-1], 3),
+            'queries': timer.count,
+            'db_ms': round(timer.seconds * 1000, 3),
+            'bytes': len(body),
+            'peak_kb': round(peak_kb, 1) if peak_kb is not None else None,
+        }
+
+    def meta(self, options):
+        try:
+            revision = subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'],
+                cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            revision = None
+        return {
+            'timestamp': timezone.now().isoformat(),
+            'revision': revision,
+            'driver': options['driver'],
+            'requests': options['requests'],
+            'database': connection.vendor,
+            'rows': {
+                'organizations': MemberOrganization.objects.count(),
+                'presence': OperationalPresence.objects.count(),
+                'posts': ForumPost.objects.count(),
+                'comments': ForumComment.objects.count(),
+            },
+        }
+
+    def compare(self, baseline, results, threshold):
+        before = baseline.get('meta', {})
+        for key in ('rows', 'driver', 'database'):
+            if before.get(key) is not None and before[key] != results['meta'][key]:
+                self.stdout.write(self.style.WARNING(f'Baseline {key} differs: {before[key]}'))
+
+        self.stdout.write(f"\n{'Endpoint':<55} {'p50 before':>10} {'p50 now':>8} {'Change':>8} {'Queries':>9}")
+        regressions = []
+        for url, now in results['endpoints'].items():
+            before = baseline.get('endpoints', {}).get(url)
+            if before is None:
+                continue
+            change = 100 * (now['p50_ms'] - before['p50_ms']) / before['p50_ms'] if before['p50_ms'] else 0.0
+            line = (
+                f"{url[:55]:<55} {before['p50_ms']:>10.1f} {now['p50_ms']:>8.1f} {change:>+7.1f}% "
+                f"{before['queries']:>4}->{now['queries']:<4}"
+            )
+            if change > threshold or now['queries'] > before['queries']:
+                regressions.append(url)
+                line = self.style.ERROR(line)
+            self.stdout.write(line)
+        return regressions
@@ -0,0 +1,150 @@
+import time
+from contextlib import contextmanager
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from forum.models import ForumCategory, ForumPost
+from jobs.models import JobAdvertisement
+from members.models import MemberOrganization
+from ngo.metrics import QueryTimer
+from pages.models import ModerationQueue
+from pages.moderation import moderate_content, moderate_queue
+
+
+PREFIX = 'bench-moderation'
+
+
+class Rollback(Exception):
+    """Raised to undo the benchmark rows"""
+
+
+class Command(BaseCommand):
+    help = 'Time bulk approve/reject of pending moderation items, set-based against the per-item loop'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--items',
+            type=int,
+            default=10000,
+            help='Pending items per run, split between forum posts (status) and job ads (is_approved)',
+        )
+        parser.add_argument(
+            '--legacy-items',
+            type=int,
+            default=1000,
+            help='Items for the per-item loop (it is slow; its time is extrapolated to --items); 0 skips it',
+        )
+
+    def handle(self, *args, **options):
+        if options['items'] < 2:
+            raise CommandError('--items must be at least 2')
+        self.organization = MemberOrganization.objects.order_by('pk').first()
+        if self.organization is None:
+            raise CommandError('No member organizations; run generate_data first')
+        self.user = None
+
+        # Everything happens in one transaction that is rolled back at the end
+        try:
+            with transaction.atomic():
+                self.category = ForumCategory.objects.create(name=PREFIX, slug=PREFIX)
+                self.run(options)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, options):
+        items = options['items']
+        self.stdout.write(f"{'Run':<38} {'Items':>7} {'Seconds':>9} {'Queries':>8} {'Items/s':>10} {'Pending':>8}")
+
+        if options['legacy_items']:
+            legacy = min(options['legacy_items'], items)
+            queue = self.create_pending(legacy, 'legacy')
+            with self.measure('Queue approve, per-item loop', legacy, queue) as result:
+                for item in queue.select_related('content_type'):
+                    self.legacy_approve(item)
+            self.stdout.write(self.style.WARNING(
+                f"  extrapolated to {items:,} items: {result['seconds'] * items / legacy:.1f} s, "
+                f"{result['queries'] * items // legacy:,} queries"
+            ))
+
+        queue = self.create_pending(items, 'queue-approve')
+        with self.measure('Queue approve, set-based', items, queue):
+            moderate_queue(queue, True, self.user, 'Bulk approved')
+
+        queue = self.create_pending(items, 'queue-reject')
+        with self.measure('Queue reject, set-based', items, queue):
+            moderate_queue(queue, False, self.user, 'Bulk rejected')
+
+        queue = self.create_pending(items, 'content-approve')
+        with self.measure('Admin content approve, set-based', items, queue):
+            moderate_content(ForumPost.objects.filter(slug__startswith=f'{PREFIX}-content-approve-'), True, self.user)
+            moderate_content(JobAdvertisement.objects.filter(job_title__startswith=f'{PREFIX} content-approve '), True, self.user)
+
+    @contextmanager
+    def measure(self, label, items, queue):
+        timer = QueryTimer()
+        result = {}
+        with connection.execute_wrapper(timer):
+            started = time.perf_counter()
+            yield result
+            result['seconds'] = time.perf_counter() - started
+        result['queries'] = timer.count
+        pending = queue.filter(moderation_status='PENDING').count()
+        self.stdout.write(
+            f"{label:<38} {items:>7,} {result['seconds']:>9.3f} {timer.count:>8,} "
+            f"{items / result['seconds']:>10,.0f} {pending:>8,}"
+        )
+        if pending:
+            self.stdout.write(self.style.ERROR(f'  {pending} queue items were left pending'))
+
+    def create_pending(self, count, run):
+        """count pending items, half forum posts and half job ads, with their queue entries"""
+        posts = count // 2
+        ForumPost.objects.bulk_create([
+            ForumPost(
+                author=self.organization, category=self.category, title=f'{PREFIX} {run} {i}',
+                slug=f'{PREFIX}-{run}-{i}', content='Benchmark post', status='PENDING',
+            )
+            for i in range(posts)
+        ], batch_size=1000)
+        JobAdvertisement.objects.bulk_create([
+            JobAdvertisement(
+                organization=self.organization, job_title=f'{PREFIX} {run} {i}', location='Juba',
+                job_type='FULL_TIME', description='Benchmark job', requirements='None',
+                application_deadline=timezone.now().date(), application_email='bench@example.org',
+                is_approved=False,
+            )
+            for i in range(count - posts)
+        ], batch_size=1000)
+
+        post_ids = ForumPost.objects.filter(slug__startswith=f'{PREFIX}-{run}-').values_list('pk', flat=True)
+        job_ids = JobAdvertisement.objects.filter(job_title__startswith=f'{PREFIX} {run} ').values_list('pk', flat=True)
+        post_type = ContentType.objects.get_for_model(ForumPost)
+        job_type = ContentType.objects.get_for_model(JobAdvertisement)
+        ModerationQueue.objects.bulk_create(
+            [ModerationQueue(content_type=post_type, object_id=pk, submitted_by=self.organization) for pk in post_ids]
+            + [ModerationQueue(content_type=job_type, object_id=pk, submitted_by=self.organization) for pk in job_ids],
+            batch_size=1000,
+        )
+        return ModerationQueue.objects.filter(
+            content_type=post_type, object_id__in=post_ids
+        ) | ModerationQueue.objects.filter(
+            content_type=job_type, object_id__in=job_ids
+        )
+
+    def legacy_approve(self, item):
+        """What ModerationQueue.approve() did per item before moderation was set-based"""
+        item.moderation_status = 'APPROVED'
+        item.reviewed_by = self.user
+        item.reviewed_at = timezone.now()
+        item.reviewer_notes = 'Bulk approved'
+        item.save()
+        content = item.content_object
+        if hasattr(content, 'status'):
+            content.status = 'APPROVED'
+        else:
+            content.is_approved = True
+        content.save()
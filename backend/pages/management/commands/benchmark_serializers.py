@@ -0,0 +1,129 @@
+import json
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from events.models import Event
+from events.serializers import EventListSerializer
+from jobs.models import JobAdvertisement
+from jobs.serializers import JobAdvertisementListSerializer
+from members.models import MemberOrganization
+from members.serializers import MemberOrganizationListSerializer
+from ngo.fast_serializers import compile_serializer
+
+
+class Command(BaseCommand):
+    help = 'Compare DRF serializers with compiled fast serializers on synthetic data (rolled back afterwards)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=10000,
+            help='Synthetic rows created per model',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Runs per serializer; the fastest run is reported',
+        )
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        self.stdout.write(f'Creating {rows} synthetic rows per model...')
+
+        with transaction.atomic():
+            self.create_rows(rows)
+            cases = [
+                ('members', MemberOrganization.objects.filter(slug__startswith='bench-'),
+                 MemberOrganizationListSerializer, []),
+                ('events', Event.objects.filter(slug__startswith='bench-'),
+                 EventListSerializer, ['created_by']),
+                ('jobs', JobAdvertisement.objects.filter(organization__slug__startswith='bench-'),
+                 JobAdvertisementListSerializer, ['organization']),
+            ]
+
+            self.stdout.write(f"\n{'Serializer':<36} {'DRF rows/s':>12} {'Fast rows/s':>12} {'Speedup':>8}")
+            for label, queryset, serializer_class, related in cases:
+                self.run_case(label, queryset, serializer_class, related, options['repeat'])
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS('\nBenchmark completed, synthetic rows rolled back'))
+
+    def create_rows(self, rows):
+        today = date.today()
+        organizations = MemberOrganization.objects.bulk_create([
+            MemberOrganization(
+                name=f'Benchmark Organization {i}',
+                slug=f'bench-{i}',
+                member_type='NATIONAL' if i % 2 else 'INTERNATIONAL',
+                email=f'bench{i}@example.org',
+                address='Juba',
+                state='Central Equatoria',
+                status='ACTIVE',
+                logo=f'logos/bench-{i}.png' if i % 3 else '',
+            )
+            for i in range(rows)
+        ], batch_size=1000)
+        Event.objects.bulk_create([
+            Event(
+                title=f'Benchmark Event {i}',
+                slug=f'bench-{i}',
+                description='Synthetic event description. ' * 20,
+                event_date=today + timedelta(days=i % 365),
+                location='Juba',
+                # Every fifth event has no organizer to cover null relations
+                created_by=organizations[i] if i % 5 else None,
+            )
+            for i in range(rows)
+        ], batch_size=1000)
+        JobAdvertisement.objects.bulk_create([
+            JobAdvertisement(
+                organization=organizations[i],
+                job_title=f'Benchmark Job {i}',
+                location='Juba',
+                description='Synthetic job description. ' * 40,
+                requirements='Synthetic requirements.',
+                application_deadline=today + timedelta(days=(i % 60) - 30),
+                application_email=f'jobs{i}@example.org',
+            )
+            for i in range(rows)
+        ], batch_size=1000)
+
+    def run_case(self, label, queryset, serializer_class, related, repeat):
+        plan = compile_serializer(serializer_class(many=True))
+        if plan is None:
+            raise CommandError(f'{serializer_class.__name__} cannot be compiled')
+
+        drf_data, drf_seconds = self.best_of(
+            repeat, lambda: serializer_class(queryset.select_related(*related), many=True).data
+        )
+        fast_data, fast_seconds = self.best_of(
+            repeat, lambda: plan.to_representation(plan.values(queryset))
+        )
+
+        if self.dump(drf_data) != self.dump(fast_data):
+            raise CommandError(f'{label}: fast serializer output differs from DRF output')
+
+        count = len(fast_data)
+        self.stdout.write(
+            f'{serializer_class.__name__:<36} {count / drf_seconds:>12,.0f} '
+            f'{count / fast_seconds:>12,.0f} {drf_seconds / fast_seconds:>7.1f}x'
+        )
+
+    def best_of(self, repeat, func):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            data = func()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return data, best
+
+    def dump(self, data):
+        return json.dumps(data, cls=DjangoJSONEncoder)
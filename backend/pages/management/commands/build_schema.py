@@ -0,0 +1,55 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ngo.schema import artifact_root, generate_schema, read_manifest, render_schema, source_fingerprint, write_artifact
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate the OpenAPI schema served at /api/schema/ and /api/docs/ into SCHEMA_ARTIFACT_ROOT; '
+        'skipped when the URLconf, views, serializers and models are unchanged since the last build'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Regenerate even when the source fingerprint matches the current artifact',
+        )
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only report whether the artifact is up to date; exits with an error when it is not',
+        )
+
+    def handle(self, *args, **options):
+        fingerprint = source_fingerprint()
+        manifest = read_manifest()
+        up_to_date = (
+            manifest is not None
+            and manifest.get('fingerprint') == fingerprint
+            and all((artifact_root() / name).is_file() for name in manifest.get('files', {}).values())
+        )
+
+        if options['check']:
+            if not up_to_date:
+                raise CommandError('The prebuilt schema is missing or out of date; run manage.py build_schema')
+            self.stdout.write(self.style.SUCCESS(f"Schema {manifest['hash']} is up to date"))
+            return
+        if up_to_date and not options['force']:
+            self.stdout.write(f"Schema {manifest['hash']} is up to date, nothing to do")
+            return
+
+        started = time.perf_counter()
+        rendered = render_schema(generate_schema())
+        seconds = time.perf_counter() - started
+        new = write_artifact(rendered, fingerprint)
+
+        for name in new['files'].values():
+            self.stdout.write(f"  {name} ({(artifact_root() / name).stat().st_size / 1024:.0f} KB)")
+        if manifest is not None and manifest.get('hash') == new['hash']:
+            message = f"Schema {new['hash']} unchanged (source changed but not the schema), generated in {seconds * 1000:.0f} ms"
+        else:
+            message = f"Built schema {new['hash']} in {seconds * 1000:.0f} ms into {artifact_root()}"
+        self.stdout.write(self.style.SUCCESS(message))
@@ -1,53 +1,156 @@
+import time
+from contextlib import contextmanager
 from datetime import date, timedelta
-from django.core.management.base import BaseCommand
-from members.models import MemberOrganization
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import F
+from django.utils import timezone
+from members.authentication import mark_organizations_changed
+from members.models import MemberOrganization, MembershipReminder
 from pages.emails import send_membership_expiring_email
 
 
 class Command(BaseCommand):
-    help = 'Check for expiring memberships and send warning emails'
+    help = 'Deactivate expired memberships and send expiry reminders (one per organization per window)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report what would change without updating members or sending email',
+        )
+        parser.add_argument(
+            '--windows',
+            default='30,7,1',
+            help='Comma-separated reminder windows in days before expiry',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Reminders loaded and marked as sent per batch',
+        )
 
     def handle(self, *args, **options):
+        try:
+            windows = sorted({int(days) for days in options['windows'].split(',')})
+        except ValueError:
+            raise CommandError(f"Invalid --windows value: {options['windows']}")
+        if not windows or windows[0] < 1:
+            raise CommandError('Reminder windows must be positive numbers of days')
+
+        self.dry_run = options['dry_run']
+        if self.dry_run:
+            self.stdout.write(self.style.WARNING('Running in DRY RUN mode - no changes will be saved'))
         self.stdout.write('Checking membership expiry dates...')
-        
+
         today = date.today()
-        warning_date = today + timedelta(days=30)
-        
-        # Find memberships expiring in next 30 days
-        expiring_soon = MemberOrganization.objects.filter(
-            membership_expiry_date__lte=warning_date,
-            membership_expiry_date__gte=today,
-            status='ACTIVE'
-        )
-        
-        self.stdout.write(f'Found {expiring_soon.count()} memberships expiring in next 30 days')
-        
-        for org in expiring_soon:
-            days_remaining = (org.membership_expiry_date - today).days
-            self.stdout.write(f'  {org.name}: {days_remaining} days remaining')
-            
-            # Send email notification
-            send_membership_expiring_email(org)
-            self.stdout.write(f'    Sent expiry warning email')
-        
-        # Find expired memberships
+        started = time.perf_counter()
+
+        expired_count = self.deactivate_expired(today)
+        candidates = self.find_due_reminders(today, windows)
+        queued_count = self.enqueue_reminders(candidates, today)
+        sent_count = self.send_pending_reminders(today, options['batch_size'])
+        if self.dry_run:
+            # Newly found reminders were not queued, so they are not counted as pending yet
+            sent_count += queued_count
+
+        self.stdout.write(self.style.SUCCESS('\n=== SUMMARY ==='))
+        self.stdout.write(f'Expired memberships deactivated: {expired_count}')
+        self.stdout.write(f'Memberships inside a reminder window: {len(candidates)}')
+        self.stdout.write(f'New reminders queued: {queued_count}')
+        self.stdout.write(f"Reminders {'that would be ' if self.dry_run else ''}sent: {sent_count}")
+        self.stdout.write(self.style.SUCCESS(f'\nMembership check completed in {time.perf_counter() - started:.2f}s'))
+
+    @contextmanager
+    def timed(self, label):
+        started = time.perf_counter()
+        yield
+        self.stdout.write(f'  {label} ({(time.perf_counter() - started) * 1000:.0f} ms)')
+
+    def deactivate_expired(self, today):
+        """Deactivate every expired active member with a single UPDATE"""
         expired = MemberOrganization.objects.filter(
             membership_expiry_date__lt=today,
             status='ACTIVE'
         )
-        
-        if expired.exists():
-            self.stdout.write(self.style.WARNING(f'\nFound {expired.count()} expired memberships'))
-            
-            for org in expired:
-                self.stdout.write(self.style.WARNING(f'  {org.name}: expired {(today - org.membership_expiry_date).days} days ago'))
-                
-                # Update status
-                org.status = 'INACTIVE'
-                org.is_verified = False
-                org.auto_approve_content = False
-                org.save()
-                
-                self.stdout.write(f'    Updated status to INACTIVE')
-        
-        self.stdout.write(self.style.SUCCESS('\nMembership check completed'))
+        with self.timed('Deactivated expired memberships'):
+            if self.dry_run:
+                return expired.count()
+            expired_ids = list(expired.values_list('id', flat=True))
+            # update() skips auto_now, so stamp updated_at explicitly
+            updated = MemberOrganization.objects.filter(pk__in=expired_ids, status='ACTIVE').update(
+                status='INACTIVE',
+                is_verified=False,
+                auto_approve_content=False,
+                updated_at=timezone.now()
+            )
+            # update() sends no post_save, so existing tokens must be told auto_approve_content changed
+            mark_organizations_changed(expired_ids)
+            return updated
+
+    def find_due_reminders(self, today, windows):
+        """One query for every active member expiring within the largest window"""
+        with self.timed('Found memberships due a reminder'):
+            due = MemberOrganization.objects.filter(
+                status='ACTIVE',
+                membership_expiry_date__gte=today,
+                membership_expiry_date__lte=today + timedelta(days=windows[-1])
+            ).values_list('id', 'membership_expiry_date')
+
+            candidates = []
+            for org_id, expiry_date in due.iterator(chunk_size=2000):
+                days_remaining = (expiry_date - today).days
+                # Smallest window the member has entered, e.g. 12 days left -> 30 day reminder
+                window_days = next(days for days in windows if days >= days_remaining)
+                candidates.append(MembershipReminder(
+                    organization_id=org_id,
+                    expiry_date=expiry_date,
+                    window_days=window_days
+                ))
+        return candidates
+
+    def enqueue_reminders(self, candidates, today):
+        """Record reminders; the unique (organization, expiry_date, window_days) key deduplicates"""
+        with self.timed('Queued reminders'):
+            already_logged = set(
+                MembershipReminder.objects.filter(expiry_date__gte=today)
+                .values_list('organization_id', 'expiry_date', 'window_days')
+            )
+            new_reminders = [
+                reminder for reminder in candidates
+                if (reminder.organization_id, reminder.expiry_date, reminder.window_days) not in already_logged
+            ]
+            if not self.dry_run:
+                # ignore_conflicts covers a concurrent run inserting the same rows
+                MembershipReminder.objects.bulk_create(new_reminders, batch_size=1000, ignore_conflicts=True)
+        return len(new_reminders)
+
+    def send_pending_reminders(self, today, batch_size):
+        """Send queued reminders that still match the member's current expiry date"""
+        pending = MembershipReminder.objects.filter(
+            status='PENDING',
+            expiry_date__gte=today,
+            expiry_date=F('organization__membership_expiry_date'),
+            organization__status='ACTIVE'
+        ).select_related('organization').order_by('id')
+
+        if self.dry_run:
+            with self.timed('Counted reminders to send'):
+                return pending.count()
+
+        sent_count = 0
+        with self.timed('Sent reminders'):
+            last_id = 0
+            while True:
+                batch = list(pending.filter(id__gt=last_id)[:batch_size])
+                if not batch:
+                    break
+                for reminder in batch:
+                    send_membership_expiring_email(reminder.organization)
+                MembershipReminder.objects.filter(id__in=[r.id for r in batch]).update(
+                    status='SENT',
+                    sent_at=timezone.now()
+                )
+                sent_count += len(batch)
+                last_id = batch[-1].id
+        return sent_count
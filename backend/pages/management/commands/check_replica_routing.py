@@ -0,0 +1,151 @@
+import argparse
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connections
+from django.test import Client
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from events.models import Event
+from ngo import routers
+
+
+PASSWORD = 'replica-check'
+
+
+class Command(BaseCommand):
+    help = (
+        'Check read-replica routing (ngo/routers.py) against two throwaway SQLite files: '
+        'public reads from the replica, writes and pinned clients on the primary, and the lag fallback'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--keep',
+            action='store_true',
+            help='Keep the two database files and print where they are',
+        )
+        # Set in the child process that runs against the two files
+        parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+
+    def handle(self, *args, **options):
+        if options['child']:
+            return self.run_checks()
+
+        directory = tempfile.mkdtemp(prefix='replica-check-')
+        # The child reads the two files through the usual environment settings, so
+        # DATABASES['replica'] and the router are set up exactly as in production
+        env = dict(
+            os.environ,
+            DATABASE_ENGINE='sqlite',
+            DATABASE_NAME=os.path.join(directory, 'primary.sqlite3'),
+            DATABASE_CONN_MAX_AGE='0',
+            REPLICA_DATABASE_ENGINE='sqlite',
+            REPLICA_DATABASE_NAME=os.path.join(directory, 'replica.sqlite3'),
+            REPLICA_DATABASE_CONN_MAX_AGE='0',
+            WARMUP_ON_START='False',
+        )
+        try:
+            result = subprocess.run(
+                [sys.executable, os.path.join(settings.BASE_DIR, 'manage.py'), 'check_replica_routing', '--child'],
+                env=env,
+                stdout=self.stdout._out,
+                stderr=self.stderr._out,
+            )
+        finally:
+            if options['keep']:
+                self.stdout.write(f'Databases kept in {directory}')
+            else:
+                shutil.rmtree(directory, ignore_errors=True)
+        if result.returncode:
+            raise CommandError('Replica routing check failed')
+
+    def run_checks(self):
+        primary = settings.DATABASES['default']['NAME']
+        replica = settings.DATABASES[routers.REPLICA]['NAME']
+        self.stdout.write(f'Primary {primary}\nReplica {replica}\n')
+
+        call_command('migrate', verbosity=0)
+        event = Event.objects.create(
+            title='On the primary', description='Replica routing check', event_date=timezone.now().date(),
+            location='Juba', is_approved=True,
+        )
+        user = get_user_model().objects.create_user('replica-check', password=PASSWORD)
+        connections.close_all()
+        shutil.copyfile(primary, replica)
+        # Only the replica has this title, so every response shows which database served it
+        Event.objects.using(routers.REPLICA).filter(pk=event.pk).update(title='On the replica')
+
+        self.failures = 0
+        logging.disable(logging.CRITICAL)
+        try:
+            with override_settings(QUERY_INSPECTOR_ENABLED=False, REQUEST_METRICS_ENABLED=False):
+                self.check_routing(event, user)
+        finally:
+            logging.disable(logging.NOTSET)
+
+        if self.failures:
+            self.stdout.write(self.style.ERROR(f'\n{self.failures} checks failed'))
+            sys.exit(1)
+        self.stdout.write(self.style.SUCCESS('\nAll replica routing checks passed'))
+
+    def check_routing(self, event, user):
+        client = Client(HTTP_HOST='localhost')
+        list_url = '/api/public/events/'
+        detail_url = f'/api/public/events/{event.pk}/'
+
+        def served_by(url):
+            response = client.get(url)
+            data = response.json()
+            title = data['results'][0]['title'] if 'results' in data else data['title']
+            return 'replica' if title == 'On the replica' else 'primary'
+
+        routers.monitor.checked_at = 0.0
+        self.expect('Public list is read from the replica', served_by(list_url), 'replica')
+        self.expect('Public detail is read from the replica', served_by(detail_url), 'replica')
+
+        # The routing state of a request that chose the replica, as the middleware sets it
+        token = routers.routing.set({'replica': True})
+        try:
+            before = Event.objects.get(pk=event.pk).title
+            Event.objects.filter(pk=event.pk).update(updated_at=timezone.now())
+            after = Event.objects.get(pk=event.pk).title
+        finally:
+            routers.routing.reset(token)
+        self.expect('Reads before a write in a request use the replica', before, 'On the replica')
+        self.expect('Reads after a write in the same request use the primary', after, 'On the primary')
+
+        response = client.post(
+            '/api/token/', {'username': user.username, 'password': PASSWORD}, content_type='application/json',
+        )
+        self.expect('A successful write sets the pin cookie', routers.PIN_COOKIE in response.cookies, True)
+        self.expect('A pinned client reads the list from the primary', served_by(list_url), 'primary')
+        self.expect('A pinned client reads details from the primary', served_by(detail_url), 'primary')
+        del client.cookies[routers.PIN_COOKIE]
+        self.expect('Without the cookie the replica is used again', served_by(list_url), 'replica')
+
+        with mock.patch.object(routers, 'measure_lag', return_value=settings.REPLICA_MAX_LAG_SECONDS + 60):
+            routers.monitor.checked_at = 0.0
+            self.expect('A lagging replica falls back to the primary', served_by(list_url), 'primary')
+        with mock.patch.object(routers, 'measure_lag', side_effect=DatabaseError('unreachable')):
+            routers.monitor.checked_at = 0.0
+            self.expect('An unreachable replica falls back to the primary', served_by(list_url), 'primary')
+        routers.monitor.checked_at = 0.0
+        self.expect('A caught-up replica is used again', served_by(list_url), 'replica')
+
+    def expect(self, label, actual, expected):
+        if actual == expected:
+            self.stdout.write(f'  {self.style.SUCCESS("ok")}    {label}')
+        else:
+            self.failures += 1
+            self.stdout.write(f'  {self.style.ERROR("FAIL")}  {label}: got {actual!r}, expected {expected!r}')
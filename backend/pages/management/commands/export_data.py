@@ -0,0 +1,204 @@
+import gzip
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import islice
+from pathlib import Path
+
+import django
+from django.apps import apps
+from django.core import serializers
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+
+# Same exclusions the old export_to_mysql.py passed to dumpdata
+DEFAULT_EXCLUDES = ['contenttypes', 'auth.permission']
+
+MANIFEST_NAME = 'manifest.json'
+
+
+def file_checksum(path):
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _init_worker():
+    # Forked workers must not reuse the parent's database sockets
+    django.setup()
+    connections.close_all()
+
+
+def export_model(label, shard_path, database, since, chunk_size):
+    """
+    Dump one model to a gzipped NDJSON shard.
+    Runs inside a worker process; returns the manifest entry for the shard.
+    """
+    model = apps.get_model(label)
+    queryset = model._default_manager.using(database).order_by(model._meta.pk.name)
+
+    incremental = since is not None and _has_updated_at(model)
+    if incremental:
+        queryset = queryset.filter(updated_at__gte=since)
+
+    rows = 0
+    # mtime=0 keeps the shard bytes (and checksum) stable for identical data
+    with open(shard_path, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as out:
+        # iterator() streams through a server-side cursor on PostgreSQL and fetches in chunks
+        # elsewhere; the python serializer keeps every record it returns, so it gets one chunk
+        # at a time and memory stays flat per model
+        objects = queryset.iterator(chunk_size=chunk_size)
+        while chunk := list(islice(objects, chunk_size)):
+            for record in serializers.serialize(
+                'python', chunk,
+                use_natural_foreign_keys=True,
+                use_natural_primary_keys=True,
+            ):
+                out.write(json.dumps(record, cls=DjangoJSONEncoder, ensure_ascii=False).encode('utf-8'))
+                out.write(b'\n')
+                rows += 1
+
+    connections.close_all()
+    return {
+        'model': label,
+        'file': Path(shard_path).name,
+        'rows': rows,
+        'sha256': file_checksum(shard_path),
+        'mode': 'incremental' if incremental else 'full',
+    }
+
+
+def _has_updated_at(model):
+    return any(f.name == 'updated_at' for f in model._meta.concrete_fields)
+
+
+def _is_excluded(model, excludes):
+    return model._meta.app_label in excludes or model._meta.label_lower in excludes
+
+
+class Command(BaseCommand):
+    help = 'Export every model to its own compressed NDJSON shard using parallel workers'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            default='data/exports',
+            help='Directory that receives one timestamped folder per export run',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 2,
+            help='Number of worker processes',
+        )
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='Database alias to export from',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Rows fetched per round trip',
+        )
+        parser.add_argument(
+            '--exclude', '-e',
+            action='append',
+            default=[],
+            help='App label or app_label.model to skip (can be repeated)',
+        )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Only export rows updated since the last export in --output',
+        )
+        parser.add_argument(
+            '--since',
+            help='Only export rows with updated_at on or after this ISO timestamp',
+        )
+
+    def handle(self, *args, **options):
+        output_root = Path(options['output'])
+        excludes = {label.lower() for label in DEFAULT_EXCLUDES + options['exclude']}
+        started_at = timezone.now()
+
+        since = None
+        if options['since']:
+            since = parse_datetime(options['since'])
+            if since is None:
+                raise CommandError(f"Invalid --since timestamp: {options['since']}")
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+        elif options['incremental']:
+            previous = self.find_previous_manifest(output_root)
+            if previous is None:
+                raise CommandError(f'No previous export found in {output_root}; run a full export first')
+            since = parse_datetime(previous['started_at'])
+            self.stdout.write(f"Incremental export since {previous['started_at']}")
+
+        run_dir = output_root / started_at.strftime('%Y%m%dT%H%M%SZ')
+        run_dir.mkdir(parents=True, exist_ok=False)
+
+        models = [
+            model for model in apps.get_models()
+            if model._meta.managed and not model._meta.proxy and not _is_excluded(model, excludes)
+        ]
+
+        self.stdout.write(f'Exporting {len(models)} models with {options["workers"]} workers...')
+
+        # Children get their own connections from the initializer
+        connections.close_all()
+
+        shards = []
+        with ProcessPoolExecutor(max_workers=options['workers'], initializer=_init_worker) as pool:
+            futures = {
+                pool.submit(
+                    export_model,
+                    model._meta.label,
+                    str(run_dir / f'{model._meta.label_lower}.ndjson.gz'),
+                    options['database'],
+                    since,
+                    options['chunk_size'],
+                ): model._meta.label
+                for model in models
+            }
+            for future in as_completed(futures):
+                entry = future.result()
+                shards.append(entry)
+                self.stdout.write(f"  {entry['model']}: {entry['rows']} rows")
+
+        shards.sort(key=lambda entry: entry['model'])
+        manifest = {
+            'version': 1,
+            'started_at': started_at.isoformat(),
+            'finished_at': timezone.now().isoformat(),
+            'database': options['database'],
+            'since': since.isoformat() if since else None,
+            'shards': shards,
+        }
+        with open(run_dir / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+
+        total = sum(entry['rows'] for entry in shards)
+        self.stdout.write(self.style.SUCCESS(f'\nExported {total} rows to {run_dir}'))
+        self.stdout.write(f'Restore with: python manage.py load_export {run_dir}')
+
+    def find_previous_manifest(self, output_root):
+        """Return the manifest of the most recent export run in output_root"""
+        if not output_root.exists():
+            return None
+        for run_dir in sorted(output_root.iterdir(), reverse=True):
+            manifest_path = run_dir / MANIFEST_NAME
+            if manifest_path.exists():
+                with open(manifest_path, encoding='utf-8') as f:
+                    return json.load(f)
+        return None
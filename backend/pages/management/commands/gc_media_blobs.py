@@ -0,0 +1,162 @@
+import os
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models, transaction
+from django.utils import timezone
+
+from pages.models import StoredBlob
+from pages.storage import BLOB_PREFIX, ContentAddressedStorage, upload_storage
+
+
+class Command(BaseCommand):
+    help = (
+        'Recount references to the content-addressed upload blobs (MEDIA_DEDUP) and delete blobs '
+        'no row uses; --adopt first moves files uploaded before dedup into blobs'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--adopt',
+            action='store_true',
+            help='Store existing uploads of the deduplicated fields as blobs and delete the copies',
+        )
+        parser.add_argument(
+            '--min-age-hours',
+            type=float,
+            default=24,
+            help='Keep unreferenced blobs younger than this, as their rows may not be committed yet',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report what would be deleted without deleting it',
+        )
+
+    def handle(self, *args, **options):
+        storage = upload_storage()
+        if not isinstance(storage, ContentAddressedStorage):
+            raise CommandError('MEDIA_DEDUP is off: the uploads storage is not content-addressed')
+        fields = self.dedup_fields(storage)
+        self.stdout.write('Deduplicated fields: ' + ', '.join(f'{model.__name__}.{field}' for model, field in fields))
+
+        started = time.perf_counter()
+        if options['adopt']:
+            self.adopt(storage, fields, options['dry_run'])
+
+        references = Counter()
+        for model, field in fields:
+            references.update(
+                name for name in model.objects.exclude(**{field: ''}).values_list(field, flat=True)
+                if name.startswith(BLOB_PREFIX)
+            )
+
+        # Counts drift as rows are deleted or their files replaced, which Django does not report to storages
+        changed = []
+        for blob in StoredBlob.objects.all():
+            if blob.refcount != references[blob.name]:
+                blob.refcount = references[blob.name]
+                changed.append(blob)
+        if not options['dry_run']:
+            StoredBlob.objects.bulk_update(changed, ['refcount'], batch_size=500)
+
+        cutoff = timezone.now() - timedelta(hours=options['min_age_hours'])
+        unused = StoredBlob.objects.filter(updated_at__lt=cutoff)
+        if options['dry_run']:
+            # Counts were not corrected, so go by the references found
+            unused = unused.exclude(name__in=references)
+        else:
+            unused = unused.filter(refcount=0)
+        deleted, freed = 0, 0
+        for pk in list(unused.values_list('pk', flat=True)):
+            if options['dry_run']:
+                freed += self.delete_file(storage, StoredBlob.objects.get(pk=pk).name, dry_run=True)
+                deleted += 1
+                continue
+            with transaction.atomic():
+                # Checked again under the row lock: an upload of the same content since the counts were
+                # corrected has raised refcount and updated_at, and add_reference() waits for this to finish
+                blob = StoredBlob.objects.select_for_update().filter(
+                    pk=pk, refcount=0, updated_at__lt=cutoff,
+                ).first()
+                if blob is None:
+                    continue
+                freed += self.delete_file(storage, blob.name, dry_run=False)
+                blob.delete()
+            deleted += 1
+
+        # Files without a StoredBlob row, e.g. from an upload that failed, and temporary files
+        root = storage.path(BLOB_PREFIX)
+        for directory, _dirs, files in os.walk(root):
+            for filename in files:
+                path = os.path.join(directory, filename)
+                name = os.path.relpath(path, storage.location).replace(os.sep, '/')
+                if name in references or os.path.getmtime(path) >= cutoff.timestamp():
+                    continue
+                if StoredBlob.objects.filter(name=name).exists():
+                    continue
+                freed += self.delete_file(storage, name, options['dry_run'])
+                deleted += 1
+
+        blobs = StoredBlob.objects.filter(name__in=references)
+        stored = sum(blob.size for blob in blobs)
+        saved = sum(blob.size * (references[blob.name] - 1) for blob in blobs)
+        verb = 'Would delete' if options['dry_run'] else 'Deleted'
+        self.stdout.write(
+            f'{len(references)} blobs ({stored / 1024 / 1024:.1f} MB) hold {sum(references.values())} references, '
+            f'saving {saved / 1024 / 1024:.1f} MB; {len(changed)} counts corrected'
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {deleted} unused blobs ({freed / 1024 / 1024:.1f} MB) in {time.perf_counter() - started:.1f} s'
+        ))
+
+    def dedup_fields(self, storage):
+        """(model, field name) of every file field stored in the uploads storage"""
+        return [
+            (model, field.name)
+            for model in apps.get_models()
+            for field in model._meta.concrete_fields
+            if isinstance(field, models.FileField) and field.storage is storage
+        ]
+
+    def adopt(self, storage, fields, dry_run):
+        """Re-store files saved under their upload_to names as blobs and point their rows at them"""
+        adopted = {}
+        missing = 0
+        for model, field in fields:
+            rows = model.objects.exclude(**{field: ''}).exclude(**{f'{field}__startswith': BLOB_PREFIX})
+            for pk, name in rows.values_list('pk', field).iterator():
+                if not storage.exists(name):
+                    missing += 1
+                    continue
+                if dry_run:
+                    adopted[name] = name
+                    continue
+                if name not in adopted:
+                    with storage.open(name, 'rb') as f:
+                        adopted[name] = storage.save(name, f)
+                else:
+                    storage.add_reference(adopted[name], storage.size(adopted[name]))
+                model.objects.filter(pk=pk).update(**{field: adopted[name]})
+
+        freed = 0
+        if not dry_run:
+            for name in adopted:
+                freed += self.delete_file(storage, name, dry_run)
+        self.stdout.write(f'Adopted {len(adopted)} files, {freed / 1024 / 1024:.1f} MB of copies removed')
+        if missing:
+            self.stdout.write(self.style.WARNING(f'{missing} rows point at files missing from storage'))
+
+    def delete_file(self, storage, name, dry_run):
+        """Delete a file from disk, bypassing the reference counting of storage.delete(); returns its size"""
+        path = storage.path(name)
+        try:
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            return 0
+        if not dry_run:
+            os.unlink(path)
+        return size
@@ -0,0 +1,607 @@
+import random
+import time
+from datetime import date, time as datetime_time, timedelta
+from decimal import Decimal
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from events.models import Event, EventAttendance
+from forum.models import ForumCategory, ForumComment, ForumPost
+from jobs.models import JobAdvertisement, TenderAdvertisement, Training
+from members.models import MemberOrganization, MembershipApplication, MembershipPayment, OrganizationContact, StaffMember
+from operational.models import County, OperationalPresence, Sector, State
+from pages.models import Announcement, ContactMessage, ModerationQueue, Page
+from resources.models import FAQ, FAQCategory, Resource, ResourceCategory
+from security.models import AccessConstraint, SecurityIncident
+
+
+# Rows per model for each preset; "large" is the size the portal should handle
+PRESETS = {
+    'small': {
+        'organizations': 500, 'users': 50, 'contacts': 1000, 'payments': 1000, 'applications': 200,
+        'staff': 20, 'presence': 10000, 'events': 1000, 'attendance': 5000, 'resources': 1000,
+        'faqs': 100, 'posts': 2000, 'comments': 10000, 'jobs': 2000, 'trainings': 500, 'tenders': 1000,
+        'incidents': 1000, 'constraints': 500, 'pages': 20, 'messages': 500, 'announcements': 50,
+    },
+    'medium': {
+        'organizations': 5000, 'users': 500, 'contacts': 10000, 'payments': 10000, 'applications': 2000,
+        'staff': 50, 'presence': 200000, 'events': 5000, 'attendance': 50000, 'resources': 5000,
+        'faqs': 300, 'posts': 10000, 'comments': 100000, 'jobs': 10000, 'trainings': 2000, 'tenders': 5000,
+        'incidents': 10000, 'constraints': 5000, 'pages': 50, 'messages': 5000, 'announcements': 200,
+    },
+    'large': {
+        'organizations': 20000, 'users': 2000, 'contacts': 40000, 'payments': 40000, 'applications': 5000,
+        'staff': 100, 'presence': 1000000, 'events': 20000, 'attendance': 200000, 'resources': 20000,
+        'faqs': 1000, 'posts': 50000, 'comments': 500000, 'jobs': 50000, 'trainings': 10000, 'tenders': 20000,
+        'incidents': 50000, 'constraints': 20000, 'pages': 100, 'messages': 20000, 'announcements': 500,
+    },
+}
+
+# Generated rows are recognisable so --clear can remove them again
+PREFIX = 'gen'
+EMAIL_DOMAIN = 'generated.example.org'
+CITIES = ['Juba', 'Wau', 'Malakal', 'Bor', 'Yambio', 'Torit', 'Rumbek', 'Aweil', 'Bentiu', 'Kuajok']
+WORDS = (
+    'humanitarian coordination access protection nutrition health education shelter water sanitation '
+    'hygiene livelihoods food security response assessment community training partners funding report '
+    'cluster emergency displacement recovery resilience monitoring evaluation logistics safety'
+).split()
+
+
+class Command(BaseCommand):
+    help = 'Fill every model with seeded synthetic data at scale (e.g. --preset large for 1M 3W rows)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--preset',
+            choices=sorted(PRESETS),
+            default='small',
+            help='Base row counts per model',
+        )
+        for name in PRESETS['small']:
+            parser.add_argument(
+                f'--{name}',
+                type=int,
+                help=f'Override the number of {name} rows',
+            )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Random seed; the same seed and sizes give the same data',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=2000,
+            help='Rows per INSERT',
+        )
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Delete previously generated rows before generating',
+        )
+        parser.add_argument(
+            '--clear-only',
+            action='store_true',
+            help='Only delete previously generated rows',
+        )
+
+    def handle(self, *args, **options):
+        self.sizes = {
+            name: options[name] if options[name] is not None else count
+            for name, count in PRESETS[options['preset']].items()
+        }
+        self.batch_size = options['batch_size']
+        self.rng = random.Random(options['seed'])
+        self.today = date.today()
+        self.now = timezone.now()
+
+        if options['clear'] or options['clear_only']:
+            self.clear()
+            if options['clear_only']:
+                return
+        if MemberOrganization.objects.filter(slug__startswith=f'{PREFIX}-').exists():
+            raise CommandError('Generated data already exists; run again with --clear')
+
+        if not State.objects.exists():
+            call_command('create_locations', stdout=self.stdout)
+        if not Sector.objects.exists():
+            call_command('create_sectors', stdout=self.stdout)
+
+        started = time.perf_counter()
+        with transaction.atomic():
+            self.generate_members()
+            self.generate_presence()
+            self.generate_events()
+            self.generate_resources()
+            self.generate_forum()
+            self.generate_jobs()
+            self.generate_security()
+            self.generate_pages()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'\nGenerated data in {time.perf_counter() - started:.1f}s (seed {options["seed"]})'
+        ))
+
+    # Helpers
+
+    def insert(self, model, objects, total):
+        """bulk_create a generator of unsaved objects in batches"""
+        started = time.perf_counter()
+        objects = iter(objects)
+        created = 0
+        while True:
+            batch = list(islice(objects, self.batch_size))
+            if not batch:
+                break
+            model.objects.bulk_create(batch, batch_size=self.batch_size)
+            created += len(batch)
+            if total >= 50000:
+                self.stdout.write(f'    {created:,}/{total:,}', ending='\r')
+        elapsed = time.perf_counter() - started
+        rate = created / elapsed if elapsed else 0
+        self.stdout.write(f'  {model._meta.verbose_name_plural}: {created:,} rows ({rate:,.0f} rows/s)')
+        return created
+
+    def ids(self, queryset):
+        return list(queryset.order_by('pk').values_list('pk', flat=True))
+
+    def text(self, words):
+        return ' '.join(self.rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+    def title(self, words=5):
+        return ' '.join(self.rng.choice(WORDS) for _ in range(words)).title()
+
+    def email(self, kind, i):
+        return f'{PREFIX}-{kind}{i}@{EMAIL_DOMAIN}'
+
+    def phone(self):
+        return f'+211-{self.rng.randint(900, 999)}-{self.rng.randint(100000, 999999)}'
+
+    def day(self, back, ahead=0):
+        return self.today + timedelta(days=self.rng.randint(-back, ahead))
+
+    def moment(self, back, ahead=0):
+        return self.now + timedelta(minutes=self.rng.randint(-back * 1440, ahead * 1440))
+
+    # Generators
+
+    def generate_members(self):
+        self.stdout.write('Members')
+        sizes = self.sizes
+        states = list(State.objects.values_list('name', flat=True))
+        self.insert(MemberOrganization, (
+            MemberOrganization(
+                name=f'{self.title(3)} Organization {i}',
+                slug=f'{PREFIX}-org-{i}',
+                member_type=self.rng.choice(['NATIONAL', 'INTERNATIONAL']),
+                rrc_number=f'RRC-{PREFIX}-{i}',
+                email=self.email('org', i),
+                phone=self.phone(),
+                website=f'https://{PREFIX}-org-{i}.example.org',
+                address=f'{self.rng.randint(1, 500)} Main Street',
+                city=self.rng.choice(CITIES),
+                state=self.rng.choice(states),
+                description=self.text(40),
+                logo=f'logos/{PREFIX}-org-{i}.png' if i % 3 else '',
+                status=self.rng.choices(['ACTIVE', 'PENDING', 'INACTIVE', 'SUSPENDED'], [85, 5, 8, 2])[0],
+                is_verified=self.rng.random() < 0.8,
+                auto_approve_content=self.rng.random() < 0.2,
+                membership_fee_paid=self.rng.random() < 0.7,
+                membership_expiry_date=self.day(60, 365),
+            )
+            for i in range(sizes['organizations'])
+        ), sizes['organizations'])
+        self.organization_ids = self.ids(MemberOrganization.objects.filter(slug__startswith=f'{PREFIX}-'))
+
+        # Users are linked to the first organizations; password is "password123"
+        password = make_password('password123')
+        user_count = min(sizes['users'], len(self.organization_ids))
+        self.insert(User, (
+            User(username=f'{PREFIX}-user-{i}', email=self.email('user', i), password=password)
+            for i in range(user_count)
+        ), user_count)
+        user_ids = self.ids(User.objects.filter(username__startswith=f'{PREFIX}-user-'))
+        # Staff account for the moderator load test scenario
+        User.objects.create(username=f'{PREFIX}-moderator', email=self.email('moderator', 0), password=password, is_staff=True)
+        MemberOrganization.objects.bulk_update(
+            [MemberOrganization(pk=org_id, user_id=user_id) for org_id, user_id in zip(self.organization_ids, user_ids)],
+            ['user'],
+            batch_size=self.batch_size,
+        )
+
+        self.insert(OrganizationContact, (
+            OrganizationContact(
+                organization_id=self.rng.choice(self.organization_ids),
+                name=self.title(2),
+                title=self.rng.choice(['Country Director', 'Programme Manager', 'Finance Officer']),
+                email=self.email('contact', i),
+                phone=self.phone(),
+                is_primary=i % 2 == 0,
+            )
+            for i in range(sizes['contacts'])
+        ), sizes['contacts'])
+        self.insert(MembershipPayment, (
+            MembershipPayment(
+                organization_id=self.rng.choice(self.organization_ids),
+                amount=Decimal(self.rng.choice(['250.00', '500.00', '1000.00'])),
+                payment_date=self.day(730),
+                transaction_reference=f'{PREFIX.upper()}-{i:08d}',
+                payment_method=self.rng.choice(['Bank Transfer', 'Mobile Money', 'Cash']),
+                status=self.rng.choices(['COMPLETED', 'PENDING', 'FAILED'], [85, 10, 5])[0],
+            )
+            for i in range(sizes['payments'])
+        ), sizes['payments'])
+        self.insert(MembershipApplication, (
+            MembershipApplication(
+                organization_name=f'{self.title(3)} Applicant {i}',
+                organization_type=self.rng.choice(['NATIONAL', 'INTERNATIONAL']),
+                rrc_registration=f'RRC-{PREFIX}-APP-{i}',
+                rrc_certificate=f'applications/{PREFIX}-{i}.pdf',
+                address=f'{self.rng.randint(1, 500)} Market Road',
+                email=self.email('application', i),
+                phone=self.phone(),
+                focal_person_name=self.title(2),
+                focal_person_title='Director',
+                focal_person_email=self.email('focal', i),
+                focal_person_phone=self.phone(),
+                areas_of_work=self.text(15),
+                operational_counties=', '.join(self.rng.sample(CITIES, 3)),
+                application_status=self.rng.choice(['PENDING', 'UNDER_REVIEW', 'APPROVED', 'REJECTED']),
+            )
+            for i in range(sizes['applications'])
+        ), sizes['applications'])
+        self.insert(StaffMember, (
+            StaffMember(
+                name=self.title(2),
+                position=self.rng.choice(['Director', 'Coordinator', 'Officer', 'Assistant']),
+                email=self.email('staff', i),
+                bio=self.text(30),
+                order=i,
+            )
+            for i in range(sizes['staff'])
+        ), sizes['staff'])
+
+    def generate_presence(self):
+        self.stdout.write('3W operational presence')
+        county_ids = list(County.objects.values_list('pk', flat=True))
+        sector_ids = list(Sector.objects.values_list('pk', flat=True))
+        years = list(range(self.today.year - 4, self.today.year + 1))
+        # Every (county, sector, year) combination, picked without repeats per organization
+        combinations = [(c, s, y) for c in county_ids for s in sector_ids for y in years]
+        total = min(self.sizes['presence'], len(combinations) * len(self.organization_ids))
+        per_org, extra = divmod(total, len(self.organization_ids))
+
+        def rows():
+            for index, org_id in enumerate(self.organization_ids):
+                count = per_org + (1 if index < extra else 0)
+                for county_id, sector_id, year in self.rng.sample(combinations, count):
+                    yield OperationalPresence(
+                        organization_id=org_id,
+                        county_id=county_id,
+                        sector_id=sector_id,
+                        year=year,
+                        presence_count=self.rng.randint(1, 5),
+                        is_active=self.rng.random() < 0.9,
+                    )
+
+        self.insert(OperationalPresence, rows(), total)
+
+    def generate_events(self):
+        self.stdout.write('Events')
+        sizes = self.sizes
+        self.insert(Event, (
+            Event(
+                title=f'{self.title(4)} {i}',
+                slug=f'{PREFIX}-event-{i}',
+                theme=self.title(3),
+                description=self.text(80),
+                event_date=self.day(365, 180),
+                event_time=datetime_time(self.rng.randint(8, 16)),
+                location=self.rng.choice(CITIES),
+                venue='Conference Hall',
+                event_type=self.rng.choice(['CONFERENCE', 'WORKSHOP', 'TRAINING', 'MEETING', 'WEBINAR']),
+                registration_required=i % 4 == 0,
+                created_by_id=self.rng.choice(self.organization_ids) if i % 5 else None,
+                is_approved=self.rng.random() < 0.9,
+            )
+            for i in range(sizes['events'])
+        ), sizes['events'])
+        self.event_ids = self.ids(Event.objects.filter(slug__startswith=f'{PREFIX}-'))
+        self.insert(EventAttendance, (
+            EventAttendance(
+                event_id=self.event_ids[i % len(self.event_ids)],
+                organization_id=self.rng.choice(self.organization_ids),
+                attendee_name=self.title(2),
+                # Unique per event because i is
+                attendee_email=self.email('attendee', i),
+                attended=self.rng.random() < 0.6,
+            )
+            for i in range(sizes['attendance'])
+        ), sizes['attendance'])
+
+    def generate_resources(self):
+        self.stdout.write('Resources')
+        sizes = self.sizes
+        categories = [
+            ResourceCategory(name=f'{name} ({PREFIX})', slug=f'{PREFIX}-{name.lower()}', order=i)
+            for i, name in enumerate(['Reports', 'Guidelines', 'Policies', 'Maps', 'Assessments', 'Tools'])
+        ]
+        ResourceCategory.objects.bulk_create(categories)
+        category_ids = self.ids(ResourceCategory.objects.filter(slug__startswith=f'{PREFIX}-'))
+        self.insert(Resource, (
+            Resource(
+                title=f'{self.title(5)} {i}',
+                slug=f'{PREFIX}-resource-{i}',
+                description=self.text(60),
+                category_id=self.rng.choice(category_ids),
+                resource_type=self.rng.choice(['DOCUMENT', 'TOOL', 'LINK', 'FORM', 'GUIDELINE']),
+                file=f'resources/{PREFIX}-{i}.pdf' if i % 4 else '',
+                external_url='' if i % 4 else f'https://{PREFIX}.example.org/resources/{i}',
+                is_featured=i % 50 == 0,
+                published_date=self.day(1000),
+                uploaded_by_id=self.rng.choice(self.organization_ids) if i % 3 else None,
+                is_approved=self.rng.random() < 0.9,
+                download_count=self.rng.randint(0, 5000),
+            )
+            for i in range(sizes['resources'])
+        ), sizes['resources'])
+
+        FAQCategory.objects.bulk_create([
+            FAQCategory(name=f'{name} ({PREFIX})', slug=f'{PREFIX}-{name.lower()}', order=i)
+            for i, name in enumerate(['Membership', 'Security', 'Reporting', 'Events'])
+        ])
+        faq_category_ids = self.ids(FAQCategory.objects.filter(slug__startswith=f'{PREFIX}-'))
+        self.insert(FAQ, (
+            FAQ(
+                question=f'{PREFIX}: {self.text(10)[:-1]}?',
+                answer=self.text(60),
+                category_id=self.rng.choice(faq_category_ids),
+                order=i,
+                view_count=self.rng.randint(0, 2000),
+            )
+            for i in range(sizes['faqs'])
+        ), sizes['faqs'])
+
+    def generate_forum(self):
+        self.stdout.write('Forum')
+        sizes = self.sizes
+        ForumCategory.objects.bulk_create([
+            ForumCategory(name=f'{name} ({PREFIX})', slug=f'{PREFIX}-{name.lower()}', order=i)
+            for i, name in enumerate(['General', 'Coordination', 'Security', 'Funding', 'Jobs'])
+        ])
+        category_ids = self.ids(ForumCategory.objects.filter(slug__startswith=f'{PREFIX}-'))
+        self.insert(ForumPost, (
+            ForumPost(
+                author_id=self.rng.choice(self.organization_ids),
+                title=f'{self.title(6)} {i}',
+                slug=f'{PREFIX}-post-{i}',
+                content=self.text(120),
+                category_id=self.rng.choice(category_ids),
+                status=self.rng.choices(['APPROVED', 'PENDING', 'REJECTED'], [85, 10, 5])[0],
+                is_pinned=i % 200 == 0,
+                view_count=self.rng.randint(0, 3000),
+            )
+            for i in range(sizes['posts'])
+        ), sizes['posts'])
+        post_ids = self.ids(ForumPost.objects.filter(slug__startswith=f'{PREFIX}-'))
+
+        # Comments get explicit ids so their materialized paths can be computed up front
+        first_id = (ForumComment.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+
+        def rows():
+            # Threads per post: a third of the comments are replies to an earlier comment
+            threads = {}
+            for offset in range(sizes['comments']):
+                comment_id = first_id + offset
+                post_id = self.rng.choice(post_ids)
+                thread = threads.setdefault(post_id, [])
+                parent_id, parent_path = None, ''
+                if thread and self.rng.random() < 0.33:
+                    parent_id, parent_path = self.rng.choice(thread[-20:])
+                path = parent_path + ForumComment.path_step(comment_id)
+                if path.count('/') < 8:
+                    thread.append((comment_id, path))
+                yield ForumComment(
+                    id=comment_id,
+                    post_id=post_id,
+                    author_id=self.rng.choice(self.organization_ids),
+                    content=self.text(40),
+                    status=self.rng.choices(['APPROVED', 'PENDING', 'REJECTED'], [85, 10, 5])[0],
+                    parent_id=parent_id,
+                    path=path,
+                )
+
+        self.insert(ForumComment, rows(), sizes['comments'])
+        self.reset_sequences(ForumComment)
+
+        # Pending posts waiting in the moderation queue
+        post_type = ContentType.objects.get_for_model(ForumPost)
+        pending = ForumPost.objects.filter(slug__startswith=f'{PREFIX}-', status='PENDING').values_list('pk', 'author_id')
+        self.insert(ModerationQueue, (
+            ModerationQueue(content_type=post_type, object_id=post_id, submitted_by_id=author_id)
+            for post_id, author_id in pending.iterator()
+        ), pending.count())
+
+    def generate_jobs(self):
+        self.stdout.write('Jobs, trainings and tenders')
+        sizes = self.sizes
+        self.insert(JobAdvertisement, (
+            JobAdvertisement(
+                organization_id=self.rng.choice(self.organization_ids),
+                job_title=f'{self.title(3)} Officer {i}',
+                location=self.rng.choice(CITIES),
+                job_type=self.rng.choice(['FULL_TIME', 'PART_TIME', 'CONTRACT', 'CONSULTANT']),
+                description=self.text(150),
+                requirements=self.text(40),
+                application_deadline=self.day(60, 60),
+                application_email=self.email('jobs', i),
+                salary_range='Competitive' if i % 2 else '',
+                is_active=self.rng.random() < 0.9,
+                is_approved=self.rng.random() < 0.9,
+                view_count=self.rng.randint(0, 3000),
+            )
+            for i in range(sizes['jobs'])
+        ), sizes['jobs'])
+        def trainings():
+            for i in range(sizes['trainings']):
+                start_date = self.day(180, 180)
+                yield Training(
+                    title=f'{self.title(4)} Training {i}',
+                    provider=self.title(2),
+                    description=self.text(80),
+                    start_date=start_date,
+                    end_date=start_date + timedelta(days=self.rng.randint(1, 10)),
+                    location=self.rng.choice(CITIES),
+                    is_online=i % 4 == 0,
+                    is_free=i % 3 == 0,
+                    contact_email=self.email('training', i),
+                    submitted_by_id=self.rng.choice(self.organization_ids) if i % 2 else None,
+                    is_active=self.rng.random() < 0.9,
+                    is_approved=self.rng.random() < 0.9,
+                )
+
+        self.insert(Training, trainings(), sizes['trainings'])
+        self.insert(TenderAdvertisement, (
+            TenderAdvertisement(
+                organization_id=self.rng.choice(self.organization_ids),
+                title=f'{self.title(4)} Tender {i}',
+                reference_number=f'{PREFIX.upper()}-TENDER-{i:08d}',
+                description=self.text(100),
+                category=self.rng.choice(['Construction', 'Supplies', 'Services', 'Consultancy']),
+                submission_deadline=self.moment(60, 60),
+                contact_person=self.title(2),
+                contact_email=self.email('tenders', i),
+                is_active=self.rng.random() < 0.9,
+                is_approved=self.rng.random() < 0.9,
+            )
+            for i in range(sizes['tenders'])
+        ), sizes['tenders'])
+
+    def generate_security(self):
+        self.stdout.write('Security')
+        sizes = self.sizes
+        counties = list(County.objects.values_list('pk', 'state_id'))
+        severities = ['LOW', 'MEDIUM', 'HIGH', 'CRITICAL']
+
+        def incidents():
+            for i in range(sizes['incidents']):
+                county_id, state_id = self.rng.choice(counties)
+                yield SecurityIncident(
+                    organization_id=self.rng.choice(self.organization_ids) if i % 4 else None,
+                    reporter_name=self.title(2),
+                    reporter_email=self.email('incident', i),
+                    reporter_phone=self.phone(),
+                    who=self.text(6),
+                    where_state_id=state_id,
+                    where_county_id=county_id,
+                    where_location=self.rng.choice(CITIES),
+                    when_date=self.day(730),
+                    what_happened=self.text(60),
+                    what_you_did=self.text(20),
+                    what_you_need=self.text(20),
+                    incident_type=self.rng.choice(['Armed robbery', 'Checkpoint', 'Harassment', 'Looting']),
+                    severity=self.rng.choices(severities, [40, 35, 20, 5])[0],
+                    status=self.rng.choice(['REPORTED', 'INVESTIGATING', 'RESOLVED', 'CLOSED']),
+                    is_confidential=i % 10 == 0,
+                )
+
+        self.insert(SecurityIncident, incidents(), sizes['incidents'])
+        self.insert(AccessConstraint, (
+            AccessConstraint(
+                organization_id=self.rng.choice(self.organization_ids) if i % 4 else None,
+                reporter_name=self.title(2),
+                reporter_email=self.email('constraint', i),
+                location=self.rng.choice(CITIES),
+                county_id=self.rng.choice(counties)[0],
+                constraint_type=self.rng.choice(['BUREAUCRATIC', 'PHYSICAL', 'SECURITY', 'POLITICAL', 'OTHER']),
+                description=self.text(50),
+                date_reported=self.day(730),
+                status=self.rng.choice(['ACTIVE', 'RESOLVED', 'MONITORING']),
+            )
+            for i in range(sizes['constraints'])
+        ), sizes['constraints'])
+
+    def generate_pages(self):
+        self.stdout.write('Pages')
+        sizes = self.sizes
+        self.insert(Page, (
+            Page(title=f'{self.title(3)} {i}', slug=f'{PREFIX}-page-{i}', content=self.text(300), order=i)
+            for i in range(sizes['pages'])
+        ), sizes['pages'])
+        self.insert(ContactMessage, (
+            ContactMessage(
+                name=self.title(2),
+                email=self.email('message', i),
+                subject=self.title(5),
+                message=self.text(50),
+                organization_id=self.rng.choice(self.organization_ids) if i % 2 else None,
+                status=self.rng.choice(['NEW', 'READ', 'REPLIED', 'ARCHIVED']),
+            )
+            for i in range(sizes['messages'])
+        ), sizes['messages'])
+        self.insert(Announcement, (
+            Announcement(
+                title=f'{PREFIX}: {self.title(5)}',
+                content=self.text(80),
+                priority=self.rng.choice(['LOW', 'MEDIUM', 'HIGH', 'URGENT']),
+                publish_date=self.moment(365),
+                expiry_date=self.moment(0, 365) if i % 2 else None,
+            )
+            for i in range(sizes['announcements'])
+        ), sizes['announcements'])
+
+    def reset_sequences(self, *models):
+        """Move database sequences past explicitly assigned ids (PostgreSQL)"""
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
+    def clear(self):
+        self.stdout.write('Deleting generated data...')
+        prefix = f'{PREFIX}-'
+        email_suffix = f'@{EMAIL_DOMAIN}'
+        with transaction.atomic():
+            # The largest tables are deleted with plain DELETEs; cascading through
+            # the ORM would load every comment and 3W row into memory first
+            comments = ForumComment.objects.filter(post__slug__startswith=prefix)
+            comments.update(parent=None)
+            self.stdout.write(f'  forum comments: {comments._raw_delete(comments.db):,} rows')
+            presence = OperationalPresence.objects.filter(organization__slug__startswith=prefix)
+            self.stdout.write(f'  3W rows: {presence._raw_delete(presence.db):,} rows')
+
+            # Organizations cascade to contacts, payments, 3W rows, posts, comments, jobs, tenders and queue items
+            querysets = [
+                MemberOrganization.objects.filter(slug__startswith=prefix),
+                User.objects.filter(username__startswith=f'{PREFIX}-'),
+                MembershipApplication.objects.filter(email__endswith=email_suffix),
+                StaffMember.objects.filter(email__endswith=email_suffix),
+                Event.objects.filter(slug__startswith=prefix),
+                Resource.objects.filter(slug__startswith=prefix),
+                ResourceCategory.objects.filter(slug__startswith=prefix),
+                FAQ.objects.filter(question__startswith=f'{PREFIX}: '),
+                FAQCategory.objects.filter(slug__startswith=prefix),
+                ForumCategory.objects.filter(slug__startswith=prefix),
+                Training.objects.filter(contact_email__endswith=email_suffix),
+                SecurityIncident.objects.filter(reporter_email__endswith=email_suffix),
+                AccessConstraint.objects.filter(reporter_email__endswith=email_suffix),
+                Page.objects.filter(slug__startswith=prefix),
+                ContactMessage.objects.filter(email__endswith=email_suffix),
+                Announcement.objects.filter(title__startswith=f'{PREFIX}: '),
+            ]
+            for queryset in querysets:
+                deleted, _ = queryset.delete()
+                if deleted:
+                    self.stdout.write(f'  {queryset.model._meta.verbose_name_plural}: {deleted:,} rows (with cascades)')
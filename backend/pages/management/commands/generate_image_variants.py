@@ -0,0 +1,96 @@
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from pages.images import IMAGE_FIELDS, generate_variants
+from pages.models import ImageVariant
+
+
+class Command(BaseCommand):
+    help = 'Generate the WebP/JPEG variants of existing logos, photos and images, and optionally prune unused ones'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--field',
+            action='append',
+            default=[],
+            help='Only this model field, e.g. members.MemberOrganization.logo (can be repeated)',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Regenerate variants that already exist, e.g. after changing IMAGE_VARIANT_WIDTHS',
+        )
+        parser.add_argument(
+            '--prune',
+            action='store_true',
+            help='Delete variants of images no longer in use and variant files no longer referenced',
+        )
+
+    def handle(self, *args, **options):
+        fields = IMAGE_FIELDS
+        if options['field']:
+            known = {f'{label}.{field}': (label, field) for label, field in IMAGE_FIELDS}
+            unknown = set(options['field']) - set(known)
+            if unknown:
+                raise CommandError(f"Unknown field(s) {', '.join(sorted(unknown))}; choose from {', '.join(known)}")
+            fields = [known[name] for name in options['field']]
+
+        started = time.perf_counter()
+        images = written = missing = failed = 0
+        for label, field in fields:
+            names = self.image_names(label, field)
+            done = set() if options['force'] else set(
+                ImageVariant.objects.filter(source__in=names).values_list('source', flat=True).distinct()
+            )
+            todo = sorted(names - done)
+            self.stdout.write(f'{label}.{field}: {len(names)} images, {len(todo)} without variants')
+            for name in todo:
+                try:
+                    written += generate_variants(name, force=options['force'])
+                    images += 1
+                except FileNotFoundError:
+                    missing += 1
+                except Exception as exc:
+                    failed += 1
+                    self.stdout.write(self.style.WARNING(f'  {name}: {exc}'))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated variants of {images} images ({written} files written) '
+            f'in {time.perf_counter() - started:.1f} s'
+        ))
+        if missing:
+            self.stdout.write(self.style.WARNING(f'{missing} images are missing from storage'))
+        if failed:
+            self.stdout.write(self.style.WARNING(f'{failed} images could not be read'))
+
+        if options['prune']:
+            self.prune()
+
+    def image_names(self, label, field):
+        model = apps.get_model(label)
+        return set(model.objects.exclude(**{field: ''}).values_list(field, flat=True).distinct())
+
+    def prune(self):
+        in_use = set()
+        for label, field in IMAGE_FIELDS:
+            in_use |= self.image_names(label, field)
+        stale = [pk for pk, source in ImageVariant.objects.values_list('pk', 'source') if source not in in_use]
+        ImageVariant.objects.filter(pk__in=stale).delete()
+
+        # Variant files are shared by identical originals, so only delete those no row points at
+        storage = ImageVariant._meta.get_field('file').storage
+        referenced = set(ImageVariant.objects.values_list('file', flat=True))
+        deleted = 0
+        try:
+            directories, _files = storage.listdir('variants')
+        except FileNotFoundError:
+            directories = []
+        for directory in directories:
+            for name in storage.listdir(f'variants/{directory}')[1]:
+                path = f'variants/{directory}/{name}'
+                if path not in referenced:
+                    storage.delete(path)
+                    deleted += 1
+        self.stdout.write(self.style.SUCCESS(f'Pruned {len(stale)} variant rows and {deleted} files'))
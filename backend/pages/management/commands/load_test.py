@@ -0,0 +1,159 @@
+import asyncio
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from ngo.loadtest.runner import compare, run_load_test
+from ngo.loadtest.scenarios import SCENARIOS
+
+
+BASELINE_PATH = settings.BASE_DIR / 'ngo' / 'loadtest' / 'baseline.json'
+
+
+class Command(BaseCommand):
+    help = 'Replay portal traffic (anonymous, member and moderator scenarios) against a running server'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--base-url',
+            default='http://localhost:8000',
+            help='Server to load (without /api)',
+        )
+        parser.add_argument(
+            '--users',
+            default='anonymous=20,member=5,moderator=1',
+            help='Virtual users per scenario, e.g. anonymous=50,member=10',
+        )
+        parser.add_argument(
+            '--duration',
+            type=float,
+            default=60,
+            help='Seconds to run after ramp-up',
+        )
+        parser.add_argument(
+            '--ramp-up',
+            type=float,
+            default=5,
+            help='Seconds over which virtual users are started',
+        )
+        parser.add_argument(
+            '--think-time',
+            type=float,
+            default=1.0,
+            help='Mean pause between page views in seconds',
+        )
+        parser.add_argument(
+            '--member',
+            action='append',
+            default=[],
+            help='username:password for member users (can be repeated); defaults to generate_data users',
+        )
+        parser.add_argument(
+            '--moderator',
+            action='append',
+            default=[],
+            help='username:password for staff users (can be repeated); defaults to the generate_data moderator',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Random seed for page choice and think time',
+        )
+        parser.add_argument(
+            '--output',
+            help='Write the results to this JSON file',
+        )
+        parser.add_argument(
+            '--compare',
+            nargs='?',
+            const=str(BASELINE_PATH),
+            help='Baseline JSON to compare against (defaults to the bundled baseline)',
+        )
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=25.0,
+            help='Percent change in p95 or throughput that counts as a regression',
+        )
+
+    def handle(self, *args, **options):
+        users = self.parse_users(options['users'])
+        credentials = {
+            'member': self.parse_credentials(options['member']) or [
+                (f'gen-user-{i}', 'password123') for i in range(max(users.get('member', 0), 1))
+            ],
+            'moderator': self.parse_credentials(options['moderator']) or [('gen-moderator', 'password123')],
+        }
+
+        self.stdout.write(
+            f"Loading {options['base_url']} for {options['duration']:.0f}s with "
+            + ', '.join(f'{count} {name}' for name, count in users.items())
+        )
+        try:
+            results = asyncio.run(run_load_test(
+                options['base_url'], users, options['duration'], credentials,
+                think_time=options['think_time'], ramp_up=options['ramp_up'], seed=options['seed'],
+            ))
+        except RuntimeError as exc:
+            raise CommandError(str(exc))
+
+        self.report(results)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump({
+                    'created': timezone.now().isoformat(),
+                    'users': users,
+                    'duration': options['duration'],
+                    'think_time': options['think_time'],
+                    'scenarios': results,
+                }, f, indent=2)
+            self.stdout.write(f"\nResults written to {options['output']}")
+
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as f:
+                baseline = json.load(f)
+            if baseline.get('users') != users:
+                self.stdout.write(self.style.WARNING(f"Baseline used different users: {baseline.get('users')}"))
+            regressions = compare(baseline['scenarios'], results, options['threshold'])
+            for regression in regressions:
+                self.stdout.write(self.style.ERROR(regression))
+            if regressions:
+                raise CommandError(f'{len(regressions)} regression(s) against {options["compare"]}')
+            self.stdout.write(self.style.SUCCESS('No regressions against the baseline'))
+
+    def parse_users(self, value):
+        users = {}
+        for part in value.split(','):
+            name, _, count = part.partition('=')
+            name = name.strip()
+            if name not in SCENARIOS or not count.strip().isdigit():
+                raise CommandError(f'Invalid --users entry "{part}"; scenarios are {", ".join(SCENARIOS)}')
+            if int(count):
+                users[name] = int(count)
+        return users
+
+    def parse_credentials(self, values):
+        credentials = []
+        for value in values:
+            username, sep, password = value.partition(':')
+            if not sep:
+                raise CommandError(f'Credentials must be username:password, got "{value}"')
+            credentials.append((username, password))
+        return credentials
+
+    def report(self, results):
+        for scenario, stats in results.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"\n{scenario}: {stats['requests']:,} requests, {stats['throughput_rps']} req/s, "
+                f"{stats['errors']} errors, p50 {stats['p50_ms']} ms, p95 {stats['p95_ms']} ms, "
+                f"p99 {stats['p99_ms']} ms"
+            ))
+            self.stdout.write(f"  {'Endpoint':<50} {'Requests':>8} {'Errors':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+            for label, endpoint in stats['endpoints'].items():
+                self.stdout.write(
+                    f"  {label[:50]:<50} {endpoint['requests']:>8} {endpoint['errors']:>6} "
+                    f"{endpoint['p50_ms']:>8.1f} {endpoint['p95_ms']:>8.1f} {endpoint['p99_ms']:>8.1f}"
+                )
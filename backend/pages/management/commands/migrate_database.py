@@ -0,0 +1,245 @@
+import hashlib
+import json
+import time
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth.models import Permission
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, transaction
+
+from .load_export import dependency_levels
+
+
+# Rows that `migrate` regenerates on the target with its own ids. They are replaced
+# wholesale so foreign keys copied from the source (e.g. ModerationQueue.content_type)
+# keep pointing at the right rows.
+REPLACED_MODELS = [Permission, ContentType]
+
+
+def copy_order():
+    """All concrete tables, including auto-created M2M tables, parents before children"""
+    models = [
+        model for model in apps.get_models(include_auto_created=True)
+        if model._meta.managed and not model._meta.proxy
+    ]
+    return [model for level in dependency_levels(models) for model in level]
+
+
+def keyset_chunks(model, alias, attnames, chunk_size, after=None):
+    """Yield lists of rows ordered by primary key, one chunk per query"""
+    pk_name = model._meta.pk.attname
+    pk_index = attnames.index(pk_name)
+    queryset = model._base_manager.using(alias).order_by(pk_name)
+    while True:
+        chunk_qs = queryset if after is None else queryset.filter(**{f'{pk_name}__gt': after})
+        rows = list(chunk_qs.values_list(*attnames)[:chunk_size])
+        if not rows:
+            return
+        yield rows
+        after = rows[-1][pk_index]
+
+
+def table_checksum(model, alias, chunk_size):
+    """Row count and SHA-256 over every row in primary key order"""
+    attnames = [field.attname for field in model._meta.concrete_fields]
+    digest = hashlib.sha256()
+    count = 0
+    for rows in keyset_chunks(model, alias, attnames, chunk_size):
+        for row in rows:
+            digest.update(json.dumps(row, cls=DjangoJSONEncoder, default=str).encode('utf-8'))
+            digest.update(b'\n')
+        count += len(rows)
+    return count, digest.hexdigest()
+
+
+class Command(BaseCommand):
+    help = 'Copy all data from one configured database alias to another (e.g. SQLite -> PostgreSQL)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--source',
+            default='default',
+            help='Database alias to copy from',
+        )
+        parser.add_argument(
+            '--target',
+            default='target',
+            help='Database alias to copy into (must already be migrated)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=5000,
+            help='Rows read and inserted per batch',
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Continue an interrupted run from the saved state file',
+        )
+        parser.add_argument(
+            '--state-file',
+            default='data/migrate_database_state.json',
+            help='Where copy progress is recorded',
+        )
+        parser.add_argument(
+            '--skip-verify',
+            action='store_true',
+            help='Do not compare row counts and checksums after copying',
+        )
+        parser.add_argument(
+            '--verify-only',
+            action='store_true',
+            help='Only compare row counts and checksums between the two databases',
+        )
+
+    def handle(self, *args, **options):
+        source, target = options['source'], options['target']
+        for alias in (source, target):
+            if alias not in settings.DATABASES:
+                raise CommandError(
+                    f"Database alias '{alias}' is not configured "
+                    "(set TARGET_DATABASE_ENGINE, TARGET_DATABASE_NAME, ... for the 'target' alias)"
+                )
+        if source == target:
+            raise CommandError('Source and target must be different databases')
+
+        self.chunk_size = options['chunk_size']
+        self.resume = options['resume']
+        models = copy_order()
+
+        if not options['verify_only']:
+            self.check_target_schema(models, target)
+            if not options['resume']:
+                self.check_target_empty(models, target)
+            state_path = Path(options['state_file'])
+            state = self.load_state(state_path, source, target, options['resume'])
+
+            started = time.perf_counter()
+            for model in models:
+                self.copy_model(model, source, target, state, state_path)
+            self.reset_sequences(models, target)
+            self.stdout.write(f'\nCopied all tables in {time.perf_counter() - started:.1f}s')
+
+        if options['skip_verify']:
+            return
+        if not self.verify(models, source, target):
+            raise CommandError('Verification failed, see mismatches above')
+        self.stdout.write(self.style.SUCCESS('\nAll tables verified'))
+
+    def check_target_schema(self, models, target):
+        existing = set(connections[target].introspection.table_names())
+        missing = [model._meta.db_table for model in models if model._meta.db_table not in existing]
+        if missing:
+            raise CommandError(
+                f"Target is missing tables ({', '.join(missing[:5])}...). "
+                f'Run: python manage.py migrate --database {target}'
+            )
+
+    def check_target_empty(self, models, target):
+        for model in models:
+            if model not in REPLACED_MODELS and model._base_manager.using(target).exists():
+                raise CommandError(
+                    f'{model._meta.label} already has rows on the target. '
+                    'Use --resume to continue a previous run or start from an empty database.'
+                )
+
+    def load_state(self, state_path, source, target, resume):
+        key = f'{source}->{target}'
+        if resume:
+            if not state_path.exists():
+                raise CommandError(f'No saved progress at {state_path}')
+            with open(state_path, encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('key') != key:
+                raise CommandError(f"Saved progress is for {state.get('key')}, not {key}")
+            self.stdout.write(f'Resuming {key}')
+            return state
+        return {'key': key, 'tables': {}}
+
+    def save_state(self, state, state_path):
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = state_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2, cls=DjangoJSONEncoder)
+        tmp_path.replace(state_path)
+
+    def copy_model(self, model, source, target, state, state_path):
+        label = model._meta.label
+        progress = state['tables'].setdefault(label, {'last_pk': None, 'rows': 0, 'done': False})
+        if progress['done']:
+            return
+
+        if progress['last_pk'] is None and model in REPLACED_MODELS:
+            model._base_manager.using(target).all().delete()
+
+        connection = connections[target]
+        fields = model._meta.concrete_fields
+        attnames = [field.attname for field in fields]
+        sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+            connection.ops.quote_name(model._meta.db_table),
+            ', '.join(connection.ops.quote_name(field.column) for field in fields),
+            ', '.join(['%s'] * len(fields)),
+        )
+
+        pk_index = attnames.index(model._meta.pk.attname)
+        # A chunk can be committed on the target just before an interruption stops its progress
+        # being saved, so a resumed run skips rows the target already has until a chunk has none
+        skip_existing = self.resume
+        started = time.perf_counter()
+        for rows in keyset_chunks(model, source, attnames, self.chunk_size, after=progress['last_pk']):
+            new_rows = rows
+            if skip_existing:
+                existing = set(
+                    model._base_manager.using(target)
+                    .filter(pk__gte=rows[0][pk_index], pk__lte=rows[-1][pk_index])
+                    .values_list('pk', flat=True)
+                )
+                new_rows = [row for row in rows if row[pk_index] not in existing]
+                skip_existing = bool(existing)
+            params = [
+                [field.get_db_prep_save(value, connection=connection) for field, value in zip(fields, row)]
+                for row in new_rows
+            ]
+            # Raw INSERTs keep auto_now/auto_now_add timestamps exactly as they were
+            if params:
+                with transaction.atomic(using=target):
+                    with connection.constraint_checks_disabled():
+                        with connection.cursor() as cursor:
+                            cursor.executemany(sql, params)
+            progress['last_pk'] = rows[-1][pk_index]
+            progress['rows'] += len(rows)
+            self.save_state(state, state_path)
+
+        progress['done'] = True
+        self.save_state(state, state_path)
+        self.stdout.write(f"  {label}: {progress['rows']} rows ({time.perf_counter() - started:.1f}s)")
+
+    def reset_sequences(self, models, target):
+        connection = connections[target]
+        sequence_sql = connection.ops.sequence_reset_sql(no_style(), models)
+        if sequence_sql:
+            with connection.cursor() as cursor:
+                for line in sequence_sql:
+                    cursor.execute(line)
+
+    def verify(self, models, source, target):
+        self.stdout.write('\nVerifying row counts and checksums...')
+        ok = True
+        for model in models:
+            source_count, source_hash = table_checksum(model, source, self.chunk_size)
+            target_count, target_hash = table_checksum(model, target, self.chunk_size)
+            if source_count != target_count:
+                ok = False
+                self.stdout.write(self.style.ERROR(
+                    f'  {model._meta.label}: {source_count} rows on source, {target_count} on target'
+                ))
+            elif source_hash != target_hash:
+                ok = False
+                self.stdout.write(self.style.ERROR(f'  {model._meta.label}: checksum mismatch'))
+        return ok
@@ -0,0 +1,123 @@
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+# What a fresh worker runs before it can answer, cumulatively per target
+TARGETS = {
+    'settings': 'import django; django.setup()',
+    'wsgi': 'from ngo.wsgi import application',
+    'first-request': (
+        'from ngo.wsgi import application\n'
+        'from django.urls import get_resolver\n'
+        'get_resolver().url_patterns'
+    ),
+    'warmup': (
+        'from ngo.wsgi import application\n'
+        'from ngo.warmup import warm_up\n'
+        'warm_up()'
+    ),
+}
+
+# "import time:       self [us] |  cumulative | imported package"
+IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+class Command(BaseCommand):
+    help = 'Profile worker cold start with python -X importtime and report import time per package and module'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--target',
+            choices=sorted(TARGETS),
+            default='first-request',
+            help='How far to start up: settings, the WSGI application, plus the URLconf, or plus warm_up()',
+        )
+        parser.add_argument(
+            '--runs',
+            type=int,
+            default=3,
+            help='Fresh interpreters to start; the run with the median wall time is reported',
+        )
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=20,
+            help='Packages and modules to list',
+        )
+        parser.add_argument(
+            '--output',
+            help='Write the parsed import times of the reported run to this JSON file',
+        )
+
+    def handle(self, *args, **options):
+        if options['runs'] < 1:
+            raise CommandError('--runs must be at least 1')
+        runs = sorted((self.start(options['target']) for _ in range(options['runs'])), key=lambda run: run['wall'])
+        run = runs[len(runs) // 2]
+        modules = run['modules']
+
+        total = sum(module['self'] for module in modules)
+        self.stdout.write(
+            f"Target {options['target']}: wall {run['wall'] * 1000:.0f} ms "
+            f"(median of {len(runs)}, range {runs[0]['wall'] * 1000:.0f}-{runs[-1]['wall'] * 1000:.0f} ms), "
+            f"{len(modules)} modules imported in {total / 1000:.0f} ms\n"
+        )
+
+        packages = {}
+        for module in modules:
+            package = packages.setdefault(module['name'].split('.')[0], {'self': 0, 'modules': 0})
+            package['self'] += module['self']
+            package['modules'] += 1
+        self.stdout.write(f"{'Package':<32} {'Modules':>7} {'Self ms':>8} {'Share':>6}")
+        for name, package in sorted(packages.items(), key=lambda item: -item[1]['self'])[:options['top']]:
+            self.stdout.write(
+                f"{name:<32} {package['modules']:>7} {package['self'] / 1000:>8.1f} "
+                f"{package['self'] / total:>6.1%}"
+            )
+
+        # Imports made directly by startup code, i.e. what a lazy import would save
+        self.stdout.write(f"\n{'Module (cumulative)':<48} {'Self ms':>8} {'Cumul ms':>9}")
+        for module in sorted(modules, key=lambda module: -module['cumulative'])[:options['top']]:
+            self.stdout.write(
+                f"{'  ' * min(module['depth'], 4) + module['name']:<48} "
+                f"{module['self'] / 1000:>8.1f} {module['cumulative'] / 1000:>9.1f}"
+            )
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump({'target': options['target'], 'wall': run['wall'], 'modules': modules}, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"\nWrote {options['output']}"))
+
+    def start(self, target):
+        """Start a fresh interpreter with -X importtime and parse its import report"""
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'ngo.settings')}
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(settings.BASE_DIR), env.get('PYTHONPATH')]))
+        # Bytecode is cached on a real host, so leave out compile time
+        env.pop('PYTHONDONTWRITEBYTECODE', None)
+        started = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', TARGETS[target]],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        wall = time.perf_counter() - started
+        if completed.returncode != 0:
+            raise CommandError(f'Start-up failed:\n{completed.stderr[-2000:]}')
+
+        modules = []
+        for line in completed.stderr.splitlines():
+            match = IMPORT_LINE.match(line)
+            if match:
+                modules.append({
+                    'name': match.group(4),
+                    'self': int(match.group(1)),
+                    'cumulative': int(match.group(2)),
+                    'depth': (len(match.group(3)) - 1) // 2,
+                })
+        return {'wall': wall, 'modules': modules}
@@ -0,0 +1,39 @@
+import csv
+from pathlib import Path
+from django.core.management.base import BaseCommand, CommandError
+from members.payments import reconcile_payments
+
+
+class Command(BaseCommand):
+    help = 'Complete pending membership payments listed in an imported CSV batch'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'csv_file',
+            help='CSV export from the bank or payment provider',
+        )
+        parser.add_argument(
+            '--column',
+            default='transaction_reference',
+            help='Column holding the transaction reference',
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options['csv_file'])
+        if not path.exists():
+            raise CommandError(f'{path} does not exist')
+
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            reader = csv.DictReader(f)
+            if options['column'] not in (reader.fieldnames or []):
+                raise CommandError(f"Column '{options['column']}' not found in {path}")
+            references = [row[options['column']] for row in reader]
+
+        self.stdout.write(f'Reconciling {len(references)} transaction references...')
+        completed, unmatched = reconcile_payments(references)
+
+        self.stdout.write(self.style.SUCCESS(f'Completed {len(completed)} payments'))
+        if unmatched:
+            self.stdout.write(self.style.WARNING(f'{len(unmatched)} references matched no pending payment:'))
+            for reference in unmatched:
+                self.stdout.write(f'  {reference}')
@@ -0,0 +1,61 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.test import Client
+
+from ngo.benchmarking import public_list_urls
+from ngo.middleware import brotli
+
+
+class Command(BaseCommand):
+    help = 'Report bytes on the wire per API list endpoint, uncompressed and with gzip/brotli'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--url',
+            action='append',
+            default=[],
+            help='Endpoint to measure (can be repeated); defaults to every anonymous list endpoint',
+        )
+        parser.add_argument(
+            '--json',
+            dest='json_path',
+            help='Also write the report to this JSON file',
+        )
+
+    def handle(self, *args, **options):
+        urls = options['url'] or public_list_urls()
+        # Endpoints that fail anonymously are skipped instead of aborting the report
+        client = Client(raise_request_exception=False)
+        encodings = ['gzip', 'br'] if brotli is not None else ['gzip']
+
+        self.stdout.write(f"{'Endpoint':<50} {'Raw':>10} " + ' '.join(f'{e:>10}' for e in encodings) + f" {'Saved':>7}")
+        report = []
+        for url in urls:
+            raw = client.get(url)
+            if raw.status_code != 200:
+                self.stdout.write(self.style.WARNING(f'{url:<50} skipped (HTTP {raw.status_code})'))
+                continue
+            entry = {'url': url, 'identity': len(raw.content)}
+            for encoding in encodings:
+                response = client.get(url, HTTP_ACCEPT_ENCODING=encoding)
+                entry[encoding] = len(response.content)
+            best = min(entry[encoding] for encoding in encodings)
+            entry['saved_percent'] = round(100 * (1 - best / entry['identity']), 1) if entry['identity'] else 0.0
+            report.append(entry)
+            self.stdout.write(
+                f"{url:<50} {entry['identity']:>10,} "
+                + ' '.join(f'{entry[e]:>10,}' for e in encodings)
+                + f" {entry['saved_percent']:>6}%"
+            )
+
+        total = sum(entry['identity'] for entry in report)
+        total_compressed = sum(min(entry[e] for e in encodings) for entry in report)
+        self.stdout.write(self.style.SUCCESS(
+            f'\n{len(report)} endpoints: {total:,} bytes raw, {total_compressed:,} bytes compressed'
+        ))
+
+        if options['json_path']:
+            with open(options['json_path'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(f"Report written to {options['json_path']}")
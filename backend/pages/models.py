@@ -1,11 +1,10 @@
 from django.db import models
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
-from django.utils.text import slugify
-from members.models import TimeStampedModel
+from members.models import TimeStampedModel, UniqueSlugMixin
 
 
-class Page(TimeStampedModel):
+class Page(UniqueSlugMixin, TimeStampedModel):
     """Static pages (About, Terms, Privacy, etc.)"""
     title = models.CharField(max_length=255)
     slug = models.SlugField(max_length=255, unique=True, blank=True)
@@ -21,11 +20,6 @@ class Page(TimeStampedModel):
     
     def __str__(self):
         return self.title
-    
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.title)
-        super().save(*args, **kwargs)
 
 
 class ContactMessage(TimeStampedModel):
@@ -109,39 +103,16 @@ class ModerationQueue(TimeStampedModel):
     
     def approve(self, user, notes=''):
         """Approve the content"""
-        from django.utils import timezone
-        self.moderation_status = 'APPROVED'
-        self.reviewed_by = user
-        self.reviewed_at = timezone.now()
-        self.reviewer_notes = notes
-        self.save()
-        
-        # Update the actual content status if it has a status field
-        content = self.content_object
-        if hasattr(content, 'status'):
-            content.status = 'APPROVED'
-            content.save()
-        elif hasattr(content, 'is_approved'):
-            content.is_approved = True
-            content.save()
+        self.moderate(True, user, notes)
     
     def reject(self, user, notes=''):
         """Reject the content"""
-        from django.utils import timezone
-        self.moderation_status = 'REJECTED'
-        self.reviewed_by = user
-        self.reviewed_at = timezone.now()
-        self.reviewer_notes = notes
-        self.save()
-        
-        # Update the actual content status if it has a status field
-        content = self.content_object
-        if hasattr(content, 'status'):
-            content.status = 'REJECTED'
-            content.save()
-        elif hasattr(content, 'is_approved'):
-            content.is_approved = False
-            content.save()
+        self.moderate(False, user, notes)
+    
+    def moderate(self, approve, user, notes=''):
+        from .moderation import moderate_queue
+        moderate_queue(ModerationQueue.objects.filter(pk=self.pk), approve, user, notes)
+        self.refresh_from_db(fields=['moderation_status', 'reviewed_by', 'reviewed_at', 'reviewer_notes', 'updated_at'])
 
 
 class Announcement(TimeStampedModel):
@@ -186,3 +157,47 @@ class Announcement(TimeStampedModel):
         if self.expiry_date and self.expiry_date < now:
             return False
         return True
+
+
+class ImageVariant(TimeStampedModel):
+    """A resized WebP or JPEG copy of an uploaded image (pages/images.py)"""
+    FORMAT_CHOICES = [
+        ('webp', 'WebP'),
+        ('jpeg', 'JPEG'),
+    ]
+    
+    # Storage name of the original, e.g. logos/acme.png
+    source = models.CharField(max_length=255, db_index=True)
+    source_hash = models.CharField(max_length=64, help_text="SHA-256 of the original's content")
+    
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES)
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    # Named after source_hash, so identical uploads share their variant files
+    file = models.FileField(upload_to='variants/', max_length=255)
+    
+    class Meta:
+        ordering = ['source', 'format', 'width']
+        unique_together = ['source', 'format', 'width']
+        verbose_name = 'Image Variant'
+        verbose_name_plural = 'Image Variants'
+    
+    def __str__(self):
+        return f"{self.source} ({self.format}, {self.width}w)"
+
+
+class StoredBlob(TimeStampedModel):
+    """A file kept once by ContentAddressedStorage (pages/storage.py), however many rows use it"""
+    # blobs/ab/cd/<sha256><ext>
+    name = models.CharField(max_length=255, unique=True)
+    size = models.BigIntegerField()
+    # Uploads stored as this blob; recounted from the referencing rows by gc_media_blobs
+    refcount = models.IntegerField(default=0)
+    
+    class Meta:
+        ordering = ['name']
+        verbose_name = 'Stored Blob'
+        verbose_name_plural = 'Stored Blobs'
+    
+    def __str__(self):
+        return f"{self.name} ({self.refcount} references)"
@@ -0,0 +1,100 @@
+"""
+Set-based moderation of queued content.
+
+Approving or rejecting always updates both sides: the content rows and their
+ModerationQueue entries. Each content type is handled with two UPDATE
+statements in one transaction, whichever side the selection starts from:
+
+    moderate_queue(ModerationQueue.objects.filter(...), approve=True, user=request.user)
+    moderate_content(ForumPost.objects.filter(...), approve=False, user=request.user)
+"""
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ModerationQueue
+
+
+# Field holding the moderation state of each content model, filled by register()
+# or guessed by moderation_field(). is_approved wins over status because some
+# models (Event) use status for something else.
+MODERATED_FIELDS = {}
+
+STATUS_VALUES = {True: 'APPROVED', False: 'REJECTED'}
+
+
+def register(model, field):
+    """Declare the field (is_approved or status) that holds model's moderation state"""
+    MODERATED_FIELDS[model] = field
+
+
+def moderation_field(model):
+    if model not in MODERATED_FIELDS:
+        field_names = {field.name for field in model._meta.concrete_fields}
+        if 'is_approved' in field_names:
+            MODERATED_FIELDS[model] = 'is_approved'
+        elif 'status' in field_names:
+            MODERATED_FIELDS[model] = 'status'
+        else:
+            raise ValueError(f'{model.__name__} has no is_approved or status field to moderate')
+    return MODERATED_FIELDS[model]
+
+
+def content_values(model, approve):
+    """UPDATE values that approve or reject rows of model"""
+    field = moderation_field(model)
+    if field == 'is_approved':
+        return {'is_approved': approve}
+    return {field: STATUS_VALUES[approve]}
+
+
+def review_values(approve, user, notes):
+    now = timezone.now()
+    return {
+        'moderation_status': STATUS_VALUES[approve],
+        'reviewed_by_id': user.pk if user is not None else None,
+        'reviewed_at': now,
+        'reviewer_notes': notes,
+        'updated_at': now,
+    }
+
+
+def moderate_queue(queryset, approve, user=None, notes=''):
+    """
+    Approve or reject the queue items in queryset and the content they point to.
+    Items already in the target state are left alone. Returns the number of items changed.
+    """
+    target = STATUS_VALUES[approve]
+    items = queryset.exclude(moderation_status=target).order_by()
+    content_type_ids = list(items.values_list('content_type_id', flat=True).distinct())
+
+    changed = 0
+    for content_type_id in content_type_ids:
+        model = ContentType.objects.get_for_id(content_type_id).model_class()
+        selected = items.filter(content_type_id=content_type_id)
+        with transaction.atomic():
+            # Content first: the queue UPDATE changes which items the subquery selects
+            if model is not None:
+                model._default_manager.filter(
+                    pk__in=selected.values('object_id')
+                ).update(**content_values(model, approve))
+            changed += selected.update(**review_values(approve, user, notes))
+    return changed
+
+
+def moderate_content(queryset, approve, user=None, notes=''):
+    """
+    Approve or reject the content rows in queryset and resolve their queue entries.
+    Returns the number of content rows updated.
+    """
+    model = queryset.model
+    content_type = ContentType.objects.get_for_model(model)
+    with transaction.atomic():
+        # Queue first: queryset may filter on the field about to change
+        ModerationQueue.objects.filter(
+            content_type=content_type,
+            object_id__in=queryset.values('pk'),
+        ).exclude(
+            moderation_status=STATUS_VALUES[approve]
+        ).update(**review_values(approve, user, notes))
+        return queryset.update(**content_values(model, approve))
@@ -1,7 +1,48 @@
 from rest_framework import serializers
+from .images import srcsets
 from .models import Page, ContactMessage, ModerationQueue, Announcement
 
 
+class ImageVariantsField(serializers.Field):
+    """
+    {"webp": srcset, "jpeg": srcset} of an image field's variants, or None
+    before they are generated. Use with the image field as its source:
+
+        logo_variants = ImageVariantsField(source='logo')
+
+    In a list the variants of all rows are fetched with one query.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+        self._fetched = set()
+        self._srcsets = {}
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        if value.name not in self._fetched:
+            self._fetched = self.names_in_list(value)
+            self._srcsets = self.to_representation_many(self._fetched, self.context.get('request'))
+        return self._srcsets.get(value.name)
+
+    def to_representation_many(self, names, request=None):
+        """{name: representation}; FastPlan calls this with the names of all rows"""
+        return srcsets(names, request)
+
+    def names_in_list(self, value):
+        """Names of this field in every object of the list being serialized, or just value's name"""
+        names = {value.name}
+        root = self.root
+        if isinstance(root, serializers.ListSerializer) and self.parent is root.child and root.instance is not None:
+            for instance in root.instance:
+                file = self.get_attribute(instance)
+                if file:
+                    names.add(file.name)
+        return names
+
+
 class PageSerializer(serializers.ModelSerializer):
     class Meta:
         model = Page
@@ -29,6 +70,12 @@ class ModerationQueueSerializer(serializers.ModelSerializer):
         ]
 
 
+class ModerationBulkSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=10000)
+    decision = serializers.ChoiceField(choices=['approve', 'reject'])
+    notes = serializers.CharField(required=False, allow_blank=True, default='')
+
+
 class AnnouncementSerializer(serializers.ModelSerializer):
     is_active = serializers.ReadOnlyField()
     
@@ -39,3 +86,4 @@ class AnnouncementSerializer(serializers.ModelSerializer):
             'publish_date', 'expiry_date', 'show_to_all',
             'show_to_members_only', 'is_active', 'created_at'
         ]
+        field_dependencies = {'is_active': ['is_published', 'publish_date', 'expiry_date']}
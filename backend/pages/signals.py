@@ -0,0 +1,37 @@
+from django.apps import apps
+from django.db.models.signals import post_save, pre_save
+
+from ngo.tasks import run_in_background
+from .images import IMAGE_FIELDS, generate_variants
+
+
+# {model: [image field names]}, filled by connect_image_variants()
+IMAGE_FIELDS_BY_MODEL = {}
+
+
+def mark_new_upload(sender, instance, update_fields=None, **kwargs):
+    """Remember which image fields hold a file that this save uploads"""
+    pending = [
+        field for field in IMAGE_FIELDS_BY_MODEL[sender]
+        if (update_fields is None or field in update_fields)
+        and getattr(instance, field) and not getattr(instance, field)._committed
+    ]
+    if pending:
+        instance._image_variants_pending = pending
+
+
+def queue_image_variants(sender, instance, **kwargs):
+    """Generate the variants of newly uploaded images once the save is committed"""
+    for field in instance.__dict__.pop('_image_variants_pending', ()):
+        run_in_background(generate_variants, getattr(instance, field).name)
+
+
+def connect_image_variants():
+    for label, field in IMAGE_FIELDS:
+        IMAGE_FIELDS_BY_MODEL.setdefault(apps.get_model(label), []).append(field)
+    for model in IMAGE_FIELDS_BY_MODEL:
+        pre_save.connect(mark_new_upload, sender=model, dispatch_uid=f'image_variants_{model._meta.label}')
+        post_save.connect(queue_image_variants, sender=model, dispatch_uid=f'image_variants_{model._meta.label}')
+
+
+connect_image_variants()
@@ -0,0 +1,94 @@
+"""
+Content-addressed storage for member uploads that are often duplicated:
+guideline PDFs, RRC certificates, supporting documents and FAQ attachments.
+
+With MEDIA_DEDUP on, the 'uploads' storage is ContentAddressedStorage. An
+upload is hashed while it is streamed to a temporary file and then stored once
+as blobs/<h[:2]>/<h[2:4]>/<sha256><ext>; uploading the same content again only
+points the new row at the existing blob. StoredBlob counts the uploads of each
+blob, and `manage.py gc_media_blobs` recounts the references held by model
+rows and deletes blobs nothing refers to any more.
+
+Names stored before dedup was turned on keep working: the storage is a
+FileSystemStorage on MEDIA_ROOT. `gc_media_blobs --adopt` moves them into blobs.
+"""
+import hashlib
+import os
+import tempfile
+
+from django.core.files.storage import FileSystemStorage, storages
+from django.db.models import F
+from django.utils import timezone
+
+
+BLOB_PREFIX = 'blobs/'
+
+
+def upload_storage():
+    """Storage of the deduplicated upload fields, chosen by MEDIA_DEDUP through STORAGES['uploads']"""
+    return storages['uploads']
+
+
+def blob_name(digest, ext):
+    return f'{BLOB_PREFIX}{digest[:2]}/{digest[2:4]}/{digest}{ext}'
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage that stores each distinct content once, under its SHA-256"""
+
+    def get_available_name(self, name, max_length=None):
+        # The final name comes from the content in _save(), so there is nothing to avoid
+        return name
+
+    def _save(self, name, content):
+        ext = os.path.splitext(name)[1].lower()
+        tmp_dir = os.path.join(self.location, BLOB_PREFIX, 'tmp')
+        os.makedirs(tmp_dir, exist_ok=True)
+
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                if hasattr(content, 'seek'):
+                    content.seek(0)
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    tmp.write(chunk)
+                    size += len(chunk)
+            name = blob_name(digest.hexdigest(), ext)
+            # Referenced before the file is checked: gc_media_blobs only deletes a blob whose row it can
+            # lock unreferenced and unchanged for its grace period, so once this returns the file stays
+            self.add_reference(name, size)
+            path = self.path(name)
+            if os.path.exists(path):
+                os.unlink(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                if self.file_permissions_mode is not None:
+                    os.chmod(tmp_path, self.file_permissions_mode)
+                # Atomic, so a concurrent upload of the same content just replaces it with identical bytes
+                os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return name
+
+    def delete(self, name):
+        """Drop one reference; the blob itself is removed by gc_media_blobs once nothing uses it"""
+        if not name.startswith(BLOB_PREFIX):
+            return super().delete(name)
+        from .models import StoredBlob
+        StoredBlob.objects.filter(name=name).update(refcount=F('refcount') - 1)
+
+    def add_reference(self, name, size):
+        """Count one more use of the blob, stamping updated_at so gc_media_blobs leaves it alone"""
+        from .models import StoredBlob
+        increment = {'refcount': F('refcount') + 1, 'updated_at': timezone.now()}
+        if StoredBlob.objects.filter(name=name).update(**increment):
+            return
+        blob, created = StoredBlob.objects.get_or_create(name=name, defaults={'size': size, 'refcount': 1})
+        if not created:
+            # Created by a concurrent upload in between
+            StoredBlob.objects.filter(pk=blob.pk).update(**increment)
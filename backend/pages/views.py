@@ -2,11 +2,18 @@ from rest_framework import viewsets, permissions, filters, status, generics
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from ngo.async_views import AsyncListMixin
+from ngo.fast_serializers import FastReadMixin
+from ngo.viewsets import SparseFieldsetMixin
 from .models import Page, ContactMessage, ModerationQueue, Announcement
-from .serializers import PageSerializer, ContactMessageSerializer, ModerationQueueSerializer, AnnouncementSerializer
+from .moderation import moderate_queue
+from .serializers import (
+    PageSerializer, ContactMessageSerializer, ModerationQueueSerializer, ModerationBulkSerializer,
+    AnnouncementSerializer
+)
 
 
-class PageViewSet(viewsets.ReadOnlyModelViewSet):
+class PageViewSet(AsyncListMixin, FastReadMixin, SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """Public access to static pages"""
     queryset = Page.objects.filter(is_published=True)
     serializer_class = PageSerializer
@@ -23,7 +30,7 @@ class ContactMessageViewSet(generics.CreateAPIView):
         serializer.save(status='NEW')
 
 
-class ModerationQueueViewSet(viewsets.ReadOnlyModelViewSet):
+class ModerationQueueViewSet(SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """Staff access to moderation queue"""
     serializer_class = ModerationQueueSerializer
     permission_classes = [permissions.IsAdminUser]
@@ -32,14 +39,14 @@ class ModerationQueueViewSet(viewsets.ReadOnlyModelViewSet):
     ordering = ['created_at']
     
     def get_queryset(self):
-        return ModerationQueue.objects.all()
+        return ModerationQueue.objects.select_related('content_type', 'submitted_by')
     
     @action(detail=True, methods=['post'])
     def approve(self, request, pk=None):
         """Approve content"""
         item = self.get_object()
         notes = request.data.get('notes', '')
-        item.approve(request.user, notes)
+        moderate_queue(ModerationQueue.objects.filter(pk=item.pk), True, request.user, notes)
         return Response({'message': 'Content approved'})
     
     @action(detail=True, methods=['post'])
@@ -47,11 +54,24 @@ class ModerationQueueViewSet(viewsets.ReadOnlyModelViewSet):
         """Reject content"""
         item = self.get_object()
         notes = request.data.get('notes', 'Content does not meet standards')
-        item.reject(request.user, notes)
+        moderate_queue(ModerationQueue.objects.filter(pk=item.pk), False, request.user, notes)
         return Response({'message': 'Content rejected'})
+    
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """Approve or reject many items: {"ids": [...], "decision": "approve" or "reject", "notes": ""}"""
+        serializer = ModerationBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        approve = serializer.validated_data['decision'] == 'approve'
+        notes = serializer.validated_data['notes'] or ('' if approve else 'Content does not meet standards')
+        count = moderate_queue(
+            ModerationQueue.objects.filter(pk__in=serializer.validated_data['ids']),
+            approve, request.user, notes
+        )
+        return Response({'message': f"{count} items {'approved' if approve else 'rejected'}", 'count': count})
 
 
-class AnnouncementViewSet(viewsets.ReadOnlyModelViewSet):
+class AnnouncementViewSet(AsyncListMixin, FastReadMixin, SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """Public access to active announcements"""
     serializer_class = AnnouncementSerializer
     permission_classes = [permissions.AllowAny]
@@ -0,0 +1,34 @@
+"""
+ASGI entry point, the counterpart of passenger_wsgi.py for an ASGI server:
+
+    uvicorn passenger_asgi:application --workers 2
+
+Public list endpoints are served by async views here (ASYNC_READ_VIEWS).
+Persistent database connections are off by default: each request's ORM work
+runs in its own thread, so a kept connection would never be reused.
+"""
+import os
+import sys
+
+
+sys.path.insert(0, os.path.dirname(__file__))
+os.environ.setdefault('ASYNC_READ_VIEWS', 'True')
+os.environ.setdefault('DATABASE_CONN_MAX_AGE', '0')
+os.environ.setdefault('REPLICA_DATABASE_CONN_MAX_AGE', '0')
+
+from ngo.asgi import application as _application  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+if settings.WARMUP_ON_START:
+    from ngo.warmup import warm_up
+    warm_up()
+
+
+async def application(scope, receive, send):
+    # Strip /backend prefix from the path since Django URLs don't include it
+    if scope['type'] == 'http':
+        path = scope['path']
+        if path.startswith('/backend'):
+            scope = dict(scope, path=path[8:] or '/')
+            scope.pop('raw_path', None)
+    await _application(scope, receive, send)
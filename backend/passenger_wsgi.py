@@ -27,3 +27,10 @@ def application(environ, start_response):
             environ['PATH_INFO'] = '/'
     
     return _application(environ, start_response)
+
+# Optionally load the URLconf, views and serializers now rather than on the first request
+from django.conf import settings
+
+if settings.WARMUP_ON_START:
+    from ngo.warmup import warm_up
+    warm_up()
@@ -1,4 +1,5 @@
 from django.contrib import admin
+from pages.moderation import moderate_content
 from .models import Resource, ResourceCategory, FAQ, FAQCategory
 
 
@@ -20,13 +21,13 @@ class ResourceAdmin(admin.ModelAdmin):
     actions = ['approve_resources', 'reject_resources', 'feature_resources']
     
     def approve_resources(self, request, queryset):
-        queryset.update(is_approved=True)
-        self.message_user(request, f"{queryset.count()} resources approved")
+        count = moderate_content(queryset, True, request.user)
+        self.message_user(request, f"{count} resources approved")
     approve_resources.short_description = "Approve selected resources"
     
     def reject_resources(self, request, queryset):
-        queryset.update(is_approved=False)
-        self.message_user(request, f"{queryset.count()} resources rejected")
+        count = moderate_content(queryset, False, request.user)
+        self.message_user(request, f"{count} resources rejected")
     reject_resources.short_description = "Reject selected resources"
     
     def feature_resources(self, request, queryset):
@@ -0,0 +1,26 @@
+# Generated by Django 5.0.1 on 2026-10-19 15:27
+
+import django.core.validators
+import members.models
+import pages.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resources', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='faq',
+            name='attachment',
+            field=models.FileField(blank=True, storage=pages.storage.upload_storage, upload_to='faqs/', validators=[django.core.validators.FileExtensionValidator(['pdf', 'doc', 'docx']), members.models.validate_file_size]),
+        ),
+        migrations.AlterField(
+            model_name='resource',
+            name='file',
+            field=models.FileField(blank=True, storage=pages.storage.upload_storage, upload_to='resources/', validators=[members.models.validate_file_size]),
+        ),
+    ]
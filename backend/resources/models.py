@@ -1,11 +1,14 @@
 from django.db import models
-from django.utils.text import slugify
+from django.db.models import F
 from django.core.validators import FileExtensionValidator
-from members.models import TimeStampedModel, validate_file_size
+from members.models import TimeStampedModel, UniqueSlugMixin, validate_file_size
+from pages.storage import upload_storage
 
 
-class ResourceCategory(models.Model):
+class ResourceCategory(UniqueSlugMixin, models.Model):
     """Categories for resources"""
+    slug_source = 'name'
+    
     name = models.CharField(max_length=200, unique=True)
     slug = models.SlugField(max_length=200, unique=True, blank=True)
     description = models.TextField(blank=True)
@@ -19,14 +22,9 @@ class ResourceCategory(models.Model):
     
     def __str__(self):
         return self.name
-    
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.name)
-        super().save(*args, **kwargs)
 
 
-class Resource(TimeStampedModel):
+class Resource(UniqueSlugMixin, TimeStampedModel):
     """Resources, tools, and documents"""
     RESOURCE_TYPE_CHOICES = [
         ('DOCUMENT', 'Document'),
@@ -47,6 +45,7 @@ class Resource(TimeStampedModel):
     # File or URL
     file = models.FileField(
         upload_to='resources/',
+        storage=upload_storage,
         blank=True,
         validators=[validate_file_size]
     )
@@ -83,18 +82,15 @@ class Resource(TimeStampedModel):
     def __str__(self):
         return self.title
     
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.title)
-        super().save(*args, **kwargs)
-    
     def increment_download_count(self):
-        self.download_count += 1
-        self.save(update_fields=['download_count'])
+        # A single UPDATE, so concurrent downloads are all counted
+        Resource.objects.filter(pk=self.pk).update(download_count=F('download_count') + 1)
 
 
-class FAQCategory(models.Model):
+class FAQCategory(UniqueSlugMixin, models.Model):
     """FAQ Categories"""
+    slug_source = 'name'
+    
     name = models.CharField(max_length=200, unique=True)
     slug = models.SlugField(max_length=200, unique=True, blank=True)
     order = models.IntegerField(default=0)
@@ -106,11 +102,6 @@ class FAQCategory(models.Model):
     
     def __str__(self):
         return self.name
-    
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.name)
-        super().save(*args, **kwargs)
 
 
 class FAQ(TimeStampedModel):
@@ -124,6 +115,7 @@ class FAQ(TimeStampedModel):
     # Optional attachments
     attachment = models.FileField(
         upload_to='faqs/',
+        storage=upload_storage,
         blank=True,
         validators=[FileExtensionValidator(['pdf', 'doc', 'docx']), validate_file_size]
     )
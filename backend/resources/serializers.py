@@ -1,4 +1,6 @@
 from rest_framework import serializers
+from ngo.serializers import SummaryField
+from pages.serializers import ImageVariantsField
 from .models import Resource, ResourceCategory, FAQ, FAQCategory
 
 
@@ -11,17 +13,33 @@ class ResourceCategorySerializer(serializers.ModelSerializer):
 class ResourceSerializer(serializers.ModelSerializer):
     category_name = serializers.CharField(source='category.name', read_only=True)
     uploaded_by_name = serializers.CharField(source='uploaded_by.name', read_only=True)
+    thumbnail_variants = ImageVariantsField(source='thumbnail')
     
     class Meta:
         model = Resource
         fields = [
             'id', 'title', 'slug', 'description', 'category', 'category_name',
-            'resource_type', 'file', 'external_url', 'thumbnail', 'order',
+            'resource_type', 'file', 'external_url', 'thumbnail', 'thumbnail_variants', 'order',
             'is_featured', 'published_date', 'uploaded_by', 'uploaded_by_name',
             'is_approved', 'download_count', 'created_at', 'updated_at'
         ]
 
 
+class ResourceListSerializer(serializers.ModelSerializer):
+    """Resource listing without the full description"""
+    category_name = serializers.CharField(source='category.name', read_only=True)
+    summary = SummaryField(source='description')
+    thumbnail_variants = ImageVariantsField(source='thumbnail')
+    
+    class Meta:
+        model = Resource
+        fields = [
+            'id', 'title', 'slug', 'summary', 'category', 'category_name',
+            'resource_type', 'file', 'external_url', 'thumbnail', 'thumbnail_variants',
+            'is_featured', 'published_date', 'download_count'
+        ]
+
+
 class ResourceWriteSerializer(serializers.ModelSerializer):
     class Meta:
         model = Resource
@@ -39,11 +57,12 @@ class FAQCategorySerializer(serializers.ModelSerializer):
 
 class FAQSerializer(serializers.ModelSerializer):
     category_name = serializers.CharField(source='category.name', read_only=True)
+    image_variants = ImageVariantsField(source='image')
     
     class Meta:
         model = FAQ
         fields = [
             'id', 'question', 'answer', 'category', 'category_name',
-            'order', 'is_published', 'attachment', 'image',
+            'order', 'is_published', 'attachment', 'image', 'image_variants',
             'view_count', 'created_at', 'updated_at'
         ]
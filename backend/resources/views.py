@@ -1,26 +1,32 @@
+import os
+
 from rest_framework import viewsets, permissions, filters, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from ngo.media import FileContentNegotiation, serve_file
+from ngo.tasks import run_in_background
+from ngo.viewsets import SparseFieldsetMixin
+from members.authentication import member_organization_id, require_member_organization_id, can_auto_approve
 from .models import Resource, ResourceCategory, FAQ, FAQCategory
 from .serializers import (
-    ResourceSerializer, ResourceWriteSerializer, ResourceCategorySerializer,
+    ResourceSerializer, ResourceListSerializer, ResourceWriteSerializer, ResourceCategorySerializer,
     FAQSerializer, FAQCategorySerializer
 )
 from pages.models import ModerationQueue
 
 
-class ResourceCategoryViewSet(viewsets.ReadOnlyModelViewSet):
+class ResourceCategoryViewSet(SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """Public access to resource categories"""
     queryset = ResourceCategory.objects.all()
     serializer_class = ResourceCategorySerializer
     permission_classes = [permissions.AllowAny]
 
 
-class PublicResourceViewSet(viewsets.ReadOnlyModelViewSet):
+class PublicResourceViewSet(SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """Public read-only access to approved resources"""
-    queryset = Resource.objects.filter(is_approved=True)
-    serializer_class = ResourceSerializer
+    queryset = Resource.objects.filter(is_approved=True).select_related('category', 'uploaded_by')
     permission_classes = [permissions.AllowAny]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['category', 'resource_type', 'is_featured']
@@ -28,21 +34,36 @@ class PublicResourceViewSet(viewsets.ReadOnlyModelViewSet):
     ordering_fields = ['published_date', 'download_count', 'title']
     ordering = ['-is_featured', '-published_date']
     
-    @action(detail=True, methods=['post'])
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return ResourceListSerializer
+        return ResourceSerializer
+    
+    @action(detail=True, methods=['get', 'post'], content_negotiation_class=FileContentNegotiation)
     def download(self, request, pk=None):
-        """Track downloads"""
+        """GET sends the file and counts the download; POST only counts it"""
         resource = self.get_object()
-        resource.increment_download_count()
-        return Response({'message': 'Download tracked'})
+        if request.method == 'POST':
+            run_in_background(resource.increment_download_count)
+            return Response({'message': 'Download tracked'})
+        if not resource.file:
+            raise NotFound('This resource has no file.')
+        # Deduplicated files are stored under their content hash, so name the download after the resource
+        filename = resource.slug + os.path.splitext(resource.file.name)[1]
+        return serve_file(
+            request, resource.file, filename=filename,
+            on_download=lambda: run_in_background(resource.increment_download_count),
+        )
 
 
-class ResourceViewSet(viewsets.ModelViewSet):
+class ResourceViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """Authenticated access for members to upload resources"""
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        if hasattr(self.request.user, 'member_organization'):
-            return Resource.objects.filter(uploaded_by=self.request.user.member_organization)
+        organization_id = member_organization_id(self.request.user)
+        if organization_id is not None:
+            return Resource.objects.filter(uploaded_by_id=organization_id)
         return Resource.objects.none()
     
     def get_serializer_class(self):
@@ -51,28 +72,28 @@ class ResourceViewSet(viewsets.ModelViewSet):
         return ResourceSerializer
     
     def perform_create(self, serializer):
-        organization = self.request.user.member_organization
+        organization_id = require_member_organization_id(self.request.user)
         
         # Check if member is verified for auto-approval
-        if organization.auto_approve_content:
-            resource = serializer.save(uploaded_by=organization, is_approved=True)
+        if can_auto_approve(self.request.user):
+            resource = serializer.save(uploaded_by_id=organization_id, is_approved=True)
         else:
-            resource = serializer.save(uploaded_by=organization, is_approved=False)
+            resource = serializer.save(uploaded_by_id=organization_id, is_approved=False)
             # Create moderation queue entry
             ModerationQueue.objects.create(
                 content_object=resource,
-                submitted_by=organization
+                submitted_by_id=organization_id
             )
 
 
-class FAQCategoryViewSet(viewsets.ReadOnlyModelViewSet):
+class FAQCategoryViewSet(SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """Public access to FAQ categories"""
     queryset = FAQCategory.objects.all()
     serializer_class = FAQCategorySerializer
     permission_classes = [permissions.AllowAny]
 
 
-class FAQViewSet(viewsets.ReadOnlyModelViewSet):
+class FAQViewSet(SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """Public read-only access to FAQs"""
     queryset = FAQ.objects.filter(is_published=True)
     serializer_class = FAQSerializer
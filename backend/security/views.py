@@ -1,5 +1,7 @@
 from rest_framework import viewsets, permissions, filters
 from django_filters.rest_framework import DjangoFilterBackend
+from ngo.viewsets import SparseFieldsetMixin
+from members.authentication import member_organization_id, require_member_organization_id
 from .models import SecurityIncident, AccessConstraint
 from .serializers import (
     SecurityIncidentSerializer, SecurityIncidentWriteSerializer,
@@ -7,7 +9,7 @@ from .serializers import (
 )
 
 
-class SecurityIncidentViewSet(viewsets.ModelViewSet):
+class SecurityIncidentViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """Manage security incident reports"""
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
@@ -19,10 +21,11 @@ class SecurityIncidentViewSet(viewsets.ModelViewSet):
         if self.request.user.is_staff:
             # Staff can see all incidents
             return SecurityIncident.objects.all()
-        elif hasattr(self.request.user, 'member_organization'):
+        organization_id = member_organization_id(self.request.user)
+        if organization_id is not None:
             # Members can only see their own incidents (non-confidential of others)
             return SecurityIncident.objects.filter(
-                organization=self.request.user.member_organization
+                organization_id=organization_id
             ) | SecurityIncident.objects.filter(is_confidential=False)
         return SecurityIncident.objects.none()
     
@@ -33,7 +36,7 @@ class SecurityIncidentViewSet(viewsets.ModelViewSet):
     
     def perform_create(self, serializer):
         incident = serializer.save(
-            organization=self.request.user.member_organization,
+            organization_id=require_member_organization_id(self.request.user),
             status='REPORTED'
         )
         
@@ -42,7 +45,7 @@ class SecurityIncidentViewSet(viewsets.ModelViewSet):
         # send_security_alert_email(incident)
 
 
-class AccessConstraintViewSet(viewsets.ModelViewSet):
+class AccessConstraintViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """Manage access constraint reports"""
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
@@ -53,8 +56,9 @@ class AccessConstraintViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         if self.request.user.is_staff:
             return AccessConstraint.objects.all()
-        elif hasattr(self.request.user, 'member_organization'):
-            return AccessConstraint.objects.filter(organization=self.request.user.member_organization)
+        organization_id = member_organization_id(self.request.user)
+        if organization_id is not None:
+            return AccessConstraint.objects.filter(organization_id=organization_id)
         return AccessConstraint.objects.none()
     
     def get_serializer_class(self):
@@ -64,6 +68,6 @@ class AccessConstraintViewSet(viewsets.ModelViewSet):
     
     def perform_create(self, serializer):
         serializer.save(
-            organization=self.request.user.member_organization,
+            organization_id=require_member_organization_id(self.request.user),
             status='ACTIVE'
         )
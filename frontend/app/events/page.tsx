@@ -34,7 +34,7 @@ export default function Events() {
   const fetchEvents = async () => {
     try {
       const API_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000/api'
-      const response = await axios.get(`${API_URL}/public/events/`)
+      const response = await axios.get(`${API_URL}/public/events/`, { withCredentials: true })
       setEvents(response.data.results || [])
     } catch (error) {
       console.error('Failed to fetch events:', error)
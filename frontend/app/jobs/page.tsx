@@ -10,7 +10,7 @@ interface Job {
   location: string
   application_deadline: string
   job_type: string
-  description: string
+  summary: string
   application_email: string
   application_url: string
 }
@@ -22,7 +22,7 @@ interface Training {
   start_date: string
   end_date: string
   location: string
-  description: string
+  summary: string
   link: string
 }
 
@@ -31,7 +31,7 @@ interface Tender {
   title: string
   organization_name: string
   deadline: string
-  description: string
+  summary: string
   link: string
 }
 
@@ -54,7 +54,7 @@ export default function Jobs() {
 
   const fetchJobs = async () => {
     try {
-      const response = await axios.get(`${API_URL}/public/jobs/`)
+      const response = await axios.get(`${API_URL}/public/jobs/`, { withCredentials: true })
       setJobs(response.data.results || [])
     } catch (error) {
       console.error('Failed to fetch jobs:', error)
@@ -63,7 +63,7 @@ export default function Jobs() {
 
   const fetchTrainings = async () => {
     try {
-      const response = await axios.get(`${API_URL}/public/trainings/`)
+      const response = await axios.get(`${API_URL}/public/trainings/`, { withCredentials: true })
       setTrainings(response.data.results || [])
     } catch (error) {
       console.error('Failed to fetch trainings:', error)
@@ -72,7 +72,7 @@ export default function Jobs() {
 
   const fetchTenders = async () => {
     try {
-      const response = await axios.get(`${API_URL}/public/tenders/`)
+      const response = await axios.get(`${API_URL}/public/tenders/`, { withCredentials: true })
       setTenders(response.data.results || [])
     } catch (error) {
       console.error('Failed to fetch tenders:', error)
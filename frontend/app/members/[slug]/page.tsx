@@ -35,7 +35,7 @@ export default function MemberDetail() {
   const fetchMember = async () => {
     try {
       const API_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000/api'
-      const response = await axios.get(`${API_URL}/public/members/${params.slug}/`)
+      const response = await axios.get(`${API_URL}/public/members/${params.slug}/`, { withCredentials: true })
       setMember(response.data)
     } catch (error) {
       console.error('Failed to fetch member:', error)
@@ -11,6 +11,7 @@ interface Member {
   organization_type: string
   website: string
   logo: string | null
+  logo_variants: { webp?: string; jpeg?: string } | null
 }
 
 export default function Members() {
@@ -42,7 +43,7 @@ export default function Members() {
         params.search = search
       }
 
-      const response = await axios.get(`${API_URL}/public/members/`, { params })
+      const response = await axios.get(`${API_URL}/public/members/`, { params, withCredentials: true })
       setMembers(response.data.results || [])
     } catch (error) {
       console.error('Failed to fetch members:', error)
@@ -189,11 +190,19 @@ export default function Members() {
                     {/* Logo */}
                     <div className="h-20 flex items-center justify-center mb-4 rounded-xl bg-white/5 overflow-hidden">
                       {member.logo ? (
-                        <img 
-                          src={member.logo} 
-                          alt={member.name}
-                          className="max-h-16 max-w-full object-contain group-hover:scale-110 transition-transform duration-500"
-                        />
+                        <picture>
+                          {member.logo_variants?.webp && (
+                            <source type="image/webp" srcSet={member.logo_variants.webp} sizes="64px" />
+                          )}
+                          <img 
+                            src={member.logo} 
+                            srcSet={member.logo_variants?.jpeg}
+                            sizes="64px"
+                            alt={member.name}
+                            loading="lazy"
+                            className="max-h-16 max-w-full object-contain group-hover:scale-110 transition-transform duration-500"
+                          />
+                        </picture>
                       ) : (
                         <div className="w-16 h-16 rounded-full bg-gradient-to-br from-accent/20 to-secondary/20 flex items-center justify-center">
                           <span className="text-2xl font-bold text-accent">{member.name.charAt(0)}</span>
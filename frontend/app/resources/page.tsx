@@ -6,7 +6,7 @@ import axios from 'axios'
 interface Resource {
   id: number
   title: string
-  description: string
+  summary: string
   category_name: string
   resource_type: string
   file: string | null
@@ -14,6 +14,8 @@ interface Resource {
   published_date: string
 }
 
+const API_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000/api'
+
 export default function Resources() {
   const [resources, setResources] = useState<Resource[]>([])
   const [loading, setLoading] = useState(true)
@@ -31,10 +33,9 @@ export default function Resources() {
   const fetchResources = async () => {
     setLoading(true)
     try {
-      const API_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000/api'
       const params: Record<string, string> = {}
       if (search) params.search = search
-      const response = await axios.get(`${API_URL}/public/resources/`, { params })
+      const response = await axios.get(`${API_URL}/public/resources/`, { params, withCredentials: true })
       setResources(response.data.results || [])
     } catch (error) {
       console.error('Failed to fetch resources:', error)
@@ -137,9 +138,9 @@ export default function Resources() {
                       {resource.title}
                     </h3>
                     
-                    {/* Description */}
+                    {/* Summary */}
                     <p className="text-text-secondary text-sm mb-4 line-clamp-3">
-                      {resource.description}
+                      {resource.summary}
                     </p>
                     
                     {/* Date */}
@@ -150,7 +151,7 @@ export default function Resources() {
                     {/* Download Button */}
                     {resource.file ? (
                       <a
-                        href={resource.file}
+                        href={`${API_URL}/public/resources/${resource.id}/download/`}
                         download
                         className="inline-flex items-center gap-2 px-4 py-2 rounded-xl bg-accent text-background font-semibold text-sm hover:shadow-lg hover:shadow-accent/20 transition-all"
                       >
@@ -5,6 +5,9 @@ const API_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000/api'
 
 const axiosInstance = axios.create({
   baseURL: API_URL,
+  // The API is on another origin: without credentials the browser drops the replica_pin
+  // cookie set after a write, and the next reads can miss it
+  withCredentials: true,
   headers: {
     'Content-Type': 'application/json',
   },